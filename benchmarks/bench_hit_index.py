@@ -0,0 +1,65 @@
+"""
+This module benchmarks shot resolution with the HitIndex grid against a linear
+scan over every target. Run it with: python -m benchmarks.bench_hit_index
+"""
+import random
+import time
+import pygame
+from src.hit_index import HitIndex
+
+TARGET_COUNTS = [1, 10, 100, 1000, 10000]
+SHOTS_PER_RUN = 1000
+SCREEN_SIZE = (800, 600)
+
+
+def make_targets(count: int, rng: random.Random) -> list[tuple[int, pygame.Rect, None]]:
+    """
+    Create targets of duck size scattered over the screen.
+    """
+    return [(i, pygame.Rect(rng.randint(0, SCREEN_SIZE[0] - 85),
+                            rng.randint(0, SCREEN_SIZE[1] - 90), 85, 90), None)
+            for i in range(count)]
+
+
+def linear_query(targets: list[tuple[int, pygame.Rect, None]],
+                 point: tuple[int, int]) -> int | None:
+    """
+    Return the topmost target under the point by testing every target.
+    """
+    for target, rect, _ in reversed(targets):
+        if rect.collidepoint(point):
+            return target
+    return None
+
+
+def main() -> None:
+    """
+    Print the time per shot of both approaches for growing target counts.
+    """
+    rng = random.Random(0)
+    print(f"{'targets':>8} {'linear us/shot':>15} {'grid us/shot':>13} {'rebuild ms':>11}")
+    for count in TARGET_COUNTS:
+        targets = make_targets(count, rng)
+        shots = [(rng.randrange(SCREEN_SIZE[0]), rng.randrange(SCREEN_SIZE[1]))
+                 for _ in range(SHOTS_PER_RUN)]
+
+        start = time.perf_counter()
+        expected = [linear_query(targets, shot) for shot in shots]
+        linear_time = time.perf_counter() - start
+
+        index = HitIndex()
+        start = time.perf_counter()
+        index.rebuild(targets)
+        rebuild_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = index.query_many(shots)
+        grid_time = time.perf_counter() - start
+
+        assert results == expected
+        print(f"{count:>8} {linear_time / SHOTS_PER_RUN * 1e6:>15.2f} "
+              f"{grid_time / SHOTS_PER_RUN * 1e6:>13.2f} {rebuild_time * 1000:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,459 @@
+"""
+This module is the headless benchmark suite of DuckHunt. It runs under the SDL
+dummy video and audio drivers, times the hot paths of the game (animation, duck
+movement and respawn, gameplay update and render, saving scores, the results
+list and startup) at growing entity counts, and stores the results as a JSON
+baseline. Comparing a run with a baseline fails when a benchmark got slower
+than the threshold allows.
+
+Example:
+    python -m benchmarks.suite run --output baseline.json
+    python -m benchmarks.suite run --output current.json
+    python -m benchmarks.suite compare baseline.json current.json --threshold 0.2
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+import argparse
+import atexit
+import datetime
+import json
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from typing import Any
+import pygame
+from src.animation import Animation
+from src.core import ManualClock
+from src.duck import Duck
+from src.gameplay import Gameplay
+from src.results_view import ResultsList
+from src.scores import ScoreStore
+from src.setup import DUCK_SPRITES
+
+SCALES = [1, 10, 100, 1000, 5000]  # Entity counts every scalable benchmark runs at
+REPEAT = 5                      # Samples per benchmark; the median is compared
+MIN_SAMPLE_TIME = 0.05          # Seconds a sample runs at least when calibrating
+THRESHOLD = 0.2                 # Allowed slowdown against the baseline (0.2 is 20 %)
+BASELINE_VERSION = 1
+SCREEN_SIZE = (800, 600)
+STARTUP_SCRIPT = "from src.setup import Setup; Setup().load_game()"
+
+
+class Case:
+    """
+    One prepared benchmark at one scale: the operation to time and an optional
+    reset that restores its state untimed before every call.
+    """
+    def __init__(self, run: Callable[[], Any], reset: Callable[[], Any] | None = None) -> None:
+        """
+        Initialize the case.
+        """
+        self.run = run
+        self.reset = reset
+
+
+class Benchmark:
+    """
+    A named benchmark. Its setup prepares a Case for a given scale; number is the
+    number of calls per sample (0 calibrates it to MIN_SAMPLE_TIME).
+    """
+    def __init__(self, name: str, setup: Callable[[int], Case], scales: list[int],
+                 number: int = 0, repeat: int = REPEAT) -> None:
+        """
+        Initialize the benchmark.
+        """
+        self.name = name
+        self.setup = setup
+        self.scales = scales
+        self.number = number
+        self.repeat = repeat
+
+
+def sample(case: Case, number: int) -> float:
+    """
+    Return the total time of number calls, without the resets.
+    """
+    if case.reset is None:
+        start = time.perf_counter()
+        for _ in range(number):
+            case.run()
+        return time.perf_counter() - start
+    total = 0.0
+    for _ in range(number):
+        case.reset()
+        start = time.perf_counter()
+        case.run()
+        total += time.perf_counter() - start
+    return total
+
+
+def calibrate(case: Case) -> int:
+    """
+    Return the number of calls that takes at least MIN_SAMPLE_TIME.
+    """
+    number = 1
+    while True:
+        if sample(case, number) >= MIN_SAMPLE_TIME:
+            return number
+        number *= 2
+
+
+def measure(benchmark: Benchmark, scale: int, repeat: int | None = None) -> dict[str, float]:
+    """
+    Time a benchmark at one scale and return the median and best time per call
+    in seconds.
+    """
+    case = benchmark.setup(scale)
+    number = benchmark.number or calibrate(case)
+    repeat = repeat or benchmark.repeat
+    times = [sample(case, number) / number for _ in range(repeat)]
+    return {"median": statistics.median(times), "min": min(times),
+            "number": number, "repeat": repeat}
+
+
+def init_display() -> pygame.Surface:
+    """
+    Return the dummy display, creating it on first use. Images can only be
+    converted once a display exists.
+    """
+    screen = pygame.display.get_surface()
+    if screen is None:
+        pygame.init()
+        screen = pygame.display.set_mode(SCREEN_SIZE)
+    return screen
+
+
+game: Gameplay | None = None
+
+
+def get_game() -> Gameplay:
+    """
+    Return a time-mode game that never ends, creating it on first use.
+    """
+    global game
+    if game is None:
+        game = Gameplay(mode="time", record_replays=False)
+    game.mode = "time"
+    game.reset_game(0)
+    game.total_time = 10 ** 9
+    return game
+
+
+def make_ducks(count: int, clock: ManualClock) -> list[Duck]:
+    """
+    Create ducks of every type sharing a clock, spawned on screen.
+    """
+    init_display()
+    types = list(DUCK_SPRITES.items())
+    ducks = []
+    for index in range(count):
+        duck_type, path = types[index % len(types)]
+        duck = Duck(SCREEN_SIZE[0], 360, path, duck_type, clock, random.Random(index))
+        duck.respawn(mode="time", initial_spawn=True)
+        ducks.append(duck)
+    return ducks
+
+
+def setup_animation_update(scale: int) -> Case:
+    """
+    Advance scale animations by one frame.
+    """
+    init_display()
+    animations = [Animation(DUCK_SPRITES["normal"], 85, 90, animation_speed=index % 10 + 1)
+                  for index in range(scale)]
+
+    def run() -> None:
+        for animation in animations:
+            animation.update()
+    return Case(run)
+
+
+def setup_duck_move(scale: int) -> Case:
+    """
+    Move scale flying ducks by one step. The clock stands still, so they keep
+    bouncing instead of flying off.
+    """
+    ducks = make_ducks(scale, ManualClock())
+
+    def run() -> None:
+        for duck in ducks:
+            duck.move()
+    return Case(run)
+
+
+def setup_duck_handle_respawn(scale: int) -> Case:
+    """
+    Respawn scale ducks whose respawn delay has passed.
+    """
+    clock = ManualClock()
+    ducks = make_ducks(scale, clock)
+
+    def reset() -> None:
+        for duck in ducks:
+            duck.respawn(mode="time")
+        clock.advance(ducks[0].respawn_delay * 1000)
+
+    def run() -> None:
+        for duck in ducks:
+            duck.handle_respawn()
+    return Case(run, reset)
+
+
+def setup_gameplay_update(scale: int) -> Case:
+    """
+    Resolve scale shots fired in one frame and advance the game by one step.
+    """
+    gameplay = get_game()
+    rng = random.Random(scale)
+    shots = [(rng.randrange(SCREEN_SIZE[0]), rng.randrange(SCREEN_SIZE[1])) for _ in range(scale)]
+
+    def run() -> None:
+        gameplay.resolve_shots(shots)
+        gameplay.step()
+    return Case(run)
+
+
+def setup_gameplay_render(dirty_rects: bool) -> Callable[[int], Case]:
+    """
+    Return the setup of advancing the game by one step and rendering and
+    presenting the frame, redrawing either the full screen or only the dirty rects.
+    """
+    def setup(scale: int) -> Case:
+        gameplay = get_game()
+        gameplay.set_dirty_rects(dirty_rects)
+
+        def run() -> None:
+            gameplay.step()
+            gameplay.render()
+        return Case(run)
+    return setup
+
+
+def make_score_store(scale: int) -> ScoreStore:
+    """
+    Create a score store in a temporary directory that holds scale scores.
+    """
+    directory = tempfile.mkdtemp(prefix="duckhunt-bench-")
+    atexit.register(shutil.rmtree, directory, True)
+    store = ScoreStore(os.path.join(directory, "scores.db"))
+    atexit.register(store.close)
+    store.connection.execute("BEGIN")
+    for index in range(scale):
+        store.insert("standard", f"player{index}", (index * 7919) % 10000)
+    store.connection.execute("COMMIT")
+    return store
+
+
+def setup_save_new_score(scale: int) -> Case:
+    """
+    Save a new score, as GameOver.save_new_score does, into a store that holds
+    scale scores (plus the ones saved while timing).
+    """
+    store = make_score_store(scale)
+    return Case(lambda: store.add("standard", "bench", 5000))
+
+
+def setup_top_scores(scale: int) -> Case:
+    """
+    Query the scores shown on the results screen from a store that holds scale scores.
+    """
+    store = make_score_store(scale)
+    return Case(lambda: store.top("standard"))
+
+
+def setup_results_list(scale: int) -> Case:
+    """
+    Scroll the Top Results list of a store that holds scale * 20 scores by a page
+    and draw it; the time should not grow with the number of scores.
+    """
+    init_display()
+    store = make_score_store(scale * 20)
+    screen = pygame.Surface(SCREEN_SIZE)
+    results = ResultsList(pygame.Rect(50, 130, 700, 360), pygame.font.Font(None, 36), store)
+
+    def run() -> None:
+        if results.scroll >= results.max_scroll():
+            results.scroll_to(0)
+        results.scroll_to(results.scroll + results.rect.height)
+        results.draw(screen)
+    return Case(run)
+
+
+def setup_startup(scale: int) -> Case:
+    """
+    Start a new interpreter that imports the game, creates the Setup and loads
+    the game (display, loading screen, every image and the mixer).
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return Case(lambda: subprocess.run([sys.executable, "-c", STARTUP_SCRIPT], cwd=root,
+                                       check=True, stdout=subprocess.DEVNULL))
+
+
+BENCHMARKS = [
+    Benchmark("animation_update", setup_animation_update, SCALES),
+    Benchmark("duck_move", setup_duck_move, SCALES),
+    Benchmark("duck_handle_respawn", setup_duck_handle_respawn, SCALES),
+    Benchmark("gameplay_update", setup_gameplay_update, SCALES),
+    Benchmark("gameplay_render_full", setup_gameplay_render(False), [1]),
+    Benchmark("gameplay_render_dirty", setup_gameplay_render(True), [1]),
+    Benchmark("save_new_score", setup_save_new_score, SCALES),
+    Benchmark("top_scores", setup_top_scores, SCALES),
+    Benchmark("results_list", setup_results_list, SCALES),
+    Benchmark("startup", setup_startup, [1], number=1, repeat=3),
+]
+
+
+def result_key(name: str, scale: int) -> str:
+    """
+    Return the key of a benchmark at one scale in the JSON results.
+    """
+    return f"{name}/{scale}"
+
+
+def format_time(seconds: float) -> str:
+    """
+    Format a duration with a readable unit.
+    """
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.2f} us"
+
+
+def run_benchmarks(benchmarks: list[Benchmark], max_scale: int | None = None,
+                   repeat: int | None = None) -> dict[str, Any]:
+    """
+    Run the benchmarks, printing every result, and return them as a baseline.
+    """
+    results = {}
+    for benchmark in benchmarks:
+        for scale in benchmark.scales:
+            if max_scale is not None and scale > max_scale:
+                continue
+            result = measure(benchmark, scale, repeat)
+            key = result_key(benchmark.name, scale)
+            results[key] = result
+            print(f"{key:<32} {format_time(result['median']):>12} "
+                  f"(best {format_time(result['min'])}, {result['number']} calls "
+                  f"x {result['repeat']})", flush=True)
+    return {
+        "version": BASELINE_VERSION,
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def save_baseline(baseline: dict[str, Any], path: str) -> None:
+    """
+    Write benchmark results as JSON.
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(baseline, file, indent=2)
+        file.write("\n")
+
+
+def load_baseline(path: str) -> dict[str, Any]:
+    """
+    Read benchmark results written by save_baseline().
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        baseline = json.load(file)
+    if baseline.get("version") != BASELINE_VERSION:
+        raise ValueError(f"{path} is not a benchmark baseline of version {BASELINE_VERSION}")
+    return baseline
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], threshold: float = THRESHOLD,
+            thresholds: dict[str, float] | None = None) -> list[str]:
+    """
+    Print how every benchmark changed against the baseline and return the keys of
+    the ones that got slower than their threshold allows. A threshold for a
+    benchmark name (e.g. "startup") replaces the general one for all its scales.
+    """
+    thresholds = thresholds or {}
+    regressions = []
+    print(f"{'benchmark':<32} {'baseline':>12} {'current':>12} {'change':>8}")
+    for key, result in current["results"].items():
+        old = baseline["results"].get(key)
+        if old is None:
+            print(f"{key:<32} {'-':>12} {format_time(result['median']):>12}      new")
+            continue
+        change = result["median"] / old["median"] - 1
+        allowed = thresholds.get(key.split("/")[0], threshold)
+        regressed = change > allowed
+        if regressed:
+            regressions.append(key)
+        print(f"{key:<32} {format_time(old['median']):>12} "
+              f"{format_time(result['median']):>12} {change:>+8.1%}"
+              f"{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def parse_thresholds(values: list[str]) -> dict[str, float]:
+    """
+    Parse "name=fraction" arguments into per-benchmark thresholds.
+    """
+    thresholds = {}
+    for value in values:
+        name, _, fraction = value.partition("=")
+        thresholds[name] = float(fraction)
+    return thresholds
+
+
+def main(argv: list[str]) -> int:
+    """
+    Run the suite or compare results from the command line. Returns 1 if a
+    benchmark regressed.
+    """
+    parser = argparse.ArgumentParser(description="DuckHunt headless benchmark suite")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--only", nargs="+", choices=[b.name for b in BENCHMARKS],
+                            help="run only these benchmarks")
+    run_parser.add_argument("--max-scale", type=int, help="skip larger entity counts")
+    run_parser.add_argument("--repeat", type=int, help="samples per benchmark")
+    run_parser.add_argument("--output", metavar="PATH", help="save the results as JSON")
+    run_parser.add_argument("--baseline", metavar="PATH",
+                            help="compare the results with this baseline")
+    compare_parser = commands.add_parser("compare", help="compare two saved results")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    for command in (run_parser, compare_parser):
+        command.add_argument("--threshold", type=float, default=THRESHOLD,
+                             help="allowed slowdown as a fraction (default %(default)s)")
+        command.add_argument("--threshold-for", action="append", default=[],
+                             metavar="NAME=FRACTION", help="threshold of one benchmark (repeatable)")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        benchmarks = [b for b in BENCHMARKS if args.only is None or b.name in args.only]
+        current = run_benchmarks(benchmarks, args.max_scale, args.repeat)
+        if args.output:
+            save_baseline(current, args.output)
+            print(f"Results saved to {args.output}")
+        if not args.baseline:
+            return 0
+        baseline = load_baseline(args.baseline)
+    else:
+        baseline, current = load_baseline(args.baseline), load_baseline(args.current)
+
+    regressions = compare(baseline, current, args.threshold, parse_thresholds(args.threshold_for))
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,9 +1,64 @@
 """
 This is the main and you can run this module to start the game.
 """
+import argparse
+import atexit
+import pygame
+from src.startup import get_timeline
 
-from src.gameplay import Gameplay
+with get_timeline().span("import game modules"):
+    from src.audio import PROFILES
+    from src.capture import CAPTURE_FRAMES, get_profile_capture
+    from src.display import BACKENDS
+    from src.frame_timing import FrameProfiler
+    from src.leaderboard import connect_leaderboard
+    from src.gameplay import Gameplay
+    from src.menu import Menu
+    from src.setup import Setup
+    from src.telemetry import TELEMETRY_DIR
 
 if __name__ == "__main__":
-    game = Gameplay()
-    game.start()
+    parser = argparse.ArgumentParser(description="Duck Hunt")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="redraw only the changed parts of the screen (F2 switches)")
+    parser.add_argument("--renderer", choices=BACKENDS, default="software",
+                        help="draw with software blits or with SDL2 textures on the GPU")
+    parser.add_argument("--audio-profile", choices=list(PROFILES), default="default",
+                        help="mixer frequency, buffer size and channels")
+    parser.add_argument("--measure-latency", action="store_true",
+                        help="log the time from every click to its sound")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="print a timeline of the startup once the title screen is shown")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="write a Chrome trace of every frame and scene on exit (F3 shows timings)")
+    parser.add_argument("--profile-frames", type=int, default=CAPTURE_FRAMES, metavar="N",
+                        help="frames profiled after pressing F4 (default %(default)s)")
+    parser.add_argument("--leaderboard", metavar="HOST:PORT",
+                        help="also submit scores to a shared leaderboard server")
+    parser.add_argument("--telemetry", metavar="DIR", default=TELEMETRY_DIR,
+                        help="directory the shots of this run are recorded to (default %(default)s)")
+    parser.add_argument("--no-telemetry", action="store_true",
+                        help="do not record shots")
+    args = parser.parse_args()
+    get_profile_capture().frames = args.profile_frames
+    if args.leaderboard:
+        connect_leaderboard(args.leaderboard)
+    get_timeline().report_requested = args.startup_report
+    # The mixer settings only take effect before the mixer is initialized
+    PROFILES[args.audio_profile].apply()
+    # The profiler is created before the title menu, so its scene is traced too
+    profiler = FrameProfiler(trace=args.trace is not None)
+    if args.trace is not None:
+        atexit.register(profiler.save_trace, args.trace)
+    setup = Setup(args.renderer)
+    # The game assets, the mixer and the sounds are only loaded once Play is chosen
+    with profiler.scene("menu"):
+        menu = Menu(setup.get_screen(), pygame.time.Clock(), setup.get_background(),
+                    setup.change_background)
+        menu.display()
+    with get_timeline().span("create game"):
+        game = Gameplay(dirty_rects=args.dirty_rects, measure_latency=args.measure_latency,
+                        backend=args.renderer,
+                        telemetry_dir=None if args.no_telemetry else args.telemetry,
+                        setup=setup, profiler=profiler)
+    game.start(getattr(menu, "chosen_mode", "standard"))
@@ -2,38 +2,32 @@
 This module provides an Animation class for handling sprite sheet animations in the DuckHunt game.
 """
 import pygame
+from src.assets import FrameSet, get_registry
 
 class Animation:
     """
-    This class handles the extraction and updating of frames from a sprite sheet.
-    It loads the frames, updates the current frame based on a timer, and allows flipping
-    the image based on the direction.
+    This class handles the frames of a sprite sheet and their updating.
+    The frames come from the shared asset registry with both facing directions
+    already baked, so changing direction never allocates a new surface.
     """
-    def __init__(self, sprite_sheet: pygame.Surface, frame_width: int,
+    def __init__(self, sprite_path: str, frame_width: int,
                  frame_height: int, animation_speed: int = 10) -> None:
         """
-        Initialize the animation with a sprite sheet and frame dimensions.
+        Initialize the animation with a sprite sheet path and frame dimensions.
         """
-        self.frames = self.load_frames(sprite_sheet, frame_width, frame_height)
+        self.frames = self.load_frames(sprite_path, frame_width, frame_height)
         self.current_frame_index = 0
-        self.image = self.frames[self.current_frame_index]
+        self.facing_right = True  # Default direction
+        self.image = self.frames.get(self.current_frame_index, self.facing_right)
         self.animation_timer = 0
         self.animation_speed = animation_speed
-        self.facing_right = True  # Default direction
 
-    def load_frames(self, sprite_sheet: pygame.Surface,
-                    frame_width: int, frame_height: int) -> list[pygame.Surface]:
+    def load_frames(self, sprite_path: str,
+                    frame_width: int, frame_height: int) -> FrameSet:
         """
-        Extract frames from a sprite sheet.
+        Get the shared frames of a sprite sheet from the asset registry.
         """
-        frames = []
-        sheet_width, _ = sprite_sheet.get_size()
-
-        for x in range(0, sheet_width, frame_width):
-            if x + frame_width <= sheet_width:
-                frame = sprite_sheet.subsurface((x, 0, frame_width, frame_height))
-                frames.append(frame)
-        return frames
+        return get_registry().load_frames(sprite_path, frame_width, frame_height)
 
     def update(self) -> None:
         """
@@ -42,20 +36,32 @@ class Animation:
         self.animation_timer += 1
         if self.animation_timer >= self.animation_speed:
             self.current_frame_index = (self.current_frame_index + 1) % len(self.frames)
-            self.image = self.frames[self.current_frame_index]
-            # Flip the image if facing left
-            if not self.facing_right:
-                self.image = pygame.transform.flip(self.image, True, False)
+            self.image = self.frames.get(self.current_frame_index, self.facing_right)
             self.animation_timer = 0
 
+    def reset(self) -> None:
+        """
+        Return to the first frame, facing right.
+        """
+        self.current_frame_index = 0
+        self.animation_timer = 0
+        self.set_direction(True)
+
     def set_direction(self, facing_right: bool) -> None:
         """
         Set the direction the animation is facing.
         """
         self.facing_right = facing_right
+        self.image = self.frames.get(self.current_frame_index, self.facing_right)
 
     def get_current_frame(self) -> pygame.Surface:
         """
         Get the current frame of the animation.
         """
         return self.image
+
+    def get_current_mask(self) -> pygame.mask.Mask:
+        """
+        Get the precomputed collision mask of the current frame.
+        """
+        return self.frames.get_mask(self.current_frame_index, self.facing_right)
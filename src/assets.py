@@ -0,0 +1,242 @@
+"""
+This module provides a process-wide asset registry for the DuckHunt game.
+Images are decoded once, sprite sheets are sliced once, and both facing
+directions are baked at load time, so every duck of the same type shares the
+same surfaces. Backgrounds are kept in their own bounded cache, decoded and
+scaled to the screen ahead of time, so switching them never touches the disk.
+"""
+from collections import OrderedDict
+import pygame
+
+
+class FrameSet:
+    """
+    This class holds the frames of one sprite sheet in both facing directions,
+    together with a collision mask for every frame. The left-facing frames are
+    mirrored copies of the right-facing ones, baked when the sheet is first loaded.
+    """
+    def __init__(self, right: list[pygame.Surface], left: list[pygame.Surface]) -> None:
+        """
+        Initialize the frame set with the right- and left-facing frames and build their masks.
+        """
+        self.right = right
+        self.left = left
+        self.masks_right = [pygame.mask.from_surface(frame) for frame in right]
+        self.masks_left = [pygame.mask.from_surface(frame) for frame in left]
+
+    def __len__(self) -> int:
+        """
+        Return the number of animation frames.
+        """
+        return len(self.right)
+
+    def get(self, index: int, facing_right: bool) -> pygame.Surface:
+        """
+        Return the frame at the given index for the given direction.
+        """
+        return self.right[index] if facing_right else self.left[index]
+
+    def get_mask(self, index: int, facing_right: bool) -> pygame.mask.Mask:
+        """
+        Return the collision mask of the frame at the given index for the given direction.
+        """
+        return self.masks_right[index] if facing_right else self.masks_left[index]
+
+
+def surface_size(surface: pygame.Surface) -> int:
+    """
+    Return the number of bytes used by the pixels of a surface.
+    """
+    width, height = surface.get_size()
+    return width * height * surface.get_bytesize()
+
+
+def slice_frames(sprite_sheet: pygame.Surface,
+                 frame_width: int, frame_height: int) -> list[pygame.Surface]:
+    """
+    Extract frames from a sprite sheet.
+    """
+    frames = []
+    sheet_width, _ = sprite_sheet.get_size()
+
+    for x in range(0, sheet_width, frame_width):
+        if x + frame_width <= sheet_width:
+            frame = sprite_sheet.subsurface((x, 0, frame_width, frame_height))
+            frames.append(frame)
+    return frames
+
+
+class AssetRegistry:
+    """
+    This class caches every image the game loads. It is responsible for:
+      - Decoding each image file once and converting it for the display.
+      - Slicing sprite sheets into frames once and baking the mirrored frames.
+      - Baking mirrored variants of single images (e.g. the shot images).
+      - Reporting how much memory each cached surface uses.
+    """
+    def __init__(self) -> None:
+        """
+        Initialize empty caches.
+        """
+        self.images: dict[tuple[str, bool], pygame.Surface] = {}
+        self.frame_sets: dict[tuple[str, int, int], FrameSet] = {}
+        self.flipped: dict[str, tuple[pygame.Surface, pygame.Surface]] = {}
+        self.flipped_masks: dict[str, tuple[pygame.mask.Mask, pygame.mask.Mask]] = {}
+
+    def load_image(self, path: str, alpha: bool = True) -> pygame.Surface:
+        """
+        Return the converted image at the given path, decoding it on first use.
+        """
+        image = self.images.get((path, alpha))
+        if image is None:
+            image = self.add_image(path, pygame.image.load(path), alpha)
+        return image
+
+    def add_image(self, path: str, image: pygame.Surface, alpha: bool = True) -> pygame.Surface:
+        """
+        Convert an image that was already decoded (e.g. on a loader thread) for the
+        display and cache it under the given path.
+        """
+        image = image.convert_alpha() if alpha else image.convert()
+        self.images[(path, alpha)] = image
+        return image
+
+    def load_frames(self, path: str, frame_width: int, frame_height: int) -> FrameSet:
+        """
+        Return the frames of the sprite sheet at the given path in both directions.
+        """
+        key = (path, frame_width, frame_height)
+        frame_set = self.frame_sets.get(key)
+        if frame_set is None:
+            sprite_sheet = self.load_image(path)
+            right = slice_frames(sprite_sheet, frame_width, frame_height)
+            left = [pygame.transform.flip(frame, True, False) for frame in right]
+            frame_set = FrameSet(right, left)
+            self.frame_sets[key] = frame_set
+        return frame_set
+
+    def load_flipped(self, path: str) -> tuple[pygame.Surface, pygame.Surface]:
+        """
+        Return the image at the given path as a (right-facing, left-facing) pair.
+        """
+        pair = self.flipped.get(path)
+        if pair is None:
+            image = self.load_image(path)
+            pair = (image, pygame.transform.flip(image, True, False))
+            self.flipped[path] = pair
+            self.flipped_masks[path] = (pygame.mask.from_surface(pair[0]),
+                                        pygame.mask.from_surface(pair[1]))
+        return pair
+
+    def load_flipped_masks(self, path: str) -> tuple[pygame.mask.Mask, pygame.mask.Mask]:
+        """
+        Return the collision masks of the (right-facing, left-facing) pair at the given path.
+        """
+        self.load_flipped(path)
+        return self.flipped_masks[path]
+
+    def memory_usage(self) -> dict[str, int]:
+        """
+        Return the number of bytes owned by the cached surfaces of each asset.
+        Frames are subsurfaces of their sheet, so only the mirrored frames add memory.
+        """
+        usage: dict[str, int] = {}
+        for (path, _), image in self.images.items():
+            usage[path] = usage.get(path, 0) + surface_size(image)
+        for (path, _, _), frame_set in self.frame_sets.items():
+            usage[path] = usage.get(path, 0) + sum(surface_size(f) for f in frame_set.left)
+        for path, (_, flipped_image) in self.flipped.items():
+            usage[path] = usage.get(path, 0) + surface_size(flipped_image)
+        return usage
+
+    def total_memory(self) -> int:
+        """
+        Return the total number of bytes owned by the cached surfaces.
+        """
+        return sum(self.memory_usage().values())
+
+    def clear(self) -> None:
+        """
+        Drop every cached surface.
+        """
+        self.images.clear()
+        self.frame_sets.clear()
+        self.flipped.clear()
+        self.flipped_masks.clear()
+
+
+class BackgroundCache:
+    """
+    This class keeps the decoded background images of the game. It is responsible for:
+      - Decoding, converting and optionally scaling each background once.
+      - Preloading the backgrounds, so selecting one is a lookup instead of a disk read.
+      - Keeping at most max_entries backgrounds, dropping the least recently used one.
+    """
+    def __init__(self, paths: list[str], size: tuple[int, int] | None = None,
+                 max_entries: int | None = None) -> None:
+        """
+        Initialize the cache for the given background paths. Backgrounds are scaled
+        to size if it is given, and by default every background is kept.
+        """
+        self.paths = paths
+        self.size = size
+        self.max_entries = max_entries if max_entries is not None else len(paths)
+        self.surfaces: OrderedDict[str, pygame.Surface] = OrderedDict()
+
+    def __len__(self) -> int:
+        """
+        Return the number of decoded backgrounds.
+        """
+        return len(self.surfaces)
+
+    def preload(self) -> None:
+        """
+        Decode as many backgrounds as the cache can hold.
+        """
+        for path in self.paths[:self.max_entries]:
+            self.load(path)
+
+    def load(self, path: str) -> pygame.Surface:
+        """
+        Return the background at the given path, decoding it on first use.
+        """
+        surface = self.surfaces.get(path)
+        if surface is not None:
+            self.surfaces.move_to_end(path)
+            return surface
+        return self.add(path, pygame.image.load(path))
+
+    def add(self, path: str, image: pygame.Surface) -> pygame.Surface:
+        """
+        Convert and scale a background that was already decoded (e.g. on a loader
+        thread) and cache it under the given path.
+        """
+        surface = image.convert()
+        if self.size is not None and surface.get_size() != self.size:
+            surface = pygame.transform.smoothscale(surface, self.size)
+        self.surfaces[path] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def get(self, index: int) -> pygame.Surface:
+        """
+        Return the background with the given index.
+        """
+        return self.load(self.paths[index % len(self.paths)])
+
+    def memory_usage(self) -> int:
+        """
+        Return the number of bytes owned by the decoded backgrounds.
+        """
+        return sum(surface_size(surface) for surface in self.surfaces.values())
+
+
+registry = AssetRegistry()
+
+
+def get_registry() -> AssetRegistry:
+    """
+    Return the process-wide asset registry.
+    """
+    return registry
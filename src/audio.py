@@ -0,0 +1,238 @@
+"""
+This module provides a process-wide audio bank for the DuckHunt game. Every sound
+is decoded once per process, and the decoded PCM samples are also cached on disk,
+keyed by a hash of the source file and the mixer format, so later launches load
+raw samples instead of decoding the MP3s again. It also holds the mixer profiles,
+which trade audio latency against CPU cost, and a monitor that measures the
+latency from a click to its sound.
+"""
+import hashlib
+import os
+import statistics
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+import pygame
+
+AUDIO_CACHE_DIR = os.path.join("cache", "audio")
+PCM_EXTENSION = ".pcm"
+
+
+class AudioProfile:
+    """
+    The mixer settings of one hardware tier. Smaller buffers play sounds sooner
+    but wake the audio thread more often.
+    """
+    def __init__(self, name: str, frequency: int, buffer: int, channels: int) -> None:
+        """
+        Initialize the profile with the sample rate, the buffer size in samples and
+        the number of output channels (1 for mono, 2 for stereo).
+        """
+        self.name = name
+        self.frequency = frequency
+        self.buffer = buffer
+        self.channels = channels
+
+    def __repr__(self) -> str:
+        """
+        Return a readable description of the profile.
+        """
+        return (f"AudioProfile({self.name}: {self.frequency} Hz, {self.buffer} samples, "
+                f"{self.channels} channels, {self.buffer_latency_ms():.1f} ms)")
+
+    def buffer_latency_ms(self) -> float:
+        """
+        Return the time one mixer buffer takes to play, the latency it adds to every sound.
+        """
+        return self.buffer / self.frequency * 1000
+
+    def apply(self) -> None:
+        """
+        Make the mixer use this profile. It has to be called before the mixer is
+        initialized, i.e. before the display and the game are created.
+        """
+        global active_profile
+        pygame.mixer.pre_init(self.frequency, -16, self.channels, self.buffer)
+        active_profile = self
+
+
+PROFILES = {
+    "default": AudioProfile("default", 44100, 512, 2),
+    "low_latency": AudioProfile("low_latency", 48000, 256, 2),
+    "balanced": AudioProfile("balanced", 44100, 1024, 2),
+    "low_cpu": AudioProfile("low_cpu", 22050, 2048, 1),
+}
+active_profile = PROFILES["default"]
+
+
+class LatencyMonitor:
+    """
+    This class measures the time from a click until its sound is queued on the
+    mixer. The time is taken when the click is taken from the event queue, so
+    the time the click waited in the queue is not included. The buffer latency
+    of the active profile comes on top of every measurement.
+    """
+    def __init__(self, profile: AudioProfile | None = None, verbose: bool = True) -> None:
+        """
+        Initialize the monitor for the given profile (the active one by default).
+        """
+        self.profile = profile if profile is not None else active_profile
+        self.verbose = verbose
+        self.click_time: float | None = None
+        self.samples: list[float] = []
+
+    def click(self) -> None:
+        """
+        Record that a click was taken from the event queue.
+        """
+        self.click_time = time.perf_counter()
+
+    def sound_queued(self) -> None:
+        """
+        Record that the sound answering the last click was queued.
+        """
+        if self.click_time is None:
+            return
+        latency_ms = (time.perf_counter() - self.click_time) * 1000
+        self.click_time = None
+        self.samples.append(latency_ms)
+        if self.verbose:
+            print(f"Click to sound: {latency_ms:.2f} ms "
+                  f"+ {self.profile.buffer_latency_ms():.1f} ms buffer")
+
+    def cancel(self) -> None:
+        """
+        Forget the last click if it queued no sound (a miss), so the next
+        unrelated sound is not measured against it.
+        """
+        self.click_time = None
+
+    def summary(self) -> str:
+        """
+        Return a one-line summary of the measured latencies.
+        """
+        buffer_ms = self.profile.buffer_latency_ms()
+        if not self.samples:
+            return f"Audio latency ({self.profile.name}): no sounds, {buffer_ms:.1f} ms buffer"
+        samples = sorted(self.samples)
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        return (f"Audio latency ({self.profile.name}): {len(samples)} sounds, "
+                f"mean {statistics.fmean(samples):.2f} ms, p95 {p95:.2f} ms, "
+                f"max {samples[-1]:.2f} ms, + {buffer_ms:.1f} ms buffer")
+
+
+def file_hash(path: str) -> str:
+    """
+    Return the SHA-256 hex digest of the contents of a file.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class AudioBank:
+    """
+    This class caches every sound effect the game plays. It is responsible for:
+      - Decoding each sound file once per process and sharing the Sound object.
+      - Writing the decoded PCM samples to the disk cache after the first decode.
+      - Loading the samples from the disk cache instead of decoding when they match
+        both the file contents and the current mixer format.
+      - Decoding sounds ahead of time on a background thread (prefetch), so the
+        first use only waits for whatever is not decoded yet.
+    decode() does not touch the shared sounds, so it may run on loader threads;
+    add() and load() must be called from the main thread.
+    """
+    def __init__(self, cache_dir: str | None = AUDIO_CACHE_DIR) -> None:
+        """
+        Initialize an empty bank. With cache_dir set to None nothing is cached on disk.
+        """
+        self.cache_dir = cache_dir
+        self.sounds: dict[str, pygame.mixer.Sound] = {}
+        self.pending: dict[str, Future[pygame.mixer.Sound]] = {}
+        self.executor: ThreadPoolExecutor | None = None
+        self.decodes = 0
+        self.cache_hits = 0
+
+    def cache_path(self, path: str) -> str | None:
+        """
+        Return the path of the decoded samples of a sound file in the disk cache.
+        """
+        mixer_format = pygame.mixer.get_init()
+        if self.cache_dir is None or mixer_format is None:
+            return None
+        frequency, sample_format, channels = mixer_format
+        name = f"{file_hash(path)}_{frequency}_{sample_format}_{channels}{PCM_EXTENSION}"
+        return os.path.join(self.cache_dir, name)
+
+    def decode(self, path: str) -> pygame.mixer.Sound:
+        """
+        Return a new Sound for the file, from the disk cache if possible.
+        """
+        cache_path = self.cache_path(path)
+        if cache_path is not None and os.path.exists(cache_path):
+            with open(cache_path, "rb") as file:
+                self.cache_hits += 1
+                return pygame.mixer.Sound(buffer=file.read())
+
+        sound = pygame.mixer.Sound(path)
+        self.decodes += 1
+        if cache_path is not None:
+            try:
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                # Write to a temporary file first, so a crash never leaves half a sound
+                temporary_path = f"{cache_path}.{os.getpid()}.tmp"
+                with open(temporary_path, "wb") as file:
+                    file.write(sound.get_raw())
+                os.replace(temporary_path, cache_path)
+            except OSError as error:
+                print(f"Decoded audio could not be cached: {error}")
+        return sound
+
+    def add(self, path: str, sound: pygame.mixer.Sound) -> pygame.mixer.Sound:
+        """
+        Store a sound that was already decoded (e.g. on a loader thread) under its path.
+        """
+        self.sounds[path] = sound
+        return sound
+
+    def prefetch(self, paths: list[str]) -> None:
+        """
+        Start decoding the given sounds on a background thread. The mixer has to be
+        initialized.
+        """
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audio-bank")
+        for path in paths:
+            if path not in self.sounds and path not in self.pending:
+                self.pending[path] = self.executor.submit(self.decode, path)
+
+    def load(self, path: str) -> pygame.mixer.Sound:
+        """
+        Return the shared Sound for the file, decoding it on first use or waiting
+        for its prefetch to finish.
+        """
+        sound = self.sounds.get(path)
+        if sound is None:
+            future = self.pending.pop(path, None)
+            sound = self.add(path, future.result() if future is not None else self.decode(path))
+        return sound
+
+    def clear(self) -> None:
+        """
+        Drop every sound kept in memory. The disk cache is left untouched.
+        """
+        for future in self.pending.values():
+            future.cancel()
+        self.pending.clear()
+        self.sounds.clear()
+
+
+audio_bank = AudioBank()
+
+
+def get_audio_bank() -> AudioBank:
+    """
+    Return the process-wide audio bank.
+    """
+    return audio_bank
@@ -0,0 +1,327 @@
+"""
+This module is a Monte Carlo balancing harness for DuckHunt. It plays thousands
+of headless games with simulated shooters on every core, optionally sweeping
+the tuning parameters, and reports the distributions of score, game length and
+hit rate. Games are seeded from the base seed and their index, so results are
+reproducible whatever the number of workers. Each worker streams its games into
+running aggregates, so no individual game is kept in memory.
+
+Example:
+    python -m src.balance --games 20000 --bot average:0.6:450 --bot pro:0.9:250 \\
+        --sweep speed_multiplier=1.05,1.1,1.2 --sweep points.red=-25,-50
+"""
+import argparse
+import itertools
+import math
+import os
+import random
+import sys
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from src.core import (GameSession, DuckLogic, ManualClock, Tuning, create_session, simulate,
+                      DEFAULT_TUNING)
+
+STEP_MS = 1000 / 60
+MAX_GAME_MINUTES = 10           # Standard games by good bots can run forever
+MISS_POSITION = (-1, -1)        # A shot that can never hit
+DEFAULT_BOTS = ["casual:0.45:650", "average:0.65:450", "pro:0.9:250"]
+# Histogram bin widths: score in points, length in seconds, hit rate as a fraction
+BIN_WIDTHS = {"score": 25.0, "length": 0.5, "hit_rate": 0.01}
+
+
+class Bot:
+    """
+    A simulated shooter. It waits for its reaction time after a duck becomes
+    shootable, then fires, hitting with the given accuracy. After every shot it
+    needs its reaction time again before the next one.
+    """
+    def __init__(self, name: str, accuracy: float, reaction_ms: float) -> None:
+        """
+        Initialize the bot with its accuracy (0.0 to 1.0) and reaction time.
+        """
+        self.name = name
+        self.accuracy = accuracy
+        self.reaction_ms = reaction_ms
+        self.rng = random.Random()
+        self.ready_at: int | None = None
+        self.shots = 0
+        self.hits = 0
+
+    @classmethod
+    def parse(cls, text: str) -> "Bot":
+        """
+        Create a bot from a "name:accuracy:reaction_ms" string.
+        """
+        name, accuracy, reaction_ms = text.split(":")
+        return cls(name, float(accuracy), float(reaction_ms))
+
+    def reset(self, seed: int) -> None:
+        """
+        Prepare the bot for a new game.
+        """
+        self.rng.seed(seed + 1)  # Independent of the game's own generator
+        self.ready_at = None
+        self.shots = 0
+        self.hits = 0
+
+    def __call__(self, session: GameSession[DuckLogic]) -> list[tuple[int, int]]:
+        """
+        Return the shots fired during the next step.
+        """
+        duck = session.current_duck
+        now = session.get_ticks()
+        if not duck.alive or duck.is_shot:
+            self.ready_at = None
+            return []
+        if self.ready_at is None:
+            self.ready_at = now + int(self.reaction_ms)
+        if now < self.ready_at:
+            return []
+        self.ready_at = now + int(self.reaction_ms)
+        self.shots += 1
+        if self.rng.random() < self.accuracy:
+            self.hits += 1
+            return [duck.rect.center]
+        return [MISS_POSITION]
+
+
+class Distribution:
+    """
+    A streaming summary of one measure: count, mean and variance (Welford),
+    extremes and a sparse fixed-width histogram for percentiles. Two distributions
+    can be merged, so workers can summarize their games independently.
+    """
+    def __init__(self, bin_width: float) -> None:
+        """
+        Initialize an empty distribution with the given histogram bin width.
+        """
+        self.bin_width = bin_width
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.bins: dict[int, int] = {}
+
+    def add(self, value: float) -> None:
+        """
+        Add one observation.
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        index = math.floor(value / self.bin_width)
+        self.bins[index] = self.bins.get(index, 0) + 1
+
+    def merge(self, other: "Distribution") -> None:
+        """
+        Add every observation summarized by another distribution.
+        """
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        for index, amount in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + amount
+
+    def stdev(self) -> float:
+        """
+        Return the sample standard deviation.
+        """
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Return an estimate of the given percentile (0.0 to 1.0) from the histogram.
+        """
+        target = fraction * self.count
+        seen = 0
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if seen >= target:
+                return min((index + 1) * self.bin_width, self.maximum)
+        return self.maximum
+
+
+class Aggregate:
+    """
+    The summary of many games played with one configuration.
+    """
+    def __init__(self) -> None:
+        """
+        Initialize an empty summary.
+        """
+        self.games = 0
+        self.capped = 0
+        self.score = Distribution(BIN_WIDTHS["score"])
+        self.length = Distribution(BIN_WIDTHS["length"])
+        self.hit_rate = Distribution(BIN_WIDTHS["hit_rate"])
+
+    def add_game(self, score: int, seconds: float, hit_rate: float, capped: bool) -> None:
+        """
+        Add the result of one game.
+        """
+        self.games += 1
+        self.capped += capped
+        self.score.add(score)
+        self.length.add(seconds)
+        self.hit_rate.add(hit_rate)
+
+    def merge(self, other: "Aggregate") -> None:
+        """
+        Add every game summarized by another aggregate.
+        """
+        self.games += other.games
+        self.capped += other.capped
+        self.score.merge(other.score)
+        self.length.merge(other.length)
+        self.hit_rate.merge(other.hit_rate)
+
+
+class Job:
+    """
+    One batch of games with a single mode, bot and tuning, run by one worker.
+    """
+    def __init__(self, mode: str, bot: str, tuning: Tuning, base_seed: int,
+                 first_game: int, games: int) -> None:
+        """
+        Initialize the batch.
+        """
+        self.mode = mode
+        self.bot = bot
+        self.tuning = tuning
+        self.base_seed = base_seed
+        self.first_game = first_game
+        self.games = games
+
+
+def game_seed(base_seed: int, game: int) -> int:
+    """
+    Return the seed of the game with the given index.
+    """
+    return random.Random(base_seed * 1_000_003 + game).getrandbits(63)
+
+
+def run_job(job: Job) -> Aggregate:
+    """
+    Play every game of a batch and return their summary.
+    """
+    aggregate = Aggregate()
+    bot = Bot.parse(job.bot)
+    max_steps = int(MAX_GAME_MINUTES * 60 * 1000 / STEP_MS)
+    for game in range(job.first_game, job.first_game + job.games):
+        seed = game_seed(job.base_seed, game)
+        clock = ManualClock()
+        session = create_session(job.mode, seed, clock, job.tuning)
+        bot.reset(seed)
+        simulate(session, clock, STEP_MS, bot, max_steps)
+        hit_rate = bot.hits / bot.shots if bot.shots else 0.0
+        aggregate.add_game(session.score, session.step_count * STEP_MS / 1000, hit_rate,
+                           session.running)
+    return aggregate
+
+
+def parse_sweep(values: list[str]) -> list[tuple[str, list[float]]]:
+    """
+    Parse "name=v1,v2,..." arguments into (name, values) pairs.
+    """
+    sweep = []
+    for value in values:
+        name, _, options = value.partition("=")
+        sweep.append((name, [float(option) for option in options.split(",")]))
+    return sweep
+
+
+def make_tuning(settings: dict[str, float]) -> Tuning:
+    """
+    Create a Tuning with the given parameters changed from the defaults.
+    Point values are given as "points.<duck type>".
+    """
+    tuning = Tuning(points=DEFAULT_TUNING.points)
+    for name, value in settings.items():
+        if name.startswith("points."):
+            tuning.points[name.split(".", 1)[1]] = int(value)
+        elif name == "speed_multiplier":
+            tuning.speed_multiplier = value
+        elif name in ("milestone_bonus", "milestone_bonus_step", "zigzag_change_chance"):
+            setattr(tuning, name, int(value))
+        else:
+            raise ValueError(f"Unknown tuning parameter: {name}")
+    return tuning
+
+
+def make_jobs(modes: list[str], bots: list[str], settings: dict[str, float],
+              games: int, batch_size: int, base_seed: int) -> Iterator[Job]:
+    """
+    Split the games of one configuration into batches.
+    """
+    tuning = make_tuning(settings)
+    for mode in modes:
+        for bot in bots:
+            for first_game in range(0, games, batch_size):
+                yield Job(mode, bot, tuning, base_seed, first_game,
+                          min(batch_size, games - first_game))
+
+
+def format_row(label: str, aggregate: Aggregate) -> str:
+    """
+    Format the summary of one configuration as a table row.
+    """
+    score, length, hit_rate = aggregate.score, aggregate.length, aggregate.hit_rate
+    return (f"{label:<48} {aggregate.games:>7} {score.mean:>8.0f} {score.stdev():>7.0f} "
+            f"{score.percentile(0.5):>7.0f} {score.percentile(0.95):>7.0f} "
+            f"{length.mean:>7.1f} {length.percentile(0.95):>7.1f} "
+            f"{hit_rate.mean * 100:>6.1f}% {aggregate.capped:>6}")
+
+
+def main(argv: list[str]) -> int:
+    """
+    Run the harness from the command line.
+    """
+    parser = argparse.ArgumentParser(description="DuckHunt Monte Carlo balancing harness")
+    parser.add_argument("--games", type=int, default=2000,
+                        help="games per mode, bot and parameter combination")
+    parser.add_argument("--modes", nargs="+", default=["standard", "time"],
+                        choices=["standard", "time"])
+    parser.add_argument("--bot", action="append", dest="bots",
+                        help="name:accuracy:reaction_ms (repeatable)")
+    parser.add_argument("--sweep", action="append", default=[],
+                        help="parameter=v1,v2,... (repeatable), e.g. points.red=-25,-50")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args(argv)
+    bots = args.bots or DEFAULT_BOTS
+
+    sweep = parse_sweep(args.sweep)
+    names = [name for name, _ in sweep]
+    combinations = list(itertools.product(*(values for _, values in sweep)))
+    print(f"{'configuration':<48} {'games':>7} {'score':>8} {'stdev':>7} {'p50':>7} "
+          f"{'p95':>7} {'len s':>7} {'p95 s':>7} {'hits':>7} {'capped':>6}")
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        for combination in combinations:
+            settings = dict(zip(names, combination))
+            jobs = list(make_jobs(args.modes, bots, settings, args.games,
+                                  args.batch_size, args.seed))
+            results: dict[tuple[str, str], Aggregate] = {}
+            # map() yields in submission order, so merging is reproducible
+            for job, aggregate in zip(jobs, executor.map(run_job, jobs)):
+                results.setdefault((job.mode, job.bot), Aggregate()).merge(aggregate)
+            parameters = " ".join(f"{name}={value:g}" for name, value in settings.items())
+            for (mode, bot), aggregate in results.items():
+                label = f"{mode} {bot.split(':')[0]} {parameters}".strip()
+                print(format_row(label, aggregate), flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
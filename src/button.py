@@ -3,6 +3,7 @@ This module defines the Button class used in the DuckHunt game for handling UI b
 """
 import pygame
 from pygame.locals import MOUSEBUTTONDOWN
+from src.text_cache import get_text_cache
 
 class Button:
     """
@@ -25,12 +26,18 @@ class Button:
         """
         Draw the button on the screen with hover effect.
         """
-        color = self.hover_color if self.rect.collidepoint(mouse_pos) else self.color
+        color = self.hover_color if self.is_hovered(mouse_pos) else self.color
         pygame.draw.rect(screen, color, self.rect)
-        text_surface = self.font.render(self.text, True, pygame.Color("white"))
+        text_surface = get_text_cache().render(self.font, self.text, "white")
         text_rect = text_surface.get_rect(center=self.rect.center)
         screen.blit(text_surface, text_rect)
 
+    def is_hovered(self, mouse_pos: tuple[int, int]) -> bool:
+        """
+        Check if the mouse is over the button.
+        """
+        return bool(self.rect.collidepoint(mouse_pos))
+
     def is_clicked(self, event: pygame.event.Event) -> bool:
         """
         Check if the button has been clicked.
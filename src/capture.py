@@ -0,0 +1,120 @@
+"""
+This module provides on-demand profiling for stutters that only show up on the
+machines the game runs on. Pressing PROFILE_KEY during the game or in the menus
+runs cProfile for the next frames and writes a pstats dump and a flat text
+summary next to the results files. While no capture runs, the game loops only
+pay for checking ProfileCapture.active once per frame.
+"""
+import cProfile
+import io
+import os
+import pstats
+import time
+import pygame
+
+PROFILE_KEY = pygame.K_F4  # Starts a capture (or ends a running one early)
+CAPTURE_FRAMES = 300       # Frames profiled per capture (5 s at 60 FPS)
+CAPTURE_DIR = "."          # The results files are written to the working directory
+SUMMARY_LINES = 40         # Functions listed in the text summary
+
+
+class ProfileCapture:
+    """
+    This class profiles a fixed number of frames on request. It is responsible for:
+      - Starting cProfile when the hotkey is pressed.
+      - Counting the frames of the game and menu loops while it runs (an idle
+        menu only counts a frame per input or IDLE_TIMEOUT_MS).
+      - Writing the profile as a pstats dump and a text summary sorted by own time.
+    """
+    def __init__(self, frames: int = CAPTURE_FRAMES, directory: str = CAPTURE_DIR) -> None:
+        """
+        Initialize an idle capture.
+        """
+        self.frames = frames
+        self.directory = directory
+        self.active = False
+        self.profile: cProfile.Profile | None = None
+        self.frames_left = 0
+        self.started = 0.0
+        self.last_paths: tuple[str, str] | None = None
+
+    def toggle(self) -> None:
+        """
+        Start a capture, or end the running one early.
+        """
+        if self.active:
+            self.stop()
+        else:
+            self.start()
+
+    def start(self) -> None:
+        """
+        Start profiling the next frames.
+        """
+        if self.active:
+            return
+        self.profile = cProfile.Profile()
+        self.frames_left = self.frames
+        self.started = time.perf_counter()
+        self.active = True
+        print(f"Profiling the next {self.frames} frames...")
+        self.profile.enable()
+
+    def end_frame(self) -> None:
+        """
+        Count a frame of a running capture and stop it after the last one.
+        Callers check active first, so an idle capture costs nothing more.
+        """
+        self.frames_left -= 1
+        if self.frames_left <= 0:
+            self.stop()
+
+    def stop(self) -> tuple[str, str] | None:
+        """
+        Stop profiling, write the results and return the paths of the pstats dump
+        and the summary.
+        """
+        if not self.active or self.profile is None:
+            return None
+        self.profile.disable()
+        self.active = False
+        seconds = time.perf_counter() - self.started
+        frames = self.frames - self.frames_left
+        name = time.strftime("profile-%Y%m%d-%H%M%S")
+        stats_path = os.path.join(self.directory, f"{name}.pstats")
+        number = 1
+        while os.path.exists(stats_path):  # Several captures within a second
+            number += 1
+            name = time.strftime(f"profile-%Y%m%d-%H%M%S-{number}")
+            stats_path = os.path.join(self.directory, f"{name}.pstats")
+        summary_path = os.path.join(self.directory, f"{name}.txt")
+        self.profile.dump_stats(stats_path)
+        with open(summary_path, "w", encoding="utf-8") as file:
+            file.write(self.summary(frames, seconds))
+        self.profile = None
+        self.last_paths = (stats_path, summary_path)
+        print(f"Profile of {frames} frames saved to {stats_path} and {summary_path}")
+        return self.last_paths
+
+    def summary(self, frames: int, seconds: float) -> str:
+        """
+        Return the flat profile of the capture: the functions that took the most
+        time themselves, without their callees.
+        """
+        assert self.profile is not None
+        stream = io.StringIO()
+        stream.write(f"{frames} frames in {seconds:.2f} s "
+                     f"({seconds * 1000 / max(frames, 1):.2f} ms per frame)\n")
+        stats = pstats.Stats(self.profile, stream=stream)
+        stats.strip_dirs().sort_stats(pstats.SortKey.TIME).print_stats(SUMMARY_LINES)
+        return stream.getvalue()
+
+
+capture = ProfileCapture()
+
+
+def get_profile_capture() -> ProfileCapture:
+    """
+    Return the process-wide profile capture shared by the game and the menus.
+    """
+    return capture
@@ -0,0 +1,167 @@
+"""
+This module provides the ChannelPool class, which decides on which mixer channel
+every sound effect plays. Each sound category (gunshots, combo, ...) gets its own
+reserved channels, each sound is limited to a number of concurrent voices, and a
+full category may steal voices from categories of lower priority, so rapid fire
+never silences the combo or game-over sounds. Only categories that allow it cut
+their own oldest voice when nothing lower is left; other sounds are dropped.
+"""
+import time
+import pygame
+
+
+class SoundCategory:
+    """
+    The channel budget of one kind of sound effect.
+    """
+    def __init__(self, name: str, channels: int, max_voices: int, priority: int,
+                 steal_own: bool = False) -> None:
+        """
+        Initialize the category. A sound of this category plays on at most
+        max_voices channels at once, and a higher priority wins when stealing.
+        With steal_own a new sound may cut the oldest voice of its own category.
+        """
+        self.name = name
+        self.channels = channels
+        self.max_voices = max_voices
+        self.priority = priority
+        self.steal_own = steal_own
+
+
+# Gunshots get the most voices, the combo and game-over sounds must never be cut
+CATEGORIES = [
+    SoundCategory("gunshot", channels=4, max_voices=3, priority=2, steal_own=True),
+    SoundCategory("combo", channels=1, max_voices=1, priority=3),
+    SoundCategory("game_over", channels=1, max_voices=1, priority=3),
+    SoundCategory("ambient", channels=2, max_voices=1, priority=1),
+    SoundCategory("effects", channels=2, max_voices=2, priority=1),
+]
+DEFAULT_CATEGORY = "effects"
+
+
+class ChannelPool:
+    """
+    This class manages the mixer channels used for sound effects. It is responsible for:
+      - Reserving a fixed set of channels for every sound category, so SDL never hands
+        them out on its own.
+      - Capping the number of voices of each sound; a new voice replaces its oldest one.
+      - Stealing the oldest voice of a lower-priority category when a category is full,
+        or of its own category if it allows that, and dropping the sound otherwise.
+      - Counting plays, steals, dropped sounds and the peak number of busy channels.
+    """
+    def __init__(self, categories: list[SoundCategory] = CATEGORIES) -> None:
+        """
+        Initialize the pool and reserve the channels of every category.
+        The mixer has to be initialized.
+        """
+        self.categories = {category.name: category for category in categories}
+        self.total = sum(category.channels for category in categories)
+        if pygame.mixer.get_num_channels() < self.total:
+            pygame.mixer.set_num_channels(self.total)
+        pygame.mixer.set_reserved(self.total)
+
+        self.channels: dict[str, list[pygame.mixer.Channel]] = {}
+        index = 0
+        for category in categories:
+            self.channels[category.name] = [pygame.mixer.Channel(index + offset)
+                                            for offset in range(category.channels)]
+            index += category.channels
+        self.started: dict[pygame.mixer.Channel, float] = {}
+        self.plays = 0
+        self.steals = 0
+        self.drops = 0
+        self.peak_busy = 0
+
+    def busy_channels(self, category: str | None = None) -> int:
+        """
+        Return the number of channels playing, in one category or in all of them.
+        """
+        names = [category] if category is not None else list(self.channels)
+        return sum(channel.get_busy() for name in names for channel in self.channels[name])
+
+    def pick_channel(self, sound: pygame.mixer.Sound,
+                     category: SoundCategory) -> pygame.mixer.Channel | None:
+        """
+        Return the channel the sound should play on, or None if it has to be dropped.
+        """
+        own = self.channels[category.name]
+        voices = [channel for channels in self.channels.values() for channel in channels
+                  if channel.get_busy() and channel.get_sound() is sound]
+        if len(voices) >= category.max_voices:
+            return min(voices, key=lambda channel: self.started.get(channel, 0.0))
+
+        lower = [channel for other in self.categories.values()
+                 if other.priority < category.priority
+                 for channel in self.channels[other.name]]
+        for channel in own + lower:
+            if not channel.get_busy():
+                return channel
+        # Every candidate is playing: steal from the least important, oldest voice
+        victims = lower or (own if category.steal_own else [])
+        if not victims:
+            return None
+        return min(victims, key=lambda channel: (
+            self.category_of(channel).priority, self.started.get(channel, 0.0)))
+
+    def category_of(self, channel: pygame.mixer.Channel) -> SoundCategory:
+        """
+        Return the category that owns a channel.
+        """
+        for name, channels in self.channels.items():
+            if channel in channels:
+                return self.categories[name]
+        raise ValueError("Channel is not managed by this pool")
+
+    def play(self, sound: pygame.mixer.Sound,
+             category: str = DEFAULT_CATEGORY) -> pygame.mixer.Channel | None:
+        """
+        Play a sound in the given category and return its channel, or None if it
+        was dropped.
+        """
+        channel = self.pick_channel(sound, self.categories[category])
+        if channel is None:
+            self.drops += 1
+            return None
+        if channel.get_busy():
+            self.steals += 1
+            channel.stop()
+        channel.play(sound)
+        self.started[channel] = time.perf_counter()
+        self.plays += 1
+        self.peak_busy = max(self.peak_busy, self.busy_channels())
+        return channel
+
+    def stop(self) -> None:
+        """
+        Stop every sound in the pool.
+        """
+        for channels in self.channels.values():
+            for channel in channels:
+                channel.stop()
+
+    def usage(self) -> dict[str, int]:
+        """
+        Return the number of busy channels of every category.
+        """
+        return {name: self.busy_channels(name) for name in self.channels}
+
+    def report(self) -> str:
+        """
+        Return a one-line summary of the mixer channel usage.
+        """
+        return (f"Mixer: {self.plays} sounds, peak {self.peak_busy} of {self.total} channels, "
+                f"{self.steals} stolen, {self.drops} dropped")
+
+
+channel_pool: ChannelPool | None = None
+
+
+def get_channel_pool() -> ChannelPool:
+    """
+    Return the process-wide channel pool, creating it on first use and again
+    after the mixer was restarted (which drops the extra channels).
+    """
+    global channel_pool
+    if channel_pool is None or pygame.mixer.get_num_channels() < channel_pool.total:
+        channel_pool = ChannelPool()
+    return channel_pool
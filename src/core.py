@@ -0,0 +1,635 @@
+"""
+This module implements the game rules of DuckHunt without depending on pygame.
+It contains the duck movement and respawn rules and the game session rules
+(lives, shots, scoring, milestone bonuses and time-mode expiry). Time and
+randomness are injected, so the rules can run headless and faster than real
+time; the pygame classes Duck and Gameplay only add rendering, sound and input
+on top of them.
+"""
+import math
+import random
+from collections.abc import Callable, Iterable, Sequence
+from typing import Generic, Protocol, TypeVar
+
+# Constants:
+FLYING_WINDOW_WIDTH = 800         # Width of the flying window
+FLYING_WINDOW_HEIGHT = 360        # Height of the flying window
+DUCK_WIDTH = 85                   # Width of a duck frame
+DUCK_HEIGHT = 90                  # Height of a duck frame
+DEFAULT_SPEED_X = 3               # Initial horizontal speed
+DEFAULT_SPEED_Y = -3              # Initial vertical speed
+RESPAWN_DELAY = 1.0               # Delay in seconds before a duck respawns
+SHOT_DISPLAY_TIME = 350           # Time in milliseconds to display the shot image before respawn
+ZIGZAG_CHANGE_CHANCE = 5          # Percentage chance for a zigzag movement
+FLY_OFF_TIME = 5                  # Time in seconds before a duck flies off the screen
+SPEED_MULTIPLIER = 1.1            # Speed increase on every respawn in standard mode
+OFF_SCREEN = -100                 # Position used while a duck waits to respawn
+
+POINTS = {"special": 100, "normal": 50, "red": -25}
+DUCK_TYPES = ["normal", "red", "special"]
+LIVES = 3                         # Lives at the start of a standard game
+SHOTS_PER_LIFE = 3                # Shots before a life is lost in standard mode
+MILESTONE_HITS = 5                # Hits needed for a milestone bonus
+TIME_MODE_DURATION = 60           # Length of a time-mode game in seconds
+DUCK_SWITCH_DELAY = 2.0           # Delay in seconds before the next duck appears
+MILESTONE_BONUS = 100             # Base bonus for reaching a milestone
+MILESTONE_BONUS_STEP = 5          # Extra bonus per milestone already reached
+
+Clock = Callable[[], int]
+
+
+class RectLike(Protocol):
+    """
+    The part of the pygame.Rect interface the rules use.
+    """
+    x: int
+    y: int
+    width: int
+    height: int
+
+    @property
+    def topleft(self) -> tuple[int, int]:
+        """
+        Return the top-left corner.
+        """
+
+    @property
+    def center(self) -> tuple[int, int]:
+        """
+        Return the center point.
+        """
+
+    def collidepoint(self, point: tuple[int, int], /) -> bool:
+        """
+        Return whether the point is inside the rect.
+        """
+
+
+def round_half_away(value: float) -> int:
+    """
+    Round to a whole pixel the way pygame.Rect does (halves away from zero).
+    """
+    return int(math.copysign(math.floor(abs(value) + 0.5), value))
+
+
+class Tuning:
+    """
+    The balancing parameters of the rules. The defaults are the values the game
+    ships with; the balancing harness sweeps them.
+    """
+    def __init__(self, points: dict[str, int] | None = None,
+                 milestone_bonus: int = MILESTONE_BONUS,
+                 milestone_bonus_step: int = MILESTONE_BONUS_STEP,
+                 speed_multiplier: float = SPEED_MULTIPLIER,
+                 zigzag_change_chance: int = ZIGZAG_CHANGE_CHANCE) -> None:
+        """
+        Initialize the parameters, falling back to the defaults.
+        """
+        self.points = dict(POINTS if points is None else points)
+        self.milestone_bonus = milestone_bonus
+        self.milestone_bonus_step = milestone_bonus_step
+        self.speed_multiplier = speed_multiplier
+        self.zigzag_change_chance = zigzag_change_chance
+
+    def __repr__(self) -> str:
+        """
+        Return the parameters as text.
+        """
+        return (f"Tuning(points={self.points}, milestone_bonus={self.milestone_bonus}, "
+                f"milestone_bonus_step={self.milestone_bonus_step}, "
+                f"speed_multiplier={self.speed_multiplier}, "
+                f"zigzag_change_chance={self.zigzag_change_chance})")
+
+
+DEFAULT_TUNING = Tuning()
+
+
+class ManualClock:
+    """
+    A clock that only moves when it is advanced. It returns milliseconds like
+    pygame.time.get_ticks and is used to run the rules faster than real time.
+    The elapsed time is kept apart from the start time, so the same sequence of
+    advances gives the same readings whatever the clock started at.
+    """
+    def __init__(self, start: int = 0) -> None:
+        """
+        Initialize the clock at the given time in milliseconds.
+        """
+        self.start = start
+        self.elapsed = 0.0
+
+    def __call__(self) -> int:
+        """
+        Return the current time in whole milliseconds.
+        """
+        return self.start + int(self.elapsed)
+
+    def advance(self, milliseconds: float) -> None:
+        """
+        Move the clock forward.
+        """
+        self.elapsed += milliseconds
+
+    def rebase(self) -> None:
+        """
+        Make the current reading the new start time.
+        """
+        self.start = self()
+        self.elapsed = 0.0
+
+
+class Box:
+    """
+    A minimal pygame-free stand-in for pygame.Rect with integer coordinates.
+    """
+    __slots__ = ("_x", "_y", "width", "height")
+
+    def __init__(self, x: int, y: int, width: int, height: int) -> None:
+        """
+        Initialize the box with its position and size.
+        """
+        self._x = x
+        self._y = y
+        self.width = width
+        self.height = height
+
+    @property
+    def x(self) -> int:
+        """
+        Return the left edge.
+        """
+        return self._x
+
+    @x.setter
+    def x(self, value: int) -> None:
+        self._x = value
+
+    @property
+    def y(self) -> int:
+        """
+        Return the top edge.
+        """
+        return self._y
+
+    @y.setter
+    def y(self, value: int) -> None:
+        self._y = value
+
+    @property
+    def topleft(self) -> tuple[int, int]:
+        """
+        Return the top-left corner.
+        """
+        return self._x, self._y
+
+    @topleft.setter
+    def topleft(self, value: tuple[int, int]) -> None:
+        self._x, self._y = value
+
+    @property
+    def center(self) -> tuple[int, int]:
+        """
+        Return the center point.
+        """
+        return self._x + self.width // 2, self._y + self.height // 2
+
+    def collidepoint(self, point: tuple[int, int]) -> bool:
+        """
+        Return whether the point is inside the box.
+        """
+        x, y = point
+        return self._x <= x < self._x + self.width and self._y <= y < self._y + self.height
+
+
+class DuckLogic:
+    """
+    This class holds the rules for a single duck. It is responsible for:
+      - Moving the duck, with a chance to zigzag, and bouncing it off the flying window.
+      - Making the duck fly off the screen after FLY_OFF_TIME.
+      - Respawning the duck after it was shot or flew off, with a delay.
+    Subclasses may override animate() and set_facing() to follow the state visually.
+    """
+    def __init__(self, screen_width: int, duck_type: str, rect: RectLike | None = None,
+                 get_ticks: Clock | None = None, rng: random.Random | None = None,
+                 tuning: Tuning = DEFAULT_TUNING) -> None:
+        """
+        Initialize the duck. The rect may be any object with pygame.Rect-like
+        x, y, width, height and topleft attributes.
+        """
+        self.tuning = tuning
+        self.get_ticks: Clock = get_ticks if get_ticks is not None else ManualClock()
+        self.rng = rng if rng is not None else random.Random()
+        self.screen_width = screen_width
+        self.rect: RectLike = rect if rect is not None else Box(0, 0, DUCK_WIDTH, DUCK_HEIGHT)
+        self.duck_type = duck_type
+
+        # Define the flying window (800x360)
+        self.x_min = 0
+        self.x_max = screen_width - self.rect.width
+        self.y_min = 0
+        self.y_max = FLYING_WINDOW_HEIGHT - self.rect.height
+
+        # Add movement speed
+        self.speed_x: float = float(DEFAULT_SPEED_X)
+        self.speed_y: float = float(DEFAULT_SPEED_Y)
+        self.flying_off_screen = False
+        self.facing_right = self.speed_x > 0  # Set direction based on speed
+        self.set_facing(self.facing_right)
+        self.spawn_time = 0  # Track duck's time on the screen
+        self.appear_time = 0  # When the duck last became visible
+
+        self.previous_position = self.rect.topleft  # Position before the last step
+        self.respawn(initial_spawn=True)
+        self.waiting_to_respawn = False
+        self.respawn_timer_start: int | None = None
+        self.respawn_delay = RESPAWN_DELAY
+        self.alive = True
+        self.shot_time: int | None = None  # To track when the duck was shot
+        self.is_shot = False  # Indicator if the duck was recently shot
+
+    def set_facing(self, facing_right: bool) -> None:
+        """
+        Set the direction the duck is facing.
+        """
+        self.facing_right = facing_right
+
+    def animate(self) -> None:
+        """
+        Advance the visual state of the duck by one step (nothing without a renderer).
+        """
+
+    def reset(self) -> None:
+        """
+        Return the duck to its initial speed, direction and flags for a new game.
+        """
+        self.speed_x = float(DEFAULT_SPEED_X)
+        self.speed_y = float(DEFAULT_SPEED_Y)
+        self.flying_off_screen = False
+        self.is_shot = False
+        self.shot_time = None
+        self.set_facing(True)
+
+    def make_duck_fly_off(self) -> None:
+        """
+        Make the duck fly off the screen.
+        """
+        self.flying_off_screen = True
+        self.speed_y = -abs(self.speed_y) # Makes the duck go upwards
+
+    def mark_shot(self) -> None:
+        """
+        Mark the duck as shot; it respawns after SHOT_DISPLAY_TIME.
+        """
+        self.is_shot = True
+        self.shot_time = self.get_ticks()
+
+    def move(self) -> None:
+        """
+        Moves the duck and ensures it bounces correctly.
+        """
+        self.previous_position = self.rect.topleft
+        if self.is_shot:
+            # Check if enough time has passed to respawn the duck
+            current_time = self.get_ticks()
+            if self.shot_time is not None and current_time - self.shot_time > SHOT_DISPLAY_TIME:
+                self.is_shot = False
+                self.respawn()
+            return
+        if self.alive:
+            time_on_screen = (self.get_ticks() - self.spawn_time) / 1000
+            if time_on_screen > FLY_OFF_TIME:
+                self.make_duck_fly_off()
+
+            self.rect.x = round_half_away(self.rect.x + self.speed_x)
+            self.rect.y = round_half_away(self.rect.y + self.speed_y)
+
+            self.animate()
+
+            # Handle flying-off-screen condition
+            if self.flying_off_screen:
+                if (self.rect.y < -self.rect.height or
+                        self.rect.x < -self.rect.width or
+                        self.rect.x > self.screen_width):
+                    self.flying_off_screen = False
+                    self.respawn()
+                return  # Skip boundary checks if flying off
+
+            # Chance to move on zigzag
+            if self.rng.randint(1, 100) < self.tuning.zigzag_change_chance:
+                self.speed_y = -self.speed_y
+
+            # Bounce off the left and right edges
+            if self.rect.x <= self.x_min or self.rect.x >= self.x_max:
+                self.speed_x = -self.speed_x  # Reverse direction
+                self.set_facing(not self.facing_right)  # Flip sprite direction
+
+            # Bounce off the bottom boundary
+            if self.rect.y >= self.y_max:
+                self.rect.y = self.y_max
+                self.speed_y = -abs(self.speed_y)
+
+            # Bounce off the top boundary
+            if self.rect.y <= self.y_min:
+                self.speed_y = abs(self.speed_y)
+
+    def respawn(self, mode: str = "standard", initial_spawn: bool = False) -> None:
+        """
+        Respawns the duck at a valid position, either on the first spawn or after a delay.
+        """
+        self.waiting_to_respawn = True
+        self.respawn_timer_start = self.get_ticks()
+        self.flying_off_screen = False
+
+        if initial_spawn:
+            # Set the position correctly for the first spawn
+            self.rect.x = self.rng.randint(self.x_min, self.x_max)
+            self.rect.y = self.y_max
+            self.previous_position = self.rect.topleft
+            self.alive = True
+            self.waiting_to_respawn = False  # Skip delay for the first appearance
+            self.appear_time = self.get_ticks()
+        else:
+            # Move the duck off-screen temporarily during the delay
+            self.rect.x = OFF_SCREEN
+            self.rect.y = OFF_SCREEN
+            self.alive = False
+
+        # Increase speed
+        if mode == "standard" and not initial_spawn:
+            self.speed_x *= self.tuning.speed_multiplier
+            self.speed_y *= self.tuning.speed_multiplier
+
+        # Ensure the duck keeps moving right and up
+        self.speed_x = abs(self.speed_x)
+        self.speed_y = -abs(self.speed_y)
+
+        # Start the timer for flying
+        self.spawn_time = self.get_ticks()
+
+    def handle_respawn(self) -> None:
+        """
+        Respawns the duck after the delay has passed.
+        """
+        if self.waiting_to_respawn and self.respawn_timer_start is not None:
+            elapsed_time: float = (self.get_ticks() - self.respawn_timer_start) / 1000.0
+            if elapsed_time >= self.respawn_delay:
+                self.waiting_to_respawn = False
+                self.alive = True
+                self.appear_time = self.get_ticks()
+                # Spawn the duck at a random position on the grass level
+                self.rect.x = self.rng.randint(self.x_min, self.x_max)
+                self.rect.y = self.y_max
+                self.previous_position = self.rect.topleft
+
+                self.speed_x = abs(self.speed_x)  # Ensure it starts moving right
+                self.set_facing(True)  # Ensure it's facing right
+                self.speed_y = -abs(self.speed_y)  # Ensure it starts moving upwards
+
+
+DuckT = TypeVar("DuckT", bound=DuckLogic)
+
+
+class GameSession(Generic[DuckT]):
+    """
+    This class holds the rules of one game. It is responsible for:
+      - Switching to a random duck after the current one is gone.
+      - Resolving shots into hits and misses, scoring and milestone bonuses.
+      - Tracking lives and shots in standard mode and the time limit in time mode.
+      - Detecting the end of the game.
+    Subclasses may override process_hit(), find_targets(), record_shot() and
+    handle_game_over() to add sound, precise hit testing, telemetry and the
+    game-over screen.
+    """
+    def __init__(self, ducks: list[DuckT], mode: str = "standard",
+                 get_ticks: Clock | None = None, rng: random.Random | None = None,
+                 tuning: Tuning = DEFAULT_TUNING) -> None:
+        """
+        Initialize the game rules for the given ducks.
+        """
+        self.tuning = tuning
+        self.mode = mode
+        self.get_ticks: Clock = get_ticks if get_ticks is not None else ManualClock()
+        self.rng = rng if rng is not None else random.Random()
+        self.ducks = ducks
+        self.current_duck = self.ducks[0]
+        self.new_duck_timer_start: int | None = None
+        self.duck_switch_delay = DUCK_SWITCH_DELAY
+        self.duck_hits = 0
+        self.step_count = 0  # Number of update() steps since the game started
+
+        self.score = 0
+        self.running = True
+        self.game_over_flag = False
+
+        self.total_time: int | None = None
+        self.lives = LIVES if mode == "standard" else None
+        self.shots_remaining = SHOTS_PER_LIFE if mode == "standard" else None
+        self.start_time: int | None = None
+
+    def switch_duck_with_delay(self) -> None:
+        """
+        Switch to a new duck after the specified delay.
+        """
+        if self.new_duck_timer_start is None:
+            # Start the timer when switching is triggered
+            self.new_duck_timer_start = self.get_ticks()
+
+        elapsed_time = (self.get_ticks() - self.new_duck_timer_start) / 1000
+        if elapsed_time >= self.duck_switch_delay:
+            # Delay has passed, switch to a new duck and reset the timer
+            self.new_duck_timer_start = None
+            self.current_duck = self.rng.choice(self.ducks)
+            self.current_duck.respawn(mode=self.mode)
+
+    def award_milestone_bonus(self) -> None:
+        """
+        Award bonus points for reaching a milestone.
+        """
+        milestone_bonus = (self.tuning.milestone_bonus +
+                           (self.duck_hits // MILESTONE_HITS) * self.tuning.milestone_bonus_step)
+        self.score += milestone_bonus
+
+    def score_hit(self, duck: DuckT) -> bool:
+        """
+        Score a hit on the duck and mark it as shot. Return whether a milestone
+        bonus was awarded.
+        """
+        self.score += self.tuning.points.get(duck.duck_type, 0)
+        self.score = max(self.score, 0)
+
+        self.duck_hits += 1
+        milestone = self.duck_hits % MILESTONE_HITS == 0
+        if milestone:
+            self.award_milestone_bonus()
+
+        duck.mark_shot()
+        return milestone
+
+    def process_hit(self, play_combo_sound: bool = False, duck: DuckT | None = None) -> None:
+        """
+        Handle a successful hit on the given duck (the current duck by default).
+        """
+        self.score_hit(duck if duck is not None else self.current_duck)
+
+    def process_miss(self) -> None:
+        """
+        Handle a missed shot in standard mode.
+        """
+        assert self.shots_remaining is not None
+        self.shots_remaining -= 1
+        if self.shots_remaining == 0:
+            assert self.lives is not None
+            self.lives -= 1
+            if self.lives > 0:
+                self.current_duck.make_duck_fly_off()
+                self.shots_remaining = SHOTS_PER_LIFE
+            # With no lives left the next update() ends the game
+
+    def get_targets(self) -> list[DuckT]:
+        """
+        Return the targets that can be shot, in draw order.
+        """
+        return [self.current_duck] if self.current_duck.alive else []
+
+    def find_targets(self, positions: Sequence[tuple[int, int]]) -> list[DuckT | None]:
+        """
+        Return the topmost target under each shot position, testing rects only.
+        """
+        targets = self.get_targets()
+        results: list[DuckT | None] = []
+        for position in positions:
+            hit = None
+            for target in reversed(targets):
+                if target.rect.collidepoint(position):
+                    hit = target
+                    break
+            results.append(hit)
+        return results
+
+    def check_shooting(self, mouse_pos: tuple) -> None:
+        """
+        Check if the duck was shot and update game state accordingly.
+        """
+        self.resolve_shots([mouse_pos])
+
+    def resolve_shots(self, positions: Sequence[tuple[int, int]]) -> None:
+        """
+        Resolve every shot fired in one frame. A target hit by several shots in the
+        same frame is scored only once.
+        """
+        resolved: set[int] = set()
+
+        for position, target in zip(positions, self.find_targets(positions)):
+            if target is not None:
+                if id(target) not in resolved:
+                    resolved.add(id(target))
+                    self.process_hit(play_combo_sound=self.mode == "standard", duck=target)
+                if self.mode == "standard":
+                    self.shots_remaining = SHOTS_PER_LIFE
+            elif self.mode == "standard":
+                self.process_miss()
+            self.record_shot(position, target)
+
+    def record_shot(self, position: tuple[int, int], target: DuckT | None) -> None:
+        """
+        Called after every resolved shot with the target it hit, if any.
+        """
+
+    def reset_game(self, seed: int | None = None) -> None:
+        """
+        Reset the game state to start a new game. With a seed, the random generator
+        is reseeded so the game can be reproduced.
+        """
+        if seed is not None:
+            self.rng.seed(seed)
+        for duck in self.ducks:
+            duck.reset()
+        self.score = 0
+        self.step_count = 0
+        self.new_duck_timer_start = None
+        self.current_duck = self.rng.choice(self.ducks)
+        self.current_duck.respawn(mode=self.mode)
+        self.running = True
+        self.game_over_flag = False
+        self.current_duck.speed_x = DEFAULT_SPEED_X
+        self.current_duck.speed_y = DEFAULT_SPEED_Y
+        self.duck_hits = 0
+
+        if self.mode == "standard":
+            self.lives = LIVES
+            self.shots_remaining = SHOTS_PER_LIFE
+        else:
+            self.start_time = self.get_ticks()
+            self.total_time = TIME_MODE_DURATION
+
+    def remaining_time(self) -> int:
+        """
+        Return the whole seconds left in a time-mode game.
+        """
+        assert self.start_time is not None
+        assert self.total_time is not None
+        elapsed_time = (self.get_ticks() - self.start_time) / 1000
+        return max(int(self.total_time - elapsed_time), 0)
+
+    def handle_game_over(self) -> None:
+        """
+        End the game.
+        """
+        self.running = False
+
+    def update(self) -> None:
+        """
+        Update game logic for duck status and game over conditions.
+        """
+        if not self.current_duck.alive:
+            self.switch_duck_with_delay()
+
+        if self.mode == "standard":
+            if self.lives == 0 and not self.game_over_flag:
+                self.game_over_flag = True
+                self.handle_game_over()
+        else:
+            assert self.start_time is not None
+            elapsed_time = (self.get_ticks() - self.start_time) / 1000
+            if self.total_time and elapsed_time >= self.total_time and not self.game_over_flag:
+                self.game_over_flag = True
+                self.handle_game_over()
+
+        self.current_duck.handle_respawn()
+        if self.current_duck.alive:
+            self.current_duck.move()
+        self.step_count += 1
+
+
+def create_session(mode: str = "standard", seed: int | None = None,
+                   clock: ManualClock | None = None,
+                   tuning: Tuning = DEFAULT_TUNING) -> GameSession[DuckLogic]:
+    """
+    Create a headless game session with one duck of every type, sharing one clock
+    and one seeded random generator.
+    """
+    clock = clock if clock is not None else ManualClock()
+    rng = random.Random(seed)
+    ducks = [DuckLogic(FLYING_WINDOW_WIDTH, duck_type, get_ticks=clock, rng=rng, tuning=tuning)
+             for duck_type in DUCK_TYPES]
+    return GameSession(ducks, mode, get_ticks=clock, rng=rng, tuning=tuning)
+
+
+def simulate(session: GameSession[DuckT], clock: ManualClock, step_ms: float,
+             shooter: Callable[[GameSession[DuckT]], Iterable[tuple[int, int]]] | None = None,
+             max_steps: int = 1_000_000) -> GameSession[DuckT]:
+    """
+    Run a session until its game is over. Before every step the shooter (if any)
+    returns the shots fired during that step.
+    """
+    session.reset_game()
+    for _ in range(max_steps):
+        if not session.running:
+            break
+        if shooter is not None:
+            shots = list(shooter(session))
+            if shots:
+                session.resolve_shots(shots)
+        session.update()
+        clock.advance(step_ms)
+    return session
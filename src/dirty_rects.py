@@ -0,0 +1,128 @@
+"""
+This module provides the DirtyRectRenderer class, which redraws only the parts
+of the screen that changed since the last frame. Instead of blitting the whole
+background and flipping the display, it restores the background under sprites
+that moved or changed and pushes just those regions with
+pygame.display.update(rects).
+"""
+from typing import Any
+import pygame
+
+
+def merge_rects(rects: list[pygame.Rect]) -> list[pygame.Rect]:
+    """
+    Replace overlapping rects by their union, so no pixel is restored or pushed twice.
+    """
+    merged: list[pygame.Rect] = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+class DirtyRectRenderer:
+    """
+    This class draws a frame as a list of named sprites on top of a static
+    background. It is responsible for:
+      - Comparing every sprite with the one drawn under the same name in the
+        last frame and marking its old and new rects dirty if it moved or changed.
+      - Redrawing unchanged sprites that overlap a dirty region, so nothing is lost.
+      - Restoring the background only inside the dirty rects and updating only them.
+      - Counting how many pixels were pushed compared to full-frame rendering.
+    Sprites are drawn in the order they were added, so later sprites are on top.
+    """
+    def __init__(self, screen: pygame.Surface) -> None:
+        """
+        Initialize the renderer for the given display surface.
+        """
+        self.screen = screen
+        self.background: pygame.Surface | None = None
+        self.sprites: dict[str, tuple[pygame.Surface, pygame.Rect, Any]] = {}
+        self.previous: dict[str, tuple[pygame.Surface, pygame.Rect, Any]] = {}
+        self.frames = 0
+        self.pixels_updated = 0
+
+    def invalidate(self) -> None:
+        """
+        Force the next frame to be drawn and pushed in full, e.g. after another
+        screen drew over the display.
+        """
+        self.background = None
+        self.previous = {}
+
+    def blit(self, name: str, surface: pygame.Surface, position: tuple[int, int],
+             key: Any = None) -> None:
+        """
+        Add a sprite to the current frame. The sprite counts as changed if its
+        position or its key differ from the last frame. The key defaults to the
+        surface itself, so pass the text of freshly rendered text instead.
+        """
+        rect = surface.get_rect(topleft=position)
+        self.sprites[name] = (surface, rect, surface if key is None else key)
+
+    def dirty_rects(self) -> list[pygame.Rect]:
+        """
+        Return the regions of the screen that changed since the last frame.
+        """
+        dirty = [rect for name, (_, rect, _) in self.previous.items()
+                 if name not in self.sprites]
+        for name, (_, rect, key) in self.sprites.items():
+            old = self.previous.get(name)
+            if old is None:
+                dirty.append(rect)
+            elif old[1] != rect or old[2] != key:
+                dirty.extend((old[1], rect))
+        return [rect for rect in dirty if rect.width and rect.height]
+
+    def present(self, background: pygame.Surface) -> list[pygame.Rect]:
+        """
+        Draw the current frame over the background, push it to the display and
+        return the rects that were updated.
+        """
+        screen_rect = self.screen.get_rect()
+        if background is not self.background:
+            self.screen.blit(background, (0, 0))
+            for surface, rect, _ in self.sprites.values():
+                self.screen.blit(surface, rect)
+            pygame.display.flip()
+            updated = [screen_rect]
+        else:
+            updated = merge_rects(self.dirty_rects())
+            # Unchanged sprites under a dirty rect have to be drawn again
+            redraw = set()
+            grown = True
+            while grown:
+                grown = False
+                for name, (_, rect, _) in self.sprites.items():
+                    if name not in redraw and rect.collidelist(updated) != -1:
+                        redraw.add(name)
+                        updated = merge_rects(updated + [rect])
+                        grown = True
+            updated = [rect.clip(screen_rect) for rect in updated]
+            for rect in updated:
+                self.screen.blit(background, rect, rect)
+            for name, (surface, rect, _) in self.sprites.items():
+                if name in redraw:
+                    self.screen.blit(surface, rect)
+            pygame.display.update(updated)
+
+        self.frames += 1
+        self.pixels_updated += sum(rect.width * rect.height for rect in updated)
+        self.background = background
+        self.previous = self.sprites
+        self.sprites = {}
+        return updated
+
+    def pixels_saved_per_frame(self) -> float:
+        """
+        Return the average number of pixels per frame that full-frame rendering
+        would have pushed and this renderer did not.
+        """
+        if self.frames == 0:
+            return 0.0
+        full = self.screen.get_width() * self.screen.get_height()
+        return full - self.pixels_updated / self.frames
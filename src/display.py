@@ -0,0 +1,155 @@
+"""
+This module creates the game window and chooses how frames reach it. The
+"software" backend blits everything to the display surface, as pygame always
+did. The "gpu" backend draws the gameplay with pygame._sdl2.video: every image
+is uploaded once as a Texture and then drawn with copy calls, so compositing a
+frame costs the GPU instead of the CPU. Without a GPU, SDL's software renderer
+is used instead. Screens that draw on a Surface (menus, game over, loading)
+still work with the gpu backend: their surface is uploaded on every flip().
+Event loops treat every event in QUIT_EVENTS as a request to quit.
+"""
+from collections import OrderedDict
+import pygame
+from pygame._sdl2.video import Renderer, Texture, Window
+from pygame._sdl2.sdl2 import error as SDLError
+
+BACKENDS = ["software", "gpu"]
+MAX_TEXTURES = 512          # Uploaded surfaces kept before the least recently used is dropped
+HIDDEN_DISPLAY = (1, 1)     # Display mode that only exists so images can be converted
+# Closing the gpu window only sends WINDOWCLOSE, since the hidden display stays open
+QUIT_EVENTS = (pygame.QUIT, pygame.WINDOWCLOSE)
+
+
+class TextureRenderer:
+    """
+    This class draws frames with an SDL2 Renderer. It is responsible for:
+      - Opening the window with a hardware renderer, or SDL's software renderer
+        if no GPU is present.
+      - Uploading every surface it draws once and reusing its texture; a surface
+        must not change after it was drawn.
+      - Presenting a surface drawn by other screens through a streaming texture.
+    """
+    def __init__(self, size: tuple[int, int], title: str,
+                 max_textures: int = MAX_TEXTURES) -> None:
+        """
+        Open the window and create the renderer.
+        """
+        self.window = Window(title, size)
+        try:
+            self.renderer = Renderer(self.window, accelerated=1)
+            self.accelerated = True
+        except SDLError:
+            self.renderer = Renderer(self.window, accelerated=0)
+            self.accelerated = False
+        self.max_textures = max_textures
+        # Keyed by id(); keeping the surface alive keeps its id unique
+        self.textures: OrderedDict[int, tuple[pygame.Surface, Texture]] = OrderedDict()
+        self.uploads = 0
+        self.screen = pygame.Surface(size).convert()
+        self.screen_texture = Texture(self.renderer, size, streaming=True)
+
+    def describe(self) -> str:
+        """
+        Return which kind of renderer is in use.
+        """
+        return "GPU renderer" if self.accelerated else "SDL software renderer (no GPU found)"
+
+    def texture(self, surface: pygame.Surface) -> Texture:
+        """
+        Return the texture of a surface, uploading it on first use.
+        """
+        key = id(surface)
+        entry = self.textures.get(key)
+        if entry is not None:
+            self.textures.move_to_end(key)
+            return entry[1]
+        texture = Texture.from_surface(self.renderer, surface)
+        self.uploads += 1
+        self.textures[key] = (surface, texture)
+        if len(self.textures) > self.max_textures:
+            self.textures.popitem(last=False)
+        return texture
+
+    def clear(self) -> None:
+        """
+        Start a new frame.
+        """
+        self.renderer.draw_color = pygame.Color("black")
+        self.renderer.clear()
+
+    def copy(self, surface: pygame.Surface, position: tuple[int, int]) -> None:
+        """
+        Draw a surface with its top-left corner at the given position.
+        """
+        texture = self.texture(surface)
+        texture.draw(dstrect=(position[0], position[1], texture.width, texture.height))
+
+    def present(self) -> None:
+        """
+        Show the drawn frame.
+        """
+        self.renderer.present()
+
+    def flip(self) -> None:
+        """
+        Upload the screen surface and show it, like pygame.display.flip().
+        """
+        self.screen_texture.update(self.screen)
+        self.screen_texture.draw()
+        self.renderer.present()
+
+    def close(self) -> None:
+        """
+        Close the window and drop every texture.
+        """
+        self.textures.clear()
+        self.window.destroy()
+
+
+texture_renderer: TextureRenderer | None = None
+
+
+def create_screen(size: tuple[int, int], title: str, backend: str = "software") -> pygame.Surface:
+    """
+    Open the game window with the given backend and return the surface the
+    screens draw on.
+    """
+    global texture_renderer
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown rendering backend: {backend}")
+    if backend == "software":
+        screen = pygame.display.set_mode(size)
+        pygame.display.set_caption(title)
+        return screen
+    # convert()/convert_alpha() need a display mode, so keep a hidden one
+    pygame.display.set_mode(HIDDEN_DISPLAY, pygame.HIDDEN)
+    texture_renderer = TextureRenderer(size, title)
+    print(f"Rendering with the {texture_renderer.describe()}")
+    return texture_renderer.screen
+
+
+def get_texture_renderer() -> TextureRenderer | None:
+    """
+    Return the texture renderer, or None with the software backend.
+    """
+    return texture_renderer
+
+
+def close_texture_renderer() -> None:
+    """
+    Close the texture renderer, if there is one.
+    """
+    global texture_renderer
+    if texture_renderer is not None:
+        texture_renderer.close()
+        texture_renderer = None
+
+
+def flip() -> None:
+    """
+    Show the screen surface with whichever backend is in use.
+    """
+    if texture_renderer is not None:
+        texture_renderer.flip()
+    else:
+        pygame.display.flip()
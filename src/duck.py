@@ -1,193 +1,108 @@
 """
-This module defines the Duck class, which encapsulates the behavior
-of a duck, including animation, movement, boundary collision (bouncing),
-respawn logic, and state changes (e.g., being shot). It supports different duck types
-(e.g., "normal", "red", "special") and uses sprite sheets for animation.
+This module defines the Duck class, which adds the sprite animation, shot images
+and drawing to the duck rules from src.core (movement, boundary collision
+(bouncing), respawn logic and state changes such as being shot). It supports
+different duck types (e.g., "normal", "red", "special") and uses sprite sheets
+for animation.
 """
 import random
 import os
 import pygame
 from src.animation import Animation
+from src.assets import get_registry
+from src.core import (DuckLogic, Clock, FLYING_WINDOW_WIDTH, FLYING_WINDOW_HEIGHT,
+                      DEFAULT_SPEED_X, DEFAULT_SPEED_Y, RESPAWN_DELAY, SHOT_DISPLAY_TIME,
+                      ZIGZAG_CHANGE_CHANCE)
 
 ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets")
-# Constants:
-FLYING_WINDOW_WIDTH = 800         # Width of the flying window
-FLYING_WINDOW_HEIGHT = 360        # Height of the flying window
-DEFAULT_SPEED_X = 3               # Initial horizontal speed
-DEFAULT_SPEED_Y = -3              # Initial vertical speed
-RESPAWN_DELAY = 1.0               # Delay in seconds before a duck respawns
-SHOT_DISPLAY_TIME = 350           # Time in milliseconds to display the shot image before respawn
-ZIGZAG_CHANGE_CHANCE = 5          # Percentage chance for a zigzag movement
 
+__all__ = [
+    "Duck", "ASSETS_DIR", "SHOT_IMAGES", "FLYING_WINDOW_WIDTH", "FLYING_WINDOW_HEIGHT",
+    "DEFAULT_SPEED_X", "DEFAULT_SPEED_Y", "RESPAWN_DELAY", "SHOT_DISPLAY_TIME",
+    "ZIGZAG_CHANGE_CHANCE"
+]
 
-class Duck:
+SHOT_IMAGES = {
+    "normal": "normal_duck_shot.png",
+    "red": "red_duck_shot.png",
+    "special": "special_duck_shot.png"
+}
+
+
+class Duck(DuckLogic):
     """
-    This class handles the behavior and state of a duck in the game. It is responsible for:
+    This class adds the visual side to the duck rules. It is responsible for:
       - Loading the duck sprite and its animations.
-      - Managing movement and updating the duck's position based on speed 
-        (which can gradually increase).
-      - Handling boundary collisions (bouncing off the edges of the flying window).
-      - Managing state transitions, such as when the duck is shot and when it should respawn.
+      - Keeping the animation frame and direction in sync with the movement.
       - Supporting different duck types (e.g., "normal", "red", "special") with 
-        corresponding shot images.
+        corresponding shot images and collision masks.
+      - Drawing the duck, interpolated between simulation steps.
     """
+    rect: pygame.Rect
     def __init__(self, screen_width: int, screen_height: int,
-                 sprite_path: str, duck_type: str) -> None:
+                 sprite_path: str, duck_type: str, get_ticks: Clock | None = None,
+                 rng: random.Random | None = None) -> None:
         """
         Initialize the duck with animation and movement.
         """
-        self.screen_width = screen_width
         self.screen_height = screen_height
-        self.sprite_sheet = pygame.image.load(sprite_path).convert_alpha()
 
         # Initialize animation
-        self.animation = Animation(self.sprite_sheet, frame_width=85, frame_height=90)
+        self.animation = Animation(sprite_path, frame_width=85, frame_height=90)
         self.image = self.animation.get_current_frame()
-        self.rect = self.image.get_rect()
-        self.duck_type = duck_type
-
-        # Define the flying window (800x360)
-        self.x_min = 0
-        self.x_max = screen_width - self.rect.width
-        self.y_min = 0
-        self.y_max = FLYING_WINDOW_HEIGHT - self.rect.height
 
-        # Add movement speed
-        self.speed_x: float = float(DEFAULT_SPEED_X)
-        self.speed_y: float = float(DEFAULT_SPEED_Y)
-        self.flying_off_screen = False
-        self.facing_right = self.speed_x > 0  # Set direction based on speed
-        self.animation.set_direction(self.facing_right)
-        self.spawn_time = 0  # Track duck's time on the screen
+        shot_path = os.path.join(ASSETS_DIR, SHOT_IMAGES[duck_type])
+        self.shot_image, self.shot_image_flipped = get_registry().load_flipped(shot_path)
+        self.shot_masks = get_registry().load_flipped_masks(shot_path)
 
-        self.respawn(initial_spawn=True)
-        self.waiting_to_respawn = False
-        self.respawn_timer_start: int | None = None
-        self.respawn_delay = RESPAWN_DELAY
-        self.alive = True
+        super().__init__(screen_width, duck_type, self.image.get_rect(),
+                         get_ticks if get_ticks is not None else pygame.time.get_ticks, rng)
 
-        if self.duck_type == "normal":
-            shot_path = os.path.join(ASSETS_DIR, "normal_duck_shot.png")
-            self.shot_image = pygame.image.load(shot_path).convert_alpha()
-        elif self.duck_type == "red":
-            shot_path = os.path.join(ASSETS_DIR, "red_duck_shot.png")
-            self.shot_image = pygame.image.load(shot_path).convert_alpha()
-        elif self.duck_type == "special":
-            shot_path = os.path.join(ASSETS_DIR, "special_duck_shot.png")
-            self.shot_image = pygame.image.load(shot_path).convert_alpha()
-        self.shot_time: int | None = None  # To track when the duck was shot
-        self.is_shot = False  # Indicator if the duck was recently shot
-
-    def make_duck_fly_off(self) -> None:
+    def set_facing(self, facing_right: bool) -> None:
         """
-        Make the duck fly off the screen.
+        Set the direction the duck is facing and flip the animation with it.
         """
-        self.flying_off_screen = True
-        self.speed_y = -abs(self.speed_y) # Makes the duck go upwards
+        super().set_facing(facing_right)
+        self.animation.set_direction(facing_right)
+        self.image = self.animation.get_current_frame()
 
-    def move(self) -> None:
+    def reset(self) -> None:
         """
-        Moves the duck and ensures it bounces correctly.
+        Return the duck and its animation to their initial state for a new game.
         """
-        if self.is_shot:
-            # Check if enough time has passed to respawn the duck
-            current_time = pygame.time.get_ticks()
-            if self.shot_time is not None and current_time - self.shot_time > SHOT_DISPLAY_TIME:
-                self.is_shot = False
-                self.respawn()
-            return
-        if self.alive:
-            time_on_screen = (pygame.time.get_ticks() - self.spawn_time) / 1000
-            if time_on_screen > 5:
-                self.make_duck_fly_off()
-
-            self.rect.x += self.speed_x
-            self.rect.y += self.speed_y
-
-            # Update animation
-            self.animation.update()
-            self.image = self.animation.get_current_frame()
-
-            # Handle flying-off-screen condition
-            if self.flying_off_screen:
-                if (self.rect.y < -self.rect.height or
-                        self.rect.x < -self.rect.width or
-                        self.rect.x > self.screen_width):
-                    self.flying_off_screen = False
-                    self.respawn()
-                return  # Skip boundary checks if flying off
-
-            # Chance to move on zigzag
-            if random.randint(1, 100) < ZIGZAG_CHANGE_CHANCE:
-                self.speed_y = -self.speed_y
-
-            # Bounce off the left and right edges
-            if self.rect.x <= self.x_min or self.rect.x >= self.x_max:
-                self.speed_x = -self.speed_x  # Reverse direction
-                self.facing_right = not self.facing_right  # Flip sprite direction
-                self.animation.set_direction(self.facing_right)
-
-            # Bounce off the bottom boundary
-            if self.rect.y >= self.y_max:
-                self.rect.y = self.y_max
-                self.speed_y = -abs(self.speed_y)
-
-            # Bounce off the top boundary
-            if self.rect.y <= self.y_min:
-                self.speed_y = abs(self.speed_y)
+        super().reset()
+        self.animation.reset()
+        self.image = self.animation.get_current_frame()
 
-    def draw(self, screen: pygame.Surface) -> None:
+    def animate(self) -> None:
         """
-        Draw the duck on the screen
+        Advance the animation by one step.
         """
-        screen.blit(self.image, self.rect)
+        self.animation.update()
+        self.image = self.animation.get_current_frame()
 
-    def respawn(self, mode: str = "standard", initial_spawn: bool = False) -> None:
+    def draw(self, screen: pygame.Surface, alpha: float = 1.0) -> None:
         """
-        Respawns the duck at a valid position, either on the first spawn or after a delay.
+        Draw the duck on the screen, interpolated between its previous and current
+        position by alpha (0.0 is the previous step, 1.0 is the current one).
         """
-        self.waiting_to_respawn = True
-        self.respawn_timer_start = pygame.time.get_ticks()
-        self.flying_off_screen = False
-
-        if initial_spawn:
-            # Set the position correctly for the first spawn
-            self.rect.x = random.randint(self.x_min, self.x_max)
-            self.rect.y = self.y_max
-            self.alive = True
-            self.waiting_to_respawn = False  # Skip delay for the first appearance
-        else:
-            # Move the duck off-screen temporarily during the delay
-            self.rect.x = -100
-            self.rect.y = -100
-            self.alive = False
-
-        # Increase speed
-        if mode == "standard" and not initial_spawn:
-            self.speed_x *= 1.1
-            self.speed_y *= 1.1
-
-        # Ensure the duck keeps moving right and up
-        self.speed_x = abs(self.speed_x)
-        self.speed_y = -abs(self.speed_y)
+        screen.blit(self.image, self.draw_position(alpha))
 
-        # Start the timer for flying
-        self.spawn_time = pygame.time.get_ticks()
-
-    def handle_respawn(self) -> None:
+    def draw_position(self, alpha: float = 1.0) -> tuple[int, int]:
         """
-        Respawns the duck after the delay has passed.
+        Return the top-left corner the duck is drawn at for the given alpha.
         """
-        if self.waiting_to_respawn and self.respawn_timer_start is not None:
-            elapsed_time: float = (pygame.time.get_ticks() - self.respawn_timer_start) / 1000.0
-            if elapsed_time >= self.respawn_delay:
-                self.waiting_to_respawn = False
-                self.alive = True
-                # Spawn the duck at a random position on the grass level
-                self.rect.x = random.randint(self.x_min, self.x_max)
-                self.rect.y = self.y_max
-
-                self.speed_x = abs(self.speed_x)  # Ensure it starts moving right
-                self.facing_right = True # Ensure it's facing right
-                self.animation.set_direction(self.facing_right)  # Update animation direction
-                self.speed_y = -abs(self.speed_y)  # Ensure it starts moving upwards
+        if alpha >= 1.0:
+            return self.rect.topleft
+        previous_x, previous_y = self.previous_position
+        x = previous_x + (self.rect.x - previous_x) * alpha
+        y = previous_y + (self.rect.y - previous_y) * alpha
+        return round(x), round(y)
+
+    def get_mask(self) -> pygame.mask.Mask:
+        """
+        Return the collision mask of the image currently shown for the duck.
+        """
+        if self.is_shot:
+            return self.shot_masks[0] if self.facing_right else self.shot_masks[1]
+        return self.animation.get_current_mask()
@@ -0,0 +1,182 @@
+"""
+This module provides the DuckFlock class, a vectorized physics engine that moves
+many ducks at once. It keeps the state of every duck in NumPy arrays
+(struct-of-arrays) and applies the same rules as Duck.move, Duck.respawn and
+Duck.handle_respawn to all ducks in a single step.
+"""
+import numpy as np
+from src.core import (FLYING_WINDOW_HEIGHT, DEFAULT_SPEED_X, DEFAULT_SPEED_Y,
+                      RESPAWN_DELAY, SHOT_DISPLAY_TIME, ZIGZAG_CHANGE_CHANCE,
+                      FLY_OFF_TIME, SPEED_MULTIPLIER, OFF_SCREEN)
+
+FLY_OFF_TIME_MS = FLY_OFF_TIME * 1000  # Time in milliseconds before a duck flies off
+
+
+def round_like_rect(values: np.ndarray) -> np.ndarray:
+    """
+    Round to whole pixels the way pygame.Rect does (halves away from zero).
+    """
+    return np.sign(values) * np.floor(np.abs(values) + 0.5)
+
+
+class DuckFlock:
+    """
+    This class simulates a flock of ducks with vectorized operations. It is responsible for:
+      - Storing positions, velocities, timers, alive/shot flags and facing in NumPy arrays.
+      - Moving all ducks, applying the zigzag chance and bouncing off the flying window.
+      - Making ducks fly off after FLY_OFF_TIME_MS and respawning them after a delay.
+      - Marking ducks as shot and respawning them once the shot image was shown.
+    All times are in milliseconds and are passed in by the caller.
+    """
+    def __init__(self, count: int, screen_width: int = 800, frame_width: int = 85,
+                 frame_height: int = 90, seed: int | None = None, now: int = 0) -> None:
+        """
+        Initialize the flock and spawn every duck on the grass level.
+        """
+        self.count = count
+        self.screen_width = screen_width
+        self.frame_width = frame_width
+        self.frame_height = frame_height
+        self.rng = np.random.default_rng(seed)
+
+        # Define the flying window (800x360)
+        self.x_min = 0
+        self.x_max = screen_width - frame_width
+        self.y_min = 0
+        self.y_max = FLYING_WINDOW_HEIGHT - frame_height
+
+        self.x = np.zeros(count, dtype=np.float64)
+        self.y = np.zeros(count, dtype=np.float64)
+        self.speed_x = np.full(count, float(DEFAULT_SPEED_X))
+        self.speed_y = np.full(count, float(DEFAULT_SPEED_Y))
+        self.spawn_time = np.full(count, now, dtype=np.int64)
+        self.respawn_timer_start = np.full(count, now, dtype=np.int64)
+        self.shot_time = np.zeros(count, dtype=np.int64)
+        self.alive = np.zeros(count, dtype=bool)
+        self.is_shot = np.zeros(count, dtype=bool)
+        self.waiting_to_respawn = np.zeros(count, dtype=bool)
+        self.flying_off_screen = np.zeros(count, dtype=bool)
+        self.facing_right = np.ones(count, dtype=bool)
+
+        self.respawn(np.ones(count, dtype=bool), now, initial_spawn=True)
+
+    def respawn(self, mask: np.ndarray, now: int, mode: str = "standard",
+                initial_spawn: bool = False) -> None:
+        """
+        Respawn the selected ducks, either directly on the grass level or off-screen
+        after a delay, matching Duck.respawn.
+        """
+        self.waiting_to_respawn[mask] = True
+        self.respawn_timer_start[mask] = now
+        self.flying_off_screen[mask] = False
+
+        if initial_spawn:
+            self.x[mask] = self.random_x(int(np.count_nonzero(mask)))
+            self.y[mask] = self.y_max
+            self.alive[mask] = True
+            self.waiting_to_respawn[mask] = False
+        else:
+            self.x[mask] = OFF_SCREEN
+            self.y[mask] = OFF_SCREEN
+            self.alive[mask] = False
+            if mode == "standard":
+                self.speed_x[mask] *= SPEED_MULTIPLIER
+                self.speed_y[mask] *= SPEED_MULTIPLIER
+
+        self.speed_x[mask] = np.abs(self.speed_x[mask])
+        self.speed_y[mask] = -np.abs(self.speed_y[mask])
+        self.spawn_time[mask] = now
+
+    def handle_respawn(self, now: int) -> None:
+        """
+        Bring back every duck whose respawn delay has passed, matching Duck.handle_respawn.
+        """
+        ready = (self.waiting_to_respawn &
+                 (now - self.respawn_timer_start >= RESPAWN_DELAY * 1000))
+        if not ready.any():
+            return
+        self.waiting_to_respawn[ready] = False
+        self.alive[ready] = True
+        self.x[ready] = self.random_x(int(np.count_nonzero(ready)))
+        self.y[ready] = self.y_max
+        self.speed_x[ready] = np.abs(self.speed_x[ready])
+        self.facing_right[ready] = True
+        self.speed_y[ready] = -np.abs(self.speed_y[ready])
+
+    def move(self, now: int) -> None:
+        """
+        Move every alive duck one step, matching Duck.move.
+        """
+        # Shot ducks stay in place until the shot image was displayed long enough
+        shown = self.alive & self.is_shot & (now - self.shot_time > SHOT_DISPLAY_TIME)
+        if shown.any():
+            self.is_shot[shown] = False
+            self.respawn(shown, now)
+
+        active = self.alive & ~self.is_shot
+        fly_off = active & (now - self.spawn_time > FLY_OFF_TIME_MS)
+        self.flying_off_screen[fly_off] = True
+        self.speed_y[fly_off] = -np.abs(self.speed_y[fly_off])
+
+        self.x[active] = round_like_rect(self.x[active] + self.speed_x[active])
+        self.y[active] = round_like_rect(self.y[active] + self.speed_y[active])
+
+        # Ducks flying off skip the boundary checks and respawn once they left the screen
+        flying = active & self.flying_off_screen
+        left_screen = flying & ((self.y < -self.frame_height) |
+                                (self.x < -self.frame_width) |
+                                (self.x > self.screen_width))
+        if left_screen.any():
+            self.respawn(left_screen, now)
+
+        bounded = active & ~flying
+        zigzag = bounded & (self.rng.integers(1, 101, self.count) < ZIGZAG_CHANGE_CHANCE)
+        self.speed_y[zigzag] = -self.speed_y[zigzag]
+
+        side = bounded & ((self.x <= self.x_min) | (self.x >= self.x_max))
+        self.speed_x[side] = -self.speed_x[side]
+        self.facing_right[side] = ~self.facing_right[side]
+
+        bottom = bounded & (self.y >= self.y_max)
+        self.y[bottom] = self.y_max
+        self.speed_y[bottom] = -np.abs(self.speed_y[bottom])
+
+        top = bounded & (self.y <= self.y_min)
+        self.speed_y[top] = np.abs(self.speed_y[top])
+
+    def step(self, now: int) -> None:
+        """
+        Advance the whole flock by one simulation step.
+        """
+        self.handle_respawn(now)
+        self.move(now)
+
+    def shoot(self, indices: np.ndarray, now: int) -> np.ndarray:
+        """
+        Mark the given ducks as shot and return the indices that were actually hit
+        (alive and not already shot).
+        """
+        indices = np.unique(np.asarray(indices, dtype=np.intp))
+        hit = indices[self.alive[indices] & ~self.is_shot[indices]]
+        self.is_shot[hit] = True
+        self.shot_time[hit] = now
+        return hit
+
+    def make_ducks_fly_off(self, mask: np.ndarray) -> None:
+        """
+        Make the selected ducks fly off the screen.
+        """
+        self.flying_off_screen[mask] = True
+        self.speed_y[mask] = -np.abs(self.speed_y[mask])
+
+    def random_x(self, count: int) -> np.ndarray:
+        """
+        Return random spawn positions on the grass level.
+        """
+        return self.rng.integers(self.x_min, self.x_max, count, endpoint=True).astype(np.float64)
+
+    def positions(self) -> np.ndarray:
+        """
+        Return the (count, 2) array of top-left duck positions.
+        """
+        return np.column_stack((self.x, self.y))
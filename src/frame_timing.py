@@ -0,0 +1,170 @@
+"""
+This module provides the FrameProfiler class, which times the phases of every
+frame of the game loop (events, update, render, present and the sleep in
+clock.tick). It keeps a rolling window of recent frames for p50/p95/p99 values,
+draws them as an on-screen overlay and can export the frames and the scenes
+(menu, gameplay, game over) as Chrome trace-event JSON for chrome://tracing or
+Perfetto.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+import pygame
+from src.text_cache import get_text_cache
+
+PHASES = ["events", "update", "render", "present", "sleep"]
+WINDOW = 600                # Frames kept for the percentiles (10 s at 60 FPS)
+OVERLAY_REFRESH = 30        # Frames between recomputing the overlay text
+FRAME_BUDGET_MS = 1000 / 60
+MAX_TRACE_EVENTS = 500_000  # Oldest trace events are dropped beyond this
+OVERLAY_POSITION = (10, 10)
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """
+    Return the value at the given fraction (0.0 to 1.0) of a sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+class FrameProfiler:
+    """
+    This class measures where the time of each frame goes. It is responsible for:
+      - Timing the phases of a frame and the whole frame in milliseconds.
+      - Keeping the last WINDOW frames of every phase for p50/p95/p99 values.
+      - Drawing the values as a toggleable overlay.
+      - Recording phases and scenes as Chrome trace events when tracing is on.
+    """
+    def __init__(self, window: int = WINDOW, trace: bool = False,
+                 timer: Callable[[], float] = time.perf_counter) -> None:
+        """
+        Initialize the profiler. With trace every phase and scene is also kept as a
+        trace event until it is exported. The timer returns seconds.
+        """
+        self.timer = timer
+        self.samples: dict[str, deque[float]] = {
+            name: deque(maxlen=window) for name in PHASES + ["frame"]
+        }
+        self.current: dict[str, float] = {}
+        self.frame_start = self.timer()
+        self.frames = 0
+        self.overlay_visible = False
+        self.overlay_lines: list[str] = []
+        self.trace = trace
+        self.trace_events: deque[dict[str, Any]] = deque(maxlen=MAX_TRACE_EVENTS)
+        self.epoch = self.timer()
+
+    def add_trace_event(self, name: str, category: str, begin: float, end: float) -> None:
+        """
+        Record a complete ("X") trace event that ran from begin to end.
+        """
+        self.trace_events.append({
+            "name": name, "cat": category, "ph": "X",
+            "ts": (begin - self.epoch) * 1_000_000, "dur": (end - begin) * 1_000_000,
+            "pid": os.getpid(), "tid": threading.get_ident(),
+        })
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Time one phase of the current frame. A phase entered twice in a frame adds up.
+        """
+        begin = self.timer()
+        try:
+            yield
+        finally:
+            end = self.timer()
+            self.current[name] = self.current.get(name, 0.0) + (end - begin) * 1000
+            if self.trace:
+                self.add_trace_event(name, "frame", begin, end)
+
+    @contextmanager
+    def scene(self, name: str) -> Iterator[None]:
+        """
+        Record a scene (e.g. the menu) as a trace event spanning its frames.
+        """
+        begin = self.timer()
+        try:
+            yield
+        finally:
+            if self.trace:
+                self.add_trace_event(name, "scene", begin, self.timer())
+
+    def end_frame(self) -> None:
+        """
+        Close the current frame and store the time of each of its phases.
+        """
+        now = self.timer()
+        for name in PHASES:
+            self.samples[name].append(self.current.get(name, 0.0))
+        self.samples["frame"].append((now - self.frame_start) * 1000)
+        if self.trace:
+            self.add_trace_event("frame", "frame", self.frame_start, now)
+        self.current = {}
+        self.frame_start = now
+        self.frames += 1
+        if self.overlay_visible and self.frames % OVERLAY_REFRESH == 0:
+            self.overlay_lines = self.summary_lines()
+
+    def reset_frame(self) -> None:
+        """
+        Start a new frame now, e.g. when the loop resumes after another scene.
+        """
+        self.current = {}
+        self.frame_start = self.timer()
+
+    def percentiles(self, name: str) -> tuple[float, float, float]:
+        """
+        Return the p50, p95 and p99 times of a phase (or "frame") in milliseconds.
+        """
+        values = sorted(self.samples[name])
+        return percentile(values, 0.5), percentile(values, 0.95), percentile(values, 0.99)
+
+    def summary_lines(self) -> list[str]:
+        """
+        Return one line per phase with its percentiles, the whole frame first.
+        """
+        lines = []
+        for name in ["frame"] + PHASES:
+            p50, p95, p99 = self.percentiles(name)
+            over = " !" if name == "frame" and p95 > FRAME_BUDGET_MS else ""
+            lines.append(f"{name:<8} p50 {p50:5.1f}  p95 {p95:5.1f}  p99 {p99:5.1f} ms{over}")
+        return lines
+
+    def toggle_overlay(self) -> None:
+        """
+        Show or hide the overlay.
+        """
+        self.overlay_visible = not self.overlay_visible
+        self.overlay_lines = self.summary_lines()
+
+    def overlay_items(self, font: pygame.font.Font) -> list[tuple[str, pygame.Surface,
+                                                                  tuple[int, int]]]:
+        """
+        Return the (name, surface, position) of every line of the overlay.
+        """
+        text_cache = get_text_cache()
+        x, y = OVERLAY_POSITION
+        items = []
+        for index, line in enumerate(self.overlay_lines):
+            surface = text_cache.render(font, line, "yellow")
+            items.append((f"overlay{index}", surface, (x, y)))
+            y += surface.get_height()
+        return items
+
+    def save_trace(self, path: str) -> None:
+        """
+        Write the recorded trace events as Chrome trace-event JSON.
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"traceEvents": list(self.trace_events),
+                       "displayTimeUnit": "ms"}, file)
+        print(f"Trace with {len(self.trace_events)} events saved to {path}")
@@ -1,12 +1,17 @@
 """
 This module provides the GameOver class, which is responsible for displaying the game over
 screen in the DuckHunt game. It renders the final score, shows a "Back to Menu" button,
-and prompts the player to enter their name. In addition, it includes methods to load and save
-game results, keeping only the top 10 scores.
+and prompts the player to enter their name. In addition, it saves the result of the game
+in the score store (see src.scores).
 """
 import pygame
-from pygame.constants import QUIT, KEYDOWN, K_RETURN, K_BACKSPACE
+from pygame.constants import KEYDOWN, K_RETURN, K_BACKSPACE, WINDOWEXPOSED, VIDEOEXPOSE
+from src import display
 from src.button import Button
+from src.text_cache import get_text_cache, get_font
+from src.idle import wait_for_events, hover_state
+from src.leaderboard import get_leaderboard
+from src.scores import get_score_store
 
 class GameOver:
     """
@@ -15,9 +20,7 @@ class GameOver:
       - Rendering the game over screen with a final score.
       - Displaying a "Back to Menu" button.
       - Prompting the player to enter their name.
-      - Loading existing high scores from a file.
-      - Saving a new high score (if a valid name is provided) 
-        while retaining only the top 10 scores.
+      - Saving a new high score (if a valid name is provided) in the score store.
     """
     def __init__(self, screen: pygame.Surface, clock: pygame.time.Clock) -> None:
         """
@@ -25,8 +28,8 @@ class GameOver:
         """
         self.screen = screen
         self.clock = clock
-        self.font_large = pygame.font.SysFont("Arial", 48)
-        self.font_small = pygame.font.SysFont("Arial", 30)
+        self.font_large = get_font("Arial", 48)
+        self.font_small = get_font("Arial", 30)
 
     def display(self, final_score: int) -> str:
         """
@@ -44,32 +47,40 @@ class GameOver:
             self.font_small, pygame.Color("steelblue"), pygame.Color("dodgerblue")
         )
         pygame.mouse.set_visible(True)
+        text_cache = get_text_cache()
+
+        # Composite the static part of the screen once
+        game_over_layer = pygame.Surface(self.screen.get_size())
+        game_over_layer.fill(pygame.Color("black"))
+        # Display game over and final score.
+        game_over_text = text_cache.render(self.font_large, "GAME OVER", "red")
+        score_text = text_cache.render(self.font_small, f"Your Score: {final_score}", "white")
+        game_over_layer.blit(
+            game_over_text, game_over_text.get_rect(center=(self.screen.get_width() // 2, 150))
+        )
+        game_over_layer.blit(
+            score_text, score_text.get_rect(center=(self.screen.get_width() // 2, 220))
+        )
 
         running = True
+        redraw = True
+        hover: tuple[bool, ...] = ()
         while running:
-            self.screen.fill(pygame.Color("black"))
-            # Display game over and final score.
-            game_over_text = self.font_large.render(
-                "GAME OVER", True, pygame.Color("red")
-            )
-            score_text = self.font_small.render(
-                f"Your Score: {final_score}", True, pygame.Color("white")
-            )
-            self.screen.blit(
-                game_over_text, game_over_text.get_rect(center=(self.screen.get_width() // 2, 150))
-            )
-            self.screen.blit(
-                score_text, score_text.get_rect(center=(self.screen.get_width() // 2, 220))
-            )
             mouse_pos = pygame.mouse.get_pos()
-            for event in pygame.event.get():
-                if event.type == QUIT:
+            current_hover = hover_state([back_to_menu_button], mouse_pos)
+            if redraw or current_hover != hover:
+                hover = current_hover
+                self.screen.blit(game_over_layer, (0, 0))
+                back_to_menu_button.draw(self.screen, mouse_pos)
+                display.flip()
+                redraw = False
+            for event in wait_for_events():
+                if event.type in display.QUIT_EVENTS:
                     running = False
                 if back_to_menu_button.is_clicked(event):
                     running = False
-            back_to_menu_button.draw(self.screen, mouse_pos)
-            pygame.display.flip()
-            self.clock.tick(60)
+                if event.type in (WINDOWEXPOSED, VIDEOEXPOSE):
+                    redraw = True
         player_name = self.prompt_for_name()
         return player_name
 
@@ -84,52 +95,45 @@ class GameOver:
         input_box_color = pygame.Color("steelblue")
         input_text_color = pygame.Color("white")
         background_color = pygame.Color("black")
+        text_cache = get_text_cache()
 
+        redraw = True
         while input_active:
-            self.screen.fill(background_color)
-            prompt_text = font.render("Enter Your Name:", True, input_text_color)
-            prompt_rect = prompt_text.get_rect(center=(self.screen.get_width() // 2, 150))
-            self.screen.blit(prompt_text, prompt_rect)
-            input_box_rect = pygame.Rect(self.screen.get_width() // 2 - 150, 200, 300, 50)
-            pygame.draw.rect(self.screen, input_box_color, input_box_rect)
-            name_text = font.render(player_name, True, input_text_color)
-            self.screen.blit(name_text, (input_box_rect.x + 10, input_box_rect.y + 10))
-            for event in pygame.event.get():
-                if event.type == QUIT:
+            if redraw:
+                self.screen.fill(background_color)
+                prompt_text = text_cache.render(font, "Enter Your Name:", input_text_color)
+                prompt_rect = prompt_text.get_rect(center=(self.screen.get_width() // 2, 150))
+                self.screen.blit(prompt_text, prompt_rect)
+                input_box_rect = pygame.Rect(self.screen.get_width() // 2 - 150, 200, 300, 50)
+                pygame.draw.rect(self.screen, input_box_color, input_box_rect)
+                name_text = text_cache.render(font, player_name, input_text_color)
+                self.screen.blit(name_text, (input_box_rect.x + 10, input_box_rect.y + 10))
+                display.flip()
+                redraw = False
+            # Only typing changes this screen
+            for event in wait_for_events():
+                if event.type in display.QUIT_EVENTS:
                     input_active = False
                 elif event.type == KEYDOWN:
+                    redraw = True
                     if event.key == K_RETURN:
                         input_active = False
                     elif event.key == K_BACKSPACE:
                         player_name = player_name[:-1]
                     else:
                         player_name += event.unicode
-            pygame.display.flip()
-            self.clock.tick(60)
+                elif event.type in (WINDOWEXPOSED, VIDEOEXPOSE):
+                    redraw = True
         pygame.mouse.set_visible(True)
         return player_name
 
-    def load_results(self, filename: str) -> list[tuple[str, int]]:
-        """
-        Load existing results from the given file.
-        """
-        results = []
-        with open(filename, "r", encoding="utf-8") as file:
-            for line in file:
-                parts = line.strip().split(",")
-                if len(parts) == 2:
-                    name, score = parts
-                    results.append((name, int(score)))
-        return results
-
-    def save_new_score(self, filename: str, score: int, player_name: str) -> None:
+    def save_new_score(self, mode: str, score: int, player_name: str) -> int:
         """
-        Save the new score along with the player's name to the given file,
-        keeping only the top 10 scores.
+        Save the new score along with the player's name in the score store and
+        return its rank within the mode. With a leaderboard the score is also queued
+        for it, without waiting for the server.
         """
-        results = self.load_results(filename)
-        results.append((player_name, score))
-        results = sorted(results, key=lambda x: x[1], reverse=True)[:10]
-        with open(filename, "w", encoding="utf-8") as file:
-            for name, s in results:
-                file.write(f"{name},{s}\n")
+        leaderboard = get_leaderboard()
+        if leaderboard is not None:
+            leaderboard.submit(mode, player_name, score)
+        return get_score_store().add(mode, player_name, score)
@@ -2,6 +2,7 @@
 This module provides the UI class for rendering the user interface elements.
 """
 import pygame
+from src.text_cache import get_text_cache
 
 class UI:
     """
@@ -16,22 +17,43 @@ class UI:
         self.screen = screen
         self.font = font
 
+    def standard_ui_fields(self, score: int, lives: int,
+                           shots_remaining: int) -> list[tuple[str, str, tuple[int, int]]]:
+        """
+        Return the (name, text, position) of every field of the standard UI.
+        """
+        return [
+            ("score", f"Score: {score}", (500, 490)),
+            ("lives", f"Lives: {lives}", (240, 490)),
+            ("shots", f"Shots: {shots_remaining}", (50, 490)),
+        ]
+
+    def time_ui_fields(self, score: int,
+                       remaining_time: int) -> list[tuple[str, str, tuple[int, int]]]:
+        """
+        Return the (name, text, position) of every field of the time-based UI.
+        """
+        return [
+            ("score", f"Score: {score}", (50, 490)),
+            ("time", f"Time: {remaining_time}", (500, 490)),
+        ]
+
+    def render_text(self, text: str) -> pygame.Surface:
+        """
+        Render the text of a UI field.
+        """
+        return get_text_cache().render(self.font, text, "white")
+
     def draw_standard_ui(self, score: int, lives: int, shots_remaining: int) -> None:
         """
         Draw the standard UI elements: score, lives, and shots remaining.
         """
-        score_text = self.font.render(f"Score: {score}", True, pygame.Color("white"))
-        lives_text = self.font.render(f"Lives: {lives}", True, pygame.Color("white"))
-        shots_text = self.font.render(f"Shots: {shots_remaining}", True, pygame.Color("white"))
-        self.screen.blit(score_text, (500, 490))
-        self.screen.blit(lives_text, (240, 490))
-        self.screen.blit(shots_text, (50, 490))
+        for _, text, position in self.standard_ui_fields(score, lives, shots_remaining):
+            self.screen.blit(self.render_text(text), position)
 
     def draw_time_ui(self, score: int, remaining_time: int) -> None:
         """
         Draw the time-based UI elements: score and remaining time.
         """
-        score_text = self.font.render(f"Score: {score}", True, pygame.Color("white"))
-        time_text = self.font.render(f"Time: {remaining_time}", True, pygame.Color("white"))
-        self.screen.blit(score_text, (50, 490))
-        self.screen.blit(time_text, (500, 490))
+        for _, text, position in self.time_ui_fields(score, remaining_time):
+            self.screen.blit(self.render_text(text), position)
@@ -1,153 +1,235 @@
 """
-This module implements the main game logic.
+This module implements the main game: it runs the game rules from src.core
+with rendering, sound, input and the menu and game-over screens.
 """
+import atexit
+import os
 import random
+import time
+from collections.abc import Sequence
+from itertools import groupby
+from operator import itemgetter
 import pygame
+from src.audio import LatencyMonitor
+from src.capture import PROFILE_KEY, get_profile_capture
+from src.core import GameSession, ManualClock
+from src import display
+from src.dirty_rects import DirtyRectRenderer
+from src.duck import Duck
+from src.frame_timing import FrameProfiler
+from src.hit_index import HitIndex
 from src.setup import Setup
 from src.menu import Menu
 from src.game_over import GameOver
 from src.game_ui import UI
+from src.replay import Replay, REPLAY_DIR, quantize_alpha
+from src.telemetry import DUCK_TYPE_CODES, MODES, NO_DUCK, ShotRecorder, session_path
+from src.text_cache import get_font
 
-class Gameplay:
+SIMULATION_RATE = 60        # Simulation steps per second
+STEP_MS = 1000 / SIMULATION_RATE
+MAX_STEPS_PER_FRAME = 5     # Cap on catch-up steps after a long frame
+DIRTY_RECTS_KEY = pygame.K_F2  # Switches between dirty-rect and full-frame rendering
+OVERLAY_KEY = pygame.K_F3      # Shows or hides the frame timing overlay
+
+class Gameplay(GameSession[Duck]):
     """
     This class is responsible for initializing the game environment,
     managing game states, processing user input, updating game objects
-    (such as ducks), and rendering the game UI. It supports both standard
-    and time-based game modes.
+    (such as ducks), and rendering the game UI. The rules themselves live in
+    GameSession. It supports both standard and time-based game modes.
     """
-    def __init__(self, mode: str = "standard") -> None:
+    def __init__(self, mode: str = "standard", fixed_timestep: bool = True,
+                 render_fps: int = 60, record_replays: bool = True,
+                 dirty_rects: bool = False, measure_latency: bool = False,
+                 trace_path: str | None = None, backend: str = "software",
+                 telemetry_dir: str | None = None, setup: Setup | None = None,
+                 profiler: FrameProfiler | None = None) -> None:
         """
-        Initialize the game, load assets, and create objects.
+        Initialize the game, load assets, and create objects. An existing setup, e.g.
+        the one the title screen was shown with, is reused instead of a new window,
+        and an existing profiler keeps timing the scenes it already recorded.
+        With fixed_timestep the simulation advances SIMULATION_RATE times per second
+        regardless of render_fps (0 renders as fast as possible), and every game is
+        recorded as a replay if record_replays is set. With dirty_rects only the
+        changed parts of the screen are redrawn and pushed to the display. With
+        measure_latency the time from every click to its sound is logged. With
+        trace_path the frames and scenes are written there as a Chrome trace on exit
+        (a given profiler is saved by its owner instead).
+        The backend ("software" or "gpu") decides how frames are drawn, see src.display;
+        dirty rects only apply to the software backend. With telemetry_dir every
+        shot is streamed to a new file there, see src.telemetry.
         """
-        self.mode = mode
-        self.setup = Setup()
+        # Game time only advances with the simulation, so replays are exact
+        self.sim_clock = ManualClock(pygame.time.get_ticks())
+        rng = random.Random()
+        self.setup = setup if setup is not None else Setup(backend)
+        self.setup.load_game(self.sim_clock, rng)
+        super().__init__(self.setup.get_ducks(), mode, self.sim_clock, rng)
+        self.fixed_timestep = fixed_timestep
+        self.render_fps = render_fps
+        self.record_replays = record_replays
+        self.replay: Replay | None = None
+        self.replaying = False
         self.screen = self.setup.get_screen()
         self.background = self.setup.get_background()
         self.music_manager = self.setup.get_music_manager()
-        self.ducks = self.setup.get_ducks()
-        self.current_duck = self.ducks[0]
-        self.new_duck_timer_start: int | None = None
-        self.duck_switch_delay = 2.0
-        self.duck_hits = 0
+        self.latency_monitor = LatencyMonitor() if measure_latency else None
+        self.music_manager.latency_monitor = self.latency_monitor
 
         self.font = self.setup.get_font()
-        self.score = 0
         self.clock = pygame.time.Clock()
-        self.running = True
-        self.game_over_flag = False
-
-        self.total_time: int | None = None
-        self.lives = 3 if mode == "standard" else None
-        self.shots_remaining = 3 if mode == "standard" else None
-        self.start_time: int | None = None
 
         self.smaller_scope = self.setup.get_scope()
         self.ui_manager = UI(self.screen, self.font)
+        self.hit_index = HitIndex()
+        # Shots are resolved against the frame on screen, drawn at this alpha
+        self.shot_alpha = 1.0
+        self.textures = display.get_texture_renderer()
+        self.dirty_rects = dirty_rects and self.textures is None
+        self.renderer = DirtyRectRenderer(self.screen)
+        if profiler is None:
+            profiler = FrameProfiler(trace=trace_path is not None)
+            if trace_path is not None:
+                atexit.register(profiler.save_trace, trace_path)
+        self.profiler = profiler
+        self.capture = get_profile_capture()
+        self.telemetry: ShotRecorder | None = None
+        if telemetry_dir is not None:
+            self.telemetry = ShotRecorder(session_path(telemetry_dir))
+            atexit.register(self.telemetry.close)
 
-    def switch_duck_with_delay(self) -> None:
+    def process_hit(self, play_combo_sound: bool = False, duck: Duck | None = None) -> None:
         """
-        Switch to a new duck after the specified delay.
+        Handle a successful hit on the given duck (the current duck by default).
         """
-        if self.new_duck_timer_start is None:
-            # Start the timer when switching is triggered
-            self.new_duck_timer_start = pygame.time.get_ticks()
+        if duck is None:
+            duck = self.current_duck
+        self.music_manager.play_sound(self.music_manager.gunshot_sound)
+        milestone = self.score_hit(duck)
+        if milestone and play_combo_sound:
+            self.music_manager.play_sound(self.music_manager.combo_sound)
 
-        elapsed_time = (pygame.time.get_ticks() - self.new_duck_timer_start) / 1000
-        if elapsed_time >= self.duck_switch_delay:
-            # Delay has passed, switch to a new duck and reset the timer
-            self.new_duck_timer_start = None
-            self.current_duck = random.choice(self.ducks)
-            self.current_duck.respawn(mode=self.mode)
+        # Set the appropriate shot image depending on duck direction.
+        if not duck.facing_right:
+            duck.image = duck.shot_image_flipped
+        else:
+            duck.image = duck.shot_image
 
-    def award_milestone_bonus(self) -> None:
+    def find_targets(self, positions: Sequence[tuple[int, int]]) -> list[Duck | None]:
         """
-        Award bonus points for reaching a milestone.
+        Return the topmost target under each shot position, using the hit index
+        and the collision masks of the ducks. The ducks are tested where the frame
+        on screen drew them, which can be up to a step behind their rects.
         """
-        milestone_bonus = 100 + (self.duck_hits // 5) * 5
-        self.score += milestone_bonus
+        self.hit_index.rebuild(
+            (target, pygame.Rect(target.draw_position(self.shot_alpha), target.rect.size),
+             target.get_mask())
+            for target in self.get_targets()
+        )
+        return self.hit_index.query_many(positions)
 
-    def process_hit(self, play_combo_sound: bool = False) -> None:
+    def record_shot(self, position: tuple[int, int], target: Duck | None) -> None:
         """
-        Handle a successful duck hit.
+        Stream the shot to the telemetry file, with the duck it hit or, for a
+        miss, the duck on screen (NO_DUCK and -1 coordinates while there is none).
+        Replayed shots are not recorded again.
         """
-        self.music_manager.play_sound(self.music_manager.gunshot_sound)
-        points = {"special": 100, "normal": 50, "red": -25}
-        self.score += points.get(self.current_duck.duck_type, 0)
-        self.score = max(self.score, 0)
-
-        self.duck_hits += 1
-        if self.duck_hits % 5 == 0:
-            if play_combo_sound:
-                self.music_manager.play_sound(self.music_manager.combo_sound)
-            self.award_milestone_bonus()
-
-        # Set the appropriate shot image depending on duck direction.
-        if not self.current_duck.facing_right:
-            self.current_duck.image = pygame.transform.flip(
-                self.current_duck.shot_image, True, False
+        if self.telemetry is None or self.replaying:
+            return
+        duck = target if target is not None else self.current_duck
+        standard = self.mode == "standard"
+        if duck.alive:
+            duck_state: tuple[int, int, int, float, float, int] = (
+                DUCK_TYPE_CODES.get(duck.duck_type, 0), duck.rect.centerx, duck.rect.centery,
+                duck.speed_x, duck.speed_y, max(0, self.get_ticks() - duck.appear_time),
             )
         else:
-            self.current_duck.image = self.current_duck.shot_image
+            duck_state = (NO_DUCK, -1, -1, 0.0, 0.0, 0)
+        self.telemetry.record((
+            time.time(), position[0], position[1], target is not None, *duck_state,
+            MODES.index(self.mode),
+            self.lives if standard and self.lives is not None else -1,
+            self.shots_remaining if standard and self.shots_remaining is not None else -1,
+            -1 if standard else self.remaining_time(),
+        ))
 
-        self.current_duck.is_shot = True
-        self.current_duck.shot_time = pygame.time.get_ticks()
+    def reset_game(self, seed: int | None = None) -> None:
+        """
+        Reset the game state to start a new game and start recording its replay.
+        """
+        if seed is None:
+            seed = int.from_bytes(os.urandom(8), "little")
+        self.sim_clock.rebase()
+        super().reset_game(seed)
+        self.replay = None
+        if self.record_replays and self.fixed_timestep and not self.replaying:
+            self.replay = Replay(seed, self.mode, self.setup.current_background_index,
+                                 SIMULATION_RATE)
 
-    def check_shooting(self, mouse_pos: tuple) -> None:
+    def step(self) -> None:
         """
-        Check if the duck was shot and update game state accordingly.
+        Advance the simulation by one fixed step.
         """
-        hit = self.current_duck.alive and self.current_duck.rect.collidepoint(mouse_pos)
+        self.update()
+        self.sim_clock.advance(STEP_MS)
 
-        if hit:
-            if self.mode == "standard":
-                self.process_hit(play_combo_sound=True)
-                self.shots_remaining = 3
-            else:
-                self.process_hit()
-        elif self.mode == "standard":
-            assert self.shots_remaining is not None
-            self.shots_remaining -= 1
-            if self.shots_remaining == 0:
-                assert self.lives is not None
-                self.lives -= 1
-                if self.lives > 0:
-                    self.current_duck.make_duck_fly_off()
-                    self.shots_remaining = 3
-                else:
-                    self.running = False
-
-    def reset_game(self) -> None:
-        """
-        Reset the game state to start a new game.
-        """
-        self.score = 0
-        self.current_duck = random.choice(self.ducks)
-        self.current_duck.respawn(mode=self.mode)
-        self.running = True
-        self.game_over_flag = False
-        self.current_duck.speed_x = 3
-        self.current_duck.speed_y = -3
-        self.duck_hits = 0
+    def save_replay(self) -> None:
+        """
+        Finish the replay of the current game and write it to REPLAY_DIR.
+        """
+        if self.replay is None:
+            return
+        self.replay.finish(self.score, self.step_count)
+        try:
+            path = self.replay.save(REPLAY_DIR)
+            print(f"Replay saved to {path}")
+        except OSError as error:
+            print(f"Replay could not be saved: {error}")
+        self.replay = None
 
-        if self.mode == "standard":
-            self.lives = 3
-            self.shots_remaining = 3
-        else:
-            self.start_time = pygame.time.get_ticks()
+    def play_replay(self, replay: Replay, fast_forward: bool = True) -> int:
+        """
+        Play a recorded game again and return the score it reached. With
+        fast_forward the steps run back to back without rendering or waiting.
+        """
+        self.replaying = True
+        self.mode = replay.mode
+        self.background = self.setup.set_background(replay.background_index)
+        self.reset_game(replay.seed)
+        shots = replay.shots_by_step()
+        try:
+            while self.running and self.step_count <= replay.steps:
+                # Shots fired at one frame share its alpha
+                for alpha, volley in groupby(shots.get(self.step_count, []), itemgetter(1)):
+                    self.shot_alpha = alpha
+                    self.resolve_shots([position for position, _ in volley])
+                self.step()
+                if not fast_forward:
+                    for event in pygame.event.get(display.QUIT_EVENTS):
+                        self.running = False
+                    self.render()
+                    self.clock.tick(SIMULATION_RATE)
+        finally:
+            self.replaying = False
+        return self.score
 
     def handle_game_over(self) -> None:
         """
         Execute the game-over sequence.
         """
+        if self.replaying:
+            self.running = False
+            return
+        self.save_replay()
         self.music_manager.play_sound(self.music_manager.game_over_sound)
         game_over = GameOver(self.screen, self.clock)
-        player_name = game_over.display(self.score)
+        with self.profiler.scene("game_over"):
+            player_name = game_over.display(self.score)
         print(f"Returned from game over; player name: {player_name}")
         if player_name.strip() != "":
-            if self.mode == "standard":
-                game_over.save_new_score("standard_results.txt", self.score, player_name)
-            else:
-                game_over.save_new_score("time_results.txt", self.score, player_name)
+            rank = game_over.save_new_score(self.mode, self.score, player_name)
+            print(f"Score saved, rank {rank} in {self.mode} mode")
         else:
             print("No valid name entered! Score wasn't saved.")
         pygame.time.delay(500)
@@ -159,38 +241,55 @@ class Gameplay:
         """
         Process user input.
         """
+        shots = []
         for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+            if event.type in display.QUIT_EVENTS:
                 self.running = False
             elif event.type == pygame.MOUSEBUTTONDOWN:
-                self.check_shooting(event.pos)
+                if self.latency_monitor is not None:
+                    self.latency_monitor.click()
+                shots.append(event.pos)
+                if self.replay is not None:
+                    self.replay.add_shot(self.step_count, event.pos, self.shot_alpha)
+            elif event.type == pygame.KEYDOWN and event.key == DIRTY_RECTS_KEY:
+                self.set_dirty_rects(not self.dirty_rects)
+            elif event.type == pygame.KEYDOWN and event.key == OVERLAY_KEY:
+                self.profiler.toggle_overlay()
+            elif event.type == pygame.KEYDOWN and event.key == PROFILE_KEY:
+                self.capture.toggle()
+        if shots:
+            self.resolve_shots(shots)
+            # Hits queue their sound while resolving; a click still pending missed
+            if self.latency_monitor is not None:
+                self.latency_monitor.cancel()
 
-    def update(self) -> None:
+    def set_dirty_rects(self, enabled: bool) -> None:
         """
-        Update game logic for duck status and game over conditions.
+        Switch between dirty-rect and full-frame rendering. The gpu backend always
+        draws full frames.
         """
-        if not self.current_duck.alive:
-            self.switch_duck_with_delay()
-
-        if self.mode == "standard":
-            if self.lives == 0 and not self.game_over_flag:
-                self.game_over_flag = True
-                self.handle_game_over()
-        else:
-            assert self.start_time is not None
-            elapsed_time = (pygame.time.get_ticks() - self.start_time) / 1000
-            if self.total_time and elapsed_time >= self.total_time and not self.game_over_flag:
-                self.game_over_flag = True
-                self.handle_game_over()
+        self.dirty_rects = enabled and self.textures is None
+        self.renderer.invalidate()
 
-        self.current_duck.handle_respawn()
-        if self.current_duck.alive:
-            self.current_duck.move()
+    def render(self, alpha: float = 1.0) -> None:
+        """
+        Render all game elements and present the frame. The duck is drawn
+        interpolated between the last two simulation steps by alpha.
+        """
+        self.draw(alpha)
+        self.present()
 
-    def render(self) -> None:
+    def draw(self, alpha: float = 1.0) -> None:
         """
-        Render all game elements.
+        Draw all game elements without presenting them.
         """
+        self.shot_alpha = quantize_alpha(alpha)
+        if self.textures is not None:
+            self.draw_textures(alpha)
+            return
+        if self.dirty_rects:
+            self.draw_dirty(alpha)
+            return
         self.screen.blit(self.background, (0, 0))
 
         # Drawing of UI elements
@@ -199,19 +298,92 @@ class Gameplay:
             assert self.shots_remaining is not None
             self.ui_manager.draw_standard_ui(self.score, self.lives, self.shots_remaining)
         else:
-            assert self.start_time is not None
-            assert self.total_time is not None
-            elapsed_time = (pygame.time.get_ticks() - self.start_time) / 1000
-            remaining_time = max(int(self.total_time - elapsed_time), 0)
-            self.ui_manager.draw_time_ui(self.score, remaining_time)
+            self.ui_manager.draw_time_ui(self.score, self.remaining_time())
 
         if self.current_duck.alive:
-            self.current_duck.draw(self.screen)
+            self.current_duck.draw(self.screen, alpha)
 
         mouse_x, mouse_y = pygame.mouse.get_pos()
         scope_rect = self.smaller_scope.get_rect(center=(mouse_x, mouse_y))
         self.screen.blit(self.smaller_scope, scope_rect)
-        pygame.display.flip()
+
+        if self.profiler.overlay_visible:
+            for _, surface, position in self.profiler.overlay_items(self.overlay_font()):
+                self.screen.blit(surface, position)
+
+    def draw_dirty(self, alpha: float = 1.0) -> None:
+        """
+        Queue the same frame as draw() on the dirty-rect renderer, which redraws
+        only the regions of the screen that changed since the last frame.
+        """
+        if self.mode == "standard":
+            assert self.lives is not None
+            assert self.shots_remaining is not None
+            fields = self.ui_manager.standard_ui_fields(self.score, self.lives,
+                                                        self.shots_remaining)
+        else:
+            fields = self.ui_manager.time_ui_fields(self.score, self.remaining_time())
+        for name, text, position in fields:
+            self.renderer.blit(name, self.ui_manager.render_text(text), position, key=text)
+
+        if self.current_duck.alive:
+            self.renderer.blit("duck", self.current_duck.image,
+                               self.current_duck.draw_position(alpha))
+
+        mouse_x, mouse_y = pygame.mouse.get_pos()
+        scope_rect = self.smaller_scope.get_rect(center=(mouse_x, mouse_y))
+        self.renderer.blit("scope", self.smaller_scope, scope_rect.topleft)
+
+        if self.profiler.overlay_visible:
+            for name, surface, position in self.profiler.overlay_items(self.overlay_font()):
+                self.renderer.blit(name, surface, position)
+
+    def draw_textures(self, alpha: float = 1.0) -> None:
+        """
+        Draw the same frame as draw() with the texture renderer. Every image and
+        HUD string is uploaded once and drawn from its texture afterwards.
+        """
+        textures = self.textures
+        assert textures is not None
+        textures.clear()
+        textures.copy(self.background, (0, 0))
+        if self.mode == "standard":
+            assert self.lives is not None
+            assert self.shots_remaining is not None
+            fields = self.ui_manager.standard_ui_fields(self.score, self.lives,
+                                                        self.shots_remaining)
+        else:
+            fields = self.ui_manager.time_ui_fields(self.score, self.remaining_time())
+        for _, text, position in fields:
+            textures.copy(self.ui_manager.render_text(text), position)
+
+        if self.current_duck.alive:
+            textures.copy(self.current_duck.image, self.current_duck.draw_position(alpha))
+
+        mouse_x, mouse_y = pygame.mouse.get_pos()
+        scope_rect = self.smaller_scope.get_rect(center=(mouse_x, mouse_y))
+        textures.copy(self.smaller_scope, scope_rect.topleft)
+
+        if self.profiler.overlay_visible:
+            for _, surface, position in self.profiler.overlay_items(self.overlay_font()):
+                textures.copy(surface, position)
+
+    def overlay_font(self) -> pygame.font.Font:
+        """
+        Return the small font of the frame timing overlay.
+        """
+        return get_font("Courier New", 16)
+
+    def present(self) -> None:
+        """
+        Push the drawn frame to the display.
+        """
+        if self.textures is not None:
+            self.textures.present()
+        elif self.dirty_rects:
+            self.renderer.present(self.background)
+        else:
+            display.flip()
 
     def run(self) -> None:
         """
@@ -219,26 +391,104 @@ class Gameplay:
         """
         pygame.mouse.set_visible(False)
         self.reset_game()
+        # The menu and game-over screens drew over the display
+        self.renderer.invalidate()
+
+        self.profiler.reset_frame()
+        with self.profiler.scene("gameplay"):
+            if self.fixed_timestep:
+                self.run_fixed_timestep()
+            else:
+                self.run_variable_timestep()
+
+        if self.dirty_rects and self.renderer.frames:
+            saved = self.renderer.pixels_saved_per_frame()
+            full = self.screen.get_width() * self.screen.get_height()
+            print(f"Dirty rects saved {saved:.0f} of {full} pixels per frame "
+                  f"({saved / full:.0%}) over {self.renderer.frames} frames")
+        if self.profiler.frames:
+            print("Frame timing:\n  " + "\n  ".join(self.profiler.summary_lines()))
+        print(self.music_manager.channels.report())
+        if self.latency_monitor is not None:
+            print(self.latency_monitor.summary())
 
-        if self.mode == "time":
-            self.start_time = pygame.time.get_ticks()
-            self.total_time = 60
+    def run_variable_timestep(self) -> None:
+        """
+        Game loop that advances the simulation once per rendered frame.
+        """
+        profiler = self.profiler
+        capture = self.capture
+        while self.running:
+            with profiler.phase("events"):
+                self.process_events()
+            with profiler.phase("update"):
+                self.update()
+            if not self.running:
+                break
+            with profiler.phase("render"):
+                self.draw()
+            with profiler.phase("present"):
+                self.present()
+            with profiler.phase("sleep"):
+                frame_ms = self.clock.tick(60)
+            self.sim_clock.advance(frame_ms)
+            profiler.end_frame()
+            if capture.active:
+                capture.end_frame()
+
+    def run_fixed_timestep(self) -> None:
+        """
+        Game loop that advances the simulation in fixed steps and renders
+        at its own rate, interpolating between the last two steps.
+        """
+        profiler = self.profiler
+        capture = self.capture
+        step_ms = STEP_MS
+        accumulator = 0.0
+        previous_time = time.perf_counter()
 
         while self.running:
-            self.process_events()
-            self.update()
-            self.render()
-            self.clock.tick(60)
+            current_time = time.perf_counter()
+            frame_ms = (current_time - previous_time) * 1000
+            previous_time = current_time
+            # Drop time we could not catch up on instead of spiralling
+            accumulator += min(frame_ms, step_ms * MAX_STEPS_PER_FRAME)
+
+            with profiler.phase("events"):
+                self.process_events()
+            with profiler.phase("update"):
+                while self.running and accumulator >= step_ms:
+                    self.step()
+                    accumulator -= step_ms
+            if not self.running:
+                break
 
-    def start(self) -> None:
+            with profiler.phase("render"):
+                self.draw(accumulator / step_ms)
+            with profiler.phase("present"):
+                self.present()
+            with profiler.phase("sleep"):
+                self.clock.tick(self.render_fps)
+            profiler.end_frame()
+            if capture.active:
+                capture.end_frame()
+
+    def start(self, mode: str | None = None) -> None:
         """
-        Manage transitions between the menu, gameplay, and game-over screens.
+        Manage transitions between the menu, gameplay, and game-over screens. With
+        a mode the first game starts right away, as it was already chosen in a menu.
         """
         while True:
-            menu = Menu(self.screen, self.clock, self.background, self.setup.change_background)
-            menu.display()
-            self.background = menu.background
-            self.mode = getattr(menu, "chosen_mode", "standard")
+            if mode is None:
+                with self.profiler.scene("menu"):
+                    menu = Menu(self.screen, self.clock, self.background,
+                                self.setup.change_background)
+                    menu.display()
+                self.background = menu.background
+                self.mode = getattr(menu, "chosen_mode", "standard")
+            else:
+                self.background = self.setup.get_background()
+                self.mode, mode = mode, None
             print(f"Chosen mode: {self.mode}")
             pygame.mixer.music.stop()
             self.run()
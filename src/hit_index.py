@@ -0,0 +1,103 @@
+"""
+This module provides the HitIndex class, a uniform-grid spatial index used to
+resolve shots against many targets. Each target is stored in every grid cell its
+rect overlaps, so a shot only has to test the few targets in the cell under the
+cursor instead of every target on the screen. Targets with a collision mask are
+hit only on their opaque pixels, with the rect used as a cheap early reject.
+"""
+from collections.abc import Iterable, Sequence
+from typing import Any
+import pygame
+
+CELL_SIZE = 100  # Width and height of a grid cell in pixels
+
+
+class HitIndex:
+    """
+    This class indexes target rects in a uniform grid. It is responsible for:
+      - Rebuilding the grid from the targets of the current simulation step.
+      - Returning the topmost target under a point, in draw (z) order.
+      - Resolving many shots in one frame against the same grid.
+    Targets inserted later are drawn later, so they are on top.
+    """
+    def __init__(self, cell_size: int = CELL_SIZE) -> None:
+        """
+        Initialize an empty index.
+        """
+        self.cell_size = cell_size
+        self.cells: dict[tuple[int, int], list[int]] = {}
+        self.targets: list[Any] = []
+        self.rects: list[pygame.Rect] = []
+        self.masks: list[pygame.mask.Mask | None] = []
+
+    def __len__(self) -> int:
+        """
+        Return the number of indexed targets.
+        """
+        return len(self.targets)
+
+    def clear(self) -> None:
+        """
+        Remove every target from the index.
+        """
+        self.cells.clear()
+        self.targets.clear()
+        self.rects.clear()
+        self.masks.clear()
+
+    def insert(self, target: Any, rect: pygame.Rect,
+               mask: pygame.mask.Mask | None = None) -> None:
+        """
+        Add a target on top of every target inserted before it. The optional mask is
+        aligned with the top-left corner of the rect.
+        """
+        z = len(self.targets)
+        self.targets.append(target)
+        self.rects.append(pygame.Rect(rect))
+        self.masks.append(mask)
+        size = self.cell_size
+        for cell_x in range(rect.left // size, (rect.right - 1) // size + 1):
+            for cell_y in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                self.cells.setdefault((cell_x, cell_y), []).append(z)
+
+    def rebuild(self, targets: Iterable[tuple[Any, pygame.Rect, pygame.mask.Mask | None]]) -> None:
+        """
+        Replace the indexed targets with the given (target, rect, mask) triples in draw order.
+        """
+        self.clear()
+        for target, rect, mask in targets:
+            self.insert(target, rect, mask)
+
+    def hit_test(self, z: int, x: int, y: int) -> bool:
+        """
+        Return whether the point hits the target with the given z.
+        """
+        rect = self.rects[z]
+        if not rect.collidepoint(x, y):
+            return False
+        mask = self.masks[z]
+        if mask is None:
+            return True
+        offset_x, offset_y = x - rect.x, y - rect.y
+        width, height = mask.get_size()
+        return offset_x < width and offset_y < height and mask.get_at((offset_x, offset_y)) == 1
+
+    def query(self, point: tuple[int, int]) -> Any | None:
+        """
+        Return the topmost target under the point, or None if nothing was hit.
+        """
+        x, y = point
+        candidates = self.cells.get((x // self.cell_size, y // self.cell_size))
+        if not candidates:
+            return None
+        # Candidates are stored in z order, so search from the top
+        for z in reversed(candidates):
+            if self.hit_test(z, x, y):
+                return self.targets[z]
+        return None
+
+    def query_many(self, points: Sequence[tuple[int, int]]) -> list[Any | None]:
+        """
+        Return the topmost target under each point.
+        """
+        return [self.query(point) for point in points]
@@ -0,0 +1,28 @@
+"""
+This module provides the helpers used by the menu, results and game-over screens
+to sit idle without spinning. Instead of redrawing at 60 FPS, these screens block
+until input arrives and redraw only when something visible changed.
+"""
+from collections.abc import Sequence
+import pygame
+from src.button import Button
+
+IDLE_TIMEOUT_MS = 500  # Longest time a screen sleeps without checking its state
+
+
+def wait_for_events(timeout: int = IDLE_TIMEOUT_MS) -> list[pygame.event.Event]:
+    """
+    Block until an event arrives or the timeout passes, then return every pending event.
+    """
+    event = pygame.event.wait(timeout)
+    events = [] if event.type == pygame.NOEVENT else [event]
+    events.extend(pygame.event.get())
+    return events
+
+
+def hover_state(buttons: Sequence[Button], mouse_pos: tuple[int, int]) -> tuple[bool, ...]:
+    """
+    Return which of the buttons are under the mouse, so a redraw is only needed
+    when this changes.
+    """
+    return tuple(button.is_hovered(mouse_pos) for button in buttons)
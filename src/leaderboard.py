@@ -0,0 +1,487 @@
+"""
+This module provides a leaderboard shared by every game instance on a site: a
+small asyncio server in front of a ScoreStore, and the client the game uses to
+talk to it. The protocol is one JSON object per line over a TCP connection.
+
+The client never blocks the game. A submitted score is first written to a local
+SQLite outbox, then a background thread sends the outbox in batches over one
+persistent connection and removes what the server acknowledged. While the server
+cannot be reached, the client retries with a growing delay, and scores stay in
+the outbox across restarts. The first page of the ranking of every mode is
+kept warm, so the results screen opens instantly; it fetches the other pages in
+the background with fetch().
+
+Example:
+    python -m src.leaderboard --port 8765 --db scores.db
+    python main.py --leaderboard 127.0.0.1:8765
+"""
+import argparse
+import asyncio
+import json
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+from src.scores import ScoreStore, SCORES_DB, TOP_RESULTS
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+OUTBOX_DB = "leaderboard_outbox.db"
+MODES = ["standard", "time"]
+BATCH_SIZE = 50             # Submissions sent per request
+BATCH_DELAY = 0.05          # Seconds to wait for more submissions before sending
+REQUEST_TIMEOUT = 2.0       # Seconds to connect or to wait for an answer
+RETRY_DELAY = 1.0           # First delay in seconds after a failed request
+MAX_RETRY_DELAY = 60.0      # Longest delay between retries
+CACHE_TTL = 30.0            # Seconds before cached pages of the ranking are refreshed
+PAGE_ROWS = 50              # Rows per page of the ranking
+MAX_TOP = 100               # Most scores returned by one top request
+MAX_ROWS = 200              # Most rows returned by one rows request
+
+T = TypeVar("T")
+
+
+class LeaderboardServer:
+    """
+    This class serves a ScoreStore over TCP. It is responsible for:
+      - Accepting any number of persistent client connections.
+      - Saving batches of submissions, each batch in one transaction, exactly once.
+      - Answering top score queries, pages of the ranking and the position of
+        a submission.
+    The store is only used from one worker thread, so a commit never stalls the
+    event loop and the other connections.
+    """
+    def __init__(self, store: ScoreStore) -> None:
+        """
+        Initialize the server for the given store.
+        """
+        self.store = store
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="leaderboard-store")
+        self.server: asyncio.Server | None = None
+        self.connections = 0
+        self.requests = 0
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> int:
+        """
+        Start listening and return the port (useful when port is 0).
+        """
+        self.server = await asyncio.start_server(self.handle_connection, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """
+        Stop listening.
+        """
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        self.executor.shutdown(wait=True)
+
+    async def run_store(self, function: Callable[..., T], *args: Any) -> T:
+        """
+        Call a store method on the worker thread and return its result.
+        """
+        return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+
+    async def handle_connection(self, reader: asyncio.StreamReader,
+                                writer: asyncio.StreamWriter) -> None:
+        """
+        Answer every request of one connection until the client closes it.
+        """
+        self.connections += 1
+        try:
+            while line := await reader.readline():
+                try:
+                    response = await self.handle_request(json.loads(line))
+                except (ValueError, KeyError, TypeError) as error:
+                    response = {"ok": False, "error": f"Bad request: {error}"}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def handle_request(self, request: dict[str, Any]) -> dict[str, Any]:
+        """
+        Answer one request.
+        """
+        self.requests += 1
+        if request["op"] == "submit":
+            submissions = [(str(entry["id"]), str(entry["mode"]), str(entry["name"]),
+                            int(entry["score"])) for entry in request["scores"]]
+            return {"ok": True, "ranks": await self.run_store(self.store.add_many, submissions)}
+        if request["op"] == "top":
+            limit = min(int(request.get("limit", TOP_RESULTS)), MAX_TOP)
+            scores = await self.run_store(self.store.top, str(request["mode"]), limit)
+            return {"ok": True, "scores": scores}
+        if request["op"] == "rows":
+            count = max(0, min(int(request["count"]), MAX_ROWS))
+            return await self.run_store(self.rows, str(request["mode"]),
+                                        max(0, int(request["start"])), count)
+        if request["op"] == "position":
+            return await self.run_store(self.position, str(request["mode"]), str(request["id"]))
+        raise ValueError(f"unknown op {request['op']!r}")
+
+    def rows(self, mode: str, start: int, count: int) -> dict[str, Any]:
+        """
+        Return a page of the ranking of a mode and its length, on the worker thread.
+        """
+        return {"ok": True, "rows": self.store.rows(mode, start, count),
+                "count": self.store.count(mode)}
+
+    def position(self, mode: str, submission_id: str) -> dict[str, Any]:
+        """
+        Return the position of a submission, on the worker thread.
+        """
+        return {"ok": True, "position": self.store.submission_position(mode, submission_id)}
+
+
+class Outbox:
+    """
+    The scores that were submitted but not yet acknowledged by the server, kept
+    in SQLite so they survive a crash or a restart of the game.
+    """
+    def __init__(self, path: str = OUTBOX_DB) -> None:
+        """
+        Open (or create) the outbox at the given path. It is used from the game
+        thread and the client thread, so access is serialized with a lock.
+        """
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock, self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS outbox (seq INTEGER PRIMARY KEY, id TEXT NOT NULL, "
+                "mode TEXT NOT NULL, name TEXT NOT NULL, score INTEGER NOT NULL)")
+
+    def add(self, mode: str, name: str, score: int) -> str:
+        """
+        Store a submission and return its id.
+        """
+        submission_id = uuid.uuid4().hex
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT INTO outbox (id, mode, name, score) VALUES (?, ?, ?, ?)",
+                (submission_id, mode, name, score))
+        return submission_id
+
+    def pending(self, limit: int = BATCH_SIZE) -> list[dict[str, Any]]:
+        """
+        Return the oldest submissions that were not acknowledged yet.
+        """
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT seq, id, mode, name, score FROM outbox ORDER BY seq LIMIT ?",
+                (limit,)).fetchall()
+        return [{"seq": seq, "id": submission_id, "mode": mode, "name": name, "score": score}
+                for seq, submission_id, mode, name, score in rows]
+
+    def remove(self, sequence_numbers: list[int]) -> None:
+        """
+        Forget acknowledged submissions.
+        """
+        with self.lock, self.connection:
+            self.connection.executemany("DELETE FROM outbox WHERE seq = ?",
+                                        [(seq,) for seq in sequence_numbers])
+
+    def __len__(self) -> int:
+        """
+        Return the number of submissions waiting to be sent.
+        """
+        with self.lock:
+            (count,) = self.connection.execute("SELECT COUNT(*) FROM outbox").fetchone()
+        return count
+
+    def close(self) -> None:
+        """
+        Close the outbox.
+        """
+        with self.lock:
+            self.connection.close()
+
+
+class LeaderboardClient:
+    """
+    This class connects the game to the leaderboard server. It is responsible for:
+      - Accepting submissions without blocking, through the durable outbox.
+      - Sending the outbox in batches over one persistent connection on its own thread.
+      - Retrying with exponential backoff while the server cannot be reached.
+      - Caching the first page of the ranking of every mode for instant reads.
+      - Running other queries in the background for the results screen.
+    """
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 outbox_path: str = OUTBOX_DB) -> None:
+        """
+        Initialize the client. Nothing is sent before start() is called.
+        """
+        self.host = host
+        self.port = port
+        self.outbox = Outbox(outbox_path)
+        # First page of the ranking of every mode: when it was fetched, its rows
+        # and the length of the ranking
+        self.cache: dict[str, tuple[float, list[tuple[int, str, int]], int]] = {}
+        self.stale_modes = set(MODES)
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.run_loop, name="leaderboard", daemon=True)
+        self.ready = threading.Event()
+        self.wakeup: asyncio.Event | None = None
+        self.request_lock: asyncio.Lock | None = None
+        self.last_submitted: dict[str, str] = {}  # Id of the last submission per mode
+        self.closing = False
+        self.reader: asyncio.StreamReader | None = None
+        self.writer: asyncio.StreamWriter | None = None
+        self.retry_delay = RETRY_DELAY
+        self.sent = 0
+        self.failures = 0
+
+    def start(self) -> None:
+        """
+        Start the client thread; it sends any scores left in the outbox and
+        fetches the first page of every mode right away.
+        """
+        self.thread.start()
+        self.ready.wait()
+        self.notify()
+
+    def close(self, timeout: float = REQUEST_TIMEOUT) -> None:
+        """
+        Stop the client thread. Unsent scores stay in the outbox.
+        """
+        if self.thread.is_alive():
+            self.closing = True
+            self.notify()
+            self.thread.join(timeout)
+        self.outbox.close()
+
+    def notify(self) -> None:
+        """
+        Wake the client thread up from any thread.
+        """
+        if self.wakeup is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.wakeup.set)
+
+    def refresh(self, mode: str) -> None:
+        """
+        Ask the client thread to fetch the first page of a mode again.
+        """
+        if self.wakeup is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.stale_modes.add, mode)
+            self.notify()
+
+    def submit(self, mode: str, name: str, score: int) -> None:
+        """
+        Queue a score for the server. This only writes to the local outbox.
+        """
+        self.last_submitted[mode] = self.outbox.add(mode, name, score)
+        self.notify()
+
+    def first_page(self, mode: str) -> tuple[float, list[tuple[int, str, int]], int] | None:
+        """
+        Return the cached first page of a mode as (monotonic time it was fetched,
+        rows, length of the ranking), or None if it was never fetched. A stale or
+        missing page is refreshed in the background.
+        """
+        entry = self.cache.get(mode)
+        if entry is None or time.monotonic() - entry[0] > CACHE_TTL:
+            self.refresh(mode)
+        return entry
+
+    def fetch(self, message: dict[str, Any],
+              callback: Callable[[dict[str, Any] | None], None]) -> None:
+        """
+        Send a request from any thread without waiting. The callback gets the
+        answer, or None if the server could not be reached, on the client thread.
+        """
+        if self.wakeup is None or self.loop.is_closed() or self.closing:
+            callback(None)
+            return
+        future = asyncio.run_coroutine_threadsafe(self.query(message), self.loop)
+        future.add_done_callback(
+            lambda done: callback(None if done.cancelled() else done.result()))
+
+    def call_later(self, delay: float, callback: Callable[[], object]) -> None:
+        """
+        Call a function on the client thread after a delay, from any thread.
+        """
+        if self.wakeup is not None and not self.loop.is_closed() and not self.closing:
+            self.loop.call_soon_threadsafe(self.loop.call_later, delay, callback)
+
+    async def query(self, message: dict[str, Any]) -> dict[str, Any] | None:
+        """
+        Send one request and return the answer, or None if it failed.
+        """
+        try:
+            return await self.request(message)
+        except (OSError, asyncio.TimeoutError, ValueError):
+            return None
+
+    def run_loop(self) -> None:
+        """
+        Run the event loop of the client thread.
+        """
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self.run())
+        finally:
+            self.loop.close()
+
+    async def run(self) -> None:
+        """
+        Send the outbox and refresh the cached pages whenever woken up, and retry
+        after a delay while anything is left to do.
+        """
+        self.wakeup = asyncio.Event()
+        self.request_lock = asyncio.Lock()
+        self.ready.set()
+        while not self.closing:
+            timeout = self.retry_delay if len(self.outbox) or self.stale_modes else None
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+            if self.closing:
+                break
+            # Scores submitted close together share a batch
+            await asyncio.sleep(BATCH_DELAY)
+            await self.sync()
+        await self.disconnect()
+
+    async def sync(self) -> None:
+        """
+        Send every pending submission, then refresh the stale first pages.
+        """
+        try:
+            while batch := self.outbox.pending(BATCH_SIZE):
+                scores = [{key: entry[key] for key in ("id", "mode", "name", "score")}
+                          for entry in batch]
+                await self.request({"op": "submit", "scores": scores})
+                self.outbox.remove([entry["seq"] for entry in batch])
+                self.sent += len(batch)
+                self.stale_modes.update(entry["mode"] for entry in batch)
+            for mode in sorted(self.stale_modes):
+                response = await self.request({"op": "rows", "mode": mode, "start": 0,
+                                               "count": PAGE_ROWS})
+                self.cache[mode] = (time.monotonic(),
+                                    [(position, name, score)
+                                     for position, name, score in response["rows"]],
+                                    response["count"])
+                self.stale_modes.discard(mode)
+            self.retry_delay = RETRY_DELAY
+        except (OSError, asyncio.TimeoutError, ValueError) as error:
+            self.failures += 1
+            self.retry_delay = min(self.retry_delay * 2, MAX_RETRY_DELAY)
+            print(f"Leaderboard unavailable ({error!r}), retrying in {self.retry_delay:.0f} s")
+
+    async def connect(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """
+        Return the persistent connection, opening it if needed.
+        """
+        if self.reader is not None and self.writer is not None and not self.writer.is_closing():
+            return self.reader, self.writer
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), REQUEST_TIMEOUT)
+        self.reader, self.writer = reader, writer
+        return reader, writer
+
+    async def request(self, message: dict[str, Any]) -> dict[str, Any]:
+        """
+        Send one request over the persistent connection (opening it if needed)
+        and return the answer. Requests take turns, so answers cannot mix up.
+        """
+        assert self.request_lock is not None
+        async with self.request_lock:
+            reader, writer = await self.connect()
+            try:
+                writer.write(json.dumps(message).encode() + b"\n")
+                await writer.drain()
+                line = await asyncio.wait_for(reader.readline(), REQUEST_TIMEOUT)
+                if not line:
+                    raise ConnectionResetError("Connection closed by the leaderboard server")
+                response = json.loads(line)
+            except BaseException:
+                # A late answer must not reach the next request: drop the connection
+                # before another request can take the lock
+                self.close_connection(writer)
+                raise
+        if not response.get("ok"):
+            raise ValueError(response.get("error", "Request failed"))
+        return response
+
+    def close_connection(self, writer: asyncio.StreamWriter) -> None:
+        """
+        Close a connection and forget it, unless another one was opened since.
+        """
+        writer.close()
+        if self.writer is writer:
+            self.reader = self.writer = None
+
+    async def disconnect(self) -> None:
+        """
+        Close the connection, if open.
+        """
+        writer = self.writer
+        if writer is None:
+            return
+        self.close_connection(writer)
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+
+
+leaderboard: LeaderboardClient | None = None
+
+
+def connect_leaderboard(address: str, outbox_path: str = OUTBOX_DB) -> LeaderboardClient:
+    """
+    Start the process-wide leaderboard client for a "host:port" address.
+    """
+    global leaderboard
+    host, _, port = address.rpartition(":")
+    leaderboard = LeaderboardClient(host or DEFAULT_HOST, int(port), outbox_path)
+    leaderboard.start()
+    return leaderboard
+
+
+def get_leaderboard() -> LeaderboardClient | None:
+    """
+    Return the process-wide leaderboard client, or None if the game keeps its
+    scores locally only.
+    """
+    return leaderboard
+
+
+async def serve(host: str, port: int, path: str) -> None:
+    """
+    Run a leaderboard server until it is interrupted.
+    """
+    server = LeaderboardServer(ScoreStore(path))
+    port = await server.start(host, port)
+    print(f"Leaderboard serving {path} on {host}:{port}")
+    assert server.server is not None
+    await server.server.serve_forever()
+
+
+def main(argv: list[str]) -> int:
+    """
+    Run the leaderboard server from the command line.
+    """
+    parser = argparse.ArgumentParser(description="DuckHunt leaderboard server")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--db", default=SCORES_DB, help="SQLite score database")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.db))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,102 @@
+"""
+This module loads the game assets in parallel behind a loading screen. Decoding
+PNG and audio files does not need the display, so it runs on a thread pool while
+the main thread keeps the window responsive and draws the progress. Only the
+display-dependent steps (convert()/convert_alpha()) are left to the main thread.
+"""
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any
+import pygame
+from src import display
+from src.startup import get_timeline
+from src.text_cache import get_text_cache
+
+LOADER_WORKERS = 4          # Decoding threads
+PROGRESS_INTERVAL = 1 / 60  # Seconds between redraws of the loading screen
+BAR_SIZE = (400, 24)        # Size of the progress bar in pixels
+
+
+class AssetLoader:
+    """
+    This class decodes assets on a thread pool. It is responsible for:
+      - Running every submitted decode job (e.g. pygame.image.load) on a worker thread.
+      - Keeping the main thread responsive while the jobs run, reporting progress.
+      - Returning the decoded results by name once every job has finished.
+    Errors raised by a job are raised again on the main thread.
+    """
+    def __init__(self, workers: int = LOADER_WORKERS) -> None:
+        """
+        Initialize the loader with an idle thread pool.
+        """
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="asset-loader")
+        self.futures: dict[str, Future[Any]] = {}
+        self.elapsed = 0.0
+
+    def submit(self, name: str, decode: Callable[..., Any], *args: Any) -> None:
+        """
+        Start decoding an asset on a worker thread. Submitting the same name twice
+        decodes it once.
+        """
+        if name not in self.futures:
+            self.futures[name] = self.executor.submit(self.run_job, name, decode, *args)
+
+    def run_job(self, name: str, decode: Callable[..., Any], *args: Any) -> Any:
+        """
+        Decode one asset on a worker thread and record it on the startup timeline.
+        """
+        with get_timeline().span(f"decode {name}"):
+            return decode(*args)
+
+    def wait(self, progress: Callable[[int, int], None] | None = None) -> dict[str, Any]:
+        """
+        Block until every job has finished, calling progress(done, total) on the main
+        thread in between, and return the decoded assets by name.
+        """
+        start = time.perf_counter()
+        total = len(self.futures)
+        pending = set(self.futures.values())
+        try:
+            while pending:
+                if progress is not None:
+                    progress(total - len(pending), total)
+                _, pending = wait(pending, timeout=PROGRESS_INTERVAL,
+                                  return_when=FIRST_COMPLETED)
+            if progress is not None:
+                progress(total, total)
+            return {name: future.result() for name, future in self.futures.items()}
+        finally:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.elapsed = time.perf_counter() - start
+
+
+class LoadingScreen:
+    """
+    This class draws the loading screen: a caption and a progress bar. It also
+    pumps the event queue, so the window is not reported as frozen while loading.
+    """
+    def __init__(self, screen: pygame.Surface, font: pygame.font.Font) -> None:
+        """
+        Initialize the loading screen on the given display surface.
+        """
+        self.screen = screen
+        self.font = font
+
+    def draw(self, done: int, total: int) -> None:
+        """
+        Draw the progress of the loader.
+        """
+        pygame.event.pump()
+        self.screen.fill(pygame.Color("black"))
+        center_x, center_y = self.screen.get_width() // 2, self.screen.get_height() // 2
+        text = get_text_cache().render(self.font, "Loading...", "white")
+        self.screen.blit(text, text.get_rect(center=(center_x, center_y - 40)))
+
+        bar = pygame.Rect((0, 0), BAR_SIZE)
+        bar.center = (center_x, center_y)
+        pygame.draw.rect(self.screen, pygame.Color("steelblue"), bar, 2)
+        filled = bar.inflate(-8, -8)
+        filled.width = filled.width * done // total if total else filled.width
+        pygame.draw.rect(self.screen, pygame.Color("dodgerblue"), filled)
+        display.flip()
@@ -4,8 +4,19 @@ This module implements the menu system.
 import sys
 from collections.abc import Callable
 import pygame
+from src import display
 from src.music import Music
 from src.button import Button
+from src.capture import PROFILE_KEY, get_profile_capture
+from src.startup import get_timeline
+from src.text_cache import get_text_cache, get_font
+from src.idle import wait_for_events, hover_state
+from src.leaderboard import get_leaderboard
+from src.results_view import (ResultsList, ScoreSource, RESULTS_UPDATED,
+                              get_leaderboard_source)
+from src.scores import get_score_store
+
+RESULT_TABS = {"Standard Mode": "standard", "Time Mode": "time"}  # Tab label and mode
 
 
 class Menu:
@@ -15,7 +26,7 @@ class Menu:
     also plays the title music.
     """
     def __init__(self, screen: pygame.Surface, clock: pygame.time.Clock,
-                 background: pygame.Surface, change_background: Callable[[], str]) -> None:
+                 background: pygame.Surface, change_background: Callable[[], pygame.Surface]) -> None:
         """
         Initialize the menu with background and buttons.
         """
@@ -26,60 +37,78 @@ class Menu:
         self.background = background
         self.change_background = change_background
 
+        # One font for every button, so their labels share the text cache
+        self.font = get_font("Arial", 30)
+
         # Initialize buttons
         self.main_menu_buttons = [
             Button(
-                "Game Start", 250, 150, 300, 60, pygame.font.SysFont("Arial", 30), 
+                "Game Start", 250, 150, 300, 60, self.font,
                 pygame.Color("steelblue"), pygame.Color("dodgerblue")
             ),
             Button(
-                "Top Results", 250, 230, 300, 60, pygame.font.SysFont("Arial", 30), 
+                "Top Results", 250, 230, 300, 60, self.font,
                 pygame.Color("steelblue"), pygame.Color("dodgerblue")
             ),
             Button(
-                "Change Background", 250, 310, 300, 60, pygame.font.SysFont("Arial", 30), 
+                "Change Background", 250, 310, 300, 60, self.font,
                 pygame.Color("steelblue"), pygame.Color("dodgerblue")
             ),
             Button(
-                "Quit", 250, 390, 300, 60, pygame.font.SysFont("Arial", 30), 
+                "Quit", 250, 390, 300, 60, self.font,
                 pygame.Color("steelblue"), pygame.Color("dodgerblue")
             )
         ]
 
         self.mode_menu_buttons = [
             Button(
-                "Standard Mode", 250, 150, 300, 60, pygame.font.SysFont("Arial", 30), 
+                "Standard Mode", 250, 150, 300, 60, self.font,
                 pygame.Color("steelblue"), pygame.Color("dodgerblue")
             ),
             Button(
-                "Time Mode", 250, 230, 300, 60, pygame.font.SysFont("Arial", 30), 
+                "Time Mode", 250, 230, 300, 60, self.font,
                 pygame.Color("steelblue"), pygame.Color("dodgerblue")
             )
         ]
 
         self.current_menu = "main"
-        self.music_manager = Music()
-        self.music_manager.play_music(self.music_manager.title_music)
+        # Started once the menu is on screen, so initializing the mixer does not delay it
+        self.music_manager: Music | None = None
 
     def display(self) -> None:
         """
-        Display the menu screen with buttons and background.
+        Display the menu screen with buttons and background. The screen is only
+        redrawn after input that changes it, so an idle menu uses no CPU.
         """
+        capture = get_profile_capture()
+        redraw = True
+        hover: tuple[bool, ...] = ()
         while self.running:
-            self.screen.blit(self.background, (0, 0))
             mouse_x, mouse_y = pygame.mouse.get_pos()
 
             buttons = self.main_menu_buttons if self.current_menu == "main" else self.mode_menu_buttons
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
+            current_hover = hover_state(buttons, (mouse_x, mouse_y))
+            if redraw or current_hover != hover:
+                hover = current_hover
+                self.screen.blit(self.background, (0, 0))
+                for button in buttons:
+                    button.draw(self.screen, (mouse_x, mouse_y))
+                display.flip()
+                get_timeline().finish("title screen presented")
+                redraw = False
+                if self.music_manager is None:
+                    self.play_title_music()
+
+            for event in wait_for_events():
+                if event.type in display.QUIT_EVENTS:
                     self.running = False
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     for button in buttons:
                         if button.is_clicked(event):
+                            redraw = True
                             if button.text == "Change Background":
-                                new_background_path = self.change_background()
-                                self.background = pygame.image.load(new_background_path).convert()
+                                self.background = self.change_background()
                             elif button.text == "Quit":
                                 sys.exit()
                             elif button.text == "Game Start":
@@ -90,12 +119,19 @@ class Menu:
                                 self.start_game("standard")
                             elif button.text == "Time Mode":
                                 self.start_game("time")
-
-            for button in buttons:
-                button.draw(self.screen, (mouse_x, mouse_y))
-
-            pygame.display.flip()
-            self.clock.tick(60)
+                elif event.type == pygame.KEYDOWN and event.key == PROFILE_KEY:
+                    capture.toggle()
+                elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                    redraw = True
+            if capture.active:
+                capture.end_frame()
+
+    def play_title_music(self) -> None:
+        """
+        Start the title music, initializing the mixer if no game has done so yet.
+        """
+        self.music_manager = Music()
+        self.music_manager.play_music(self.music_manager.title_music)
 
     def select_mode(self) -> None:
         """
@@ -110,31 +146,39 @@ class Menu:
         self.running = False
         self.chosen_mode = mode
 
-    def load_results(self, filename: str) -> list[tuple[str, int]]:
-        """
-        Load results from a file, returning a list of (name, score) tuples.
-        """
-        try:
-            with open(filename, "r", encoding="utf-8") as file:
-                return [(name, int(score)) for name, score in (line.strip().split(",") for line in file.readlines())]
-        except FileNotFoundError:
-            return []
-
     def show_top_results(self) -> None:
         """
-        Display the top results screen with a return button.
+        Display the top results screen: a tab per mode, a scrollable list of the
+        scores of the selected mode, a button that jumps to the score saved last
+        and a return button. The list only draws the rows that are visible.
         """
-        font = pygame.font.SysFont("Arial", 30)
+        font = self.font
+        text_cache = get_text_cache()
         results_running = True
-
-        # Load top results
-        standard_results = self.load_results("standard_results.txt")
-        time_results = self.load_results("time_results.txt")
-
+        width = self.screen.get_width()
+
+        # The shared leaderboard is paged in the background and its pages are kept
+        # across visits; the scores saved on this machine are shown until it answers
+        source: ScoreSource = get_score_store()
+        leaderboard = get_leaderboard()
+        if leaderboard is not None:
+            source = get_leaderboard_source(
+                leaderboard, source,
+                lambda: pygame.event.post(pygame.event.Event(RESULTS_UPDATED)))
+
+        tabs = [
+            Button(label, 50 + index * 240, 30, 220, 50, font,
+                   pygame.Color("steelblue"), pygame.Color("dodgerblue"))
+            for index, label in enumerate(RESULT_TABS)
+        ]
+        my_rank_button = Button(
+            "My Rank", 530, 30, 220, 50, font,
+            pygame.Color("steelblue"), pygame.Color("dodgerblue")
+        )
         # Create the return button
         return_button = Button(
             "Return to Main Menu",
-            self.screen.get_width() // 2 - 150,
+            width // 2 - 150,
             self.screen.get_height() - 100,
             300,
             60,
@@ -142,49 +186,66 @@ class Menu:
             pygame.Color("steelblue"),
             pygame.Color("dodgerblue")
         )
-
+        buttons = tabs + [my_rank_button, return_button]
+        results_list = ResultsList(pygame.Rect(50, 130, width - 100, 360), font, source)
+
+        # Composite the static part of the screen once
+        results_layer = pygame.Surface(self.screen.get_size())
+        results_layer.fill(pygame.Color("black"))
+        results_layer.blit(text_cache.render(font, "Rank", "gray"), (50, 95))
+        results_layer.blit(text_cache.render(font, "Name", "gray"), (160, 95))
+        score_header = text_cache.render(font, "Score", "gray")
+        results_layer.blit(score_header, score_header.get_rect(topright=(width - 74, 95)))
+
+        capture = get_profile_capture()
+        redraw = True
+        hover: tuple[bool, ...] = ()
         while results_running:
-            self.screen.fill(pygame.Color("black"))
-
-            # Display headers
-            self.screen.blit(
-                font.render("Standard Mode", True, pygame.Color("white")),
-                (50, 100)
-            )
-            self.screen.blit(
-                font.render("Time Mode", True, pygame.Color("white")),
-                (self.screen.get_width() // 2 + 20, 100)
-            )
-
-            # Display results for both modes
-            y_offset = 140
-            for i in range(max(len(standard_results), len(time_results))):
-                if i < len(standard_results):
-                    name, score = standard_results[i]
-                    self.screen.blit(
-                        font.render(f"{name}: {score}", True, pygame.Color("white")),
-                        (50, y_offset)
-                    )
-                if i < len(time_results):
-                    name, score = time_results[i]
-                    self.screen.blit(
-                        font.render(f"{name}: {score}", True, pygame.Color("white")),
-                        (self.screen.get_width() // 2 + 20, y_offset)
-                    )
-                y_offset += 30
+            mouse_pos = pygame.mouse.get_pos()
+            current_hover = hover_state(buttons, mouse_pos)
+            if redraw or current_hover != hover:
+                hover = current_hover
+                self.screen.blit(results_layer, (0, 0))
+                for tab, mode in zip(tabs, RESULT_TABS.values()):
+                    tab.draw(self.screen, mouse_pos)
+                    if mode == results_list.mode:
+                        pygame.draw.rect(self.screen, pygame.Color("white"),
+                                         (tab.rect.x, tab.rect.bottom - 4, tab.rect.width, 4))
+                my_rank_button.draw(self.screen, mouse_pos)
+                return_button.draw(self.screen, mouse_pos)
+                results_list.draw(self.screen)
+                display.flip()
+                redraw = False
 
             # Handle events and button interactions
-            mouse_pos = pygame.mouse.get_pos()
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
+            for event in wait_for_events():
+                if event.type in display.QUIT_EVENTS:
                     results_running = False
                     self.running = False
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     if return_button.is_clicked(event):
                         results_running = False
                         self.current_menu = "main"
-
-            return_button.draw(self.screen, mouse_pos)
-
-            pygame.display.flip()
-            self.clock.tick(60)
+                    elif my_rank_button.is_clicked(event):
+                        redraw = results_list.jump_to_last_saved() or redraw
+                    for tab, mode in zip(tabs, RESULT_TABS.values()):
+                        if tab.is_clicked(event) and mode != results_list.mode:
+                            results_list.set_mode(mode)
+                            redraw = True
+                elif event.type == pygame.KEYDOWN and event.key == PROFILE_KEY:
+                    capture.toggle()
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_TAB:
+                    modes = list(RESULT_TABS.values())
+                    results_list.set_mode(modes[(modes.index(results_list.mode) + 1) % len(modes)])
+                    redraw = True
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_m:
+                    redraw = results_list.jump_to_last_saved() or redraw
+                elif event.type == RESULTS_UPDATED:
+                    results_list.refresh()
+                    redraw = True
+                elif results_list.handle_event(event):
+                    redraw = True
+                elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                    redraw = True
+            if capture.active:
+                capture.end_frame()
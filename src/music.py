@@ -2,26 +2,90 @@
 This module implements a music manager.
 """
 import pygame
+from src.audio import get_audio_bank, LatencyMonitor
+from src.channels import ChannelPool, get_channel_pool, DEFAULT_CATEGORY
+
+TITLE_MUSIC = "assets/new_title_screen.mp3"
+COMBO_SOUND = "assets/combo.mp3"
+DUCK_FLAPPING_SOUND = "assets/duck_flapping.mp3"
+GAME_OVER_SOUND = "assets/game_over.mp3"
+GUNSHOT_SOUND = "assets/gunshot.mp3"
+SOUND_FILES = [COMBO_SOUND, DUCK_FLAPPING_SOUND, GAME_OVER_SOUND, GUNSHOT_SOUND]
+
+SOUND_VOLUMES = {COMBO_SOUND: 0.7, DUCK_FLAPPING_SOUND: 0.7, GUNSHOT_SOUND: 0.8}
+SOUND_CATEGORIES = {
+    GUNSHOT_SOUND: "gunshot",
+    COMBO_SOUND: "combo",
+    GAME_OVER_SOUND: "game_over",
+    DUCK_FLAPPING_SOUND: "ambient",
+}
 
 class Music:
     """
     It initializes the mixer, loads various sound assets (title music, combo sound, duck flapping,
     game over, and gunshot sounds), and provides methods to play or stop these sounds.
+    The sound effects are taken from the shared audio bank on first use, so the menu,
+    which only plays the title music, never waits for them.
     """
     def __init__(self) -> None:
         """
         Initialize the music manager.
         """
-        pygame.mixer.init()
-        self.title_music = "assets/new_title_screen.mp3"
-        self.combo_sound = pygame.mixer.Sound("assets/combo.mp3")
-        self.duck_flapping_sound = pygame.mixer.Sound("assets/duck_flapping.mp3")
-        self.game_over_sound = pygame.mixer.Sound("assets/game_over.mp3")
-        self.gunshot_sound = pygame.mixer.Sound("assets/gunshot.mp3")
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        self.title_music = TITLE_MUSIC
+        self.sounds: dict[str, pygame.mixer.Sound] = {}
+        self.categories: dict[pygame.mixer.Sound, str] = {}
+        self.latency_monitor: LatencyMonitor | None = None
+
+    def get_sound(self, path: str) -> pygame.mixer.Sound:
+        """
+        Return the sound effect at the given path with its volume set.
+        """
+        sound = self.sounds.get(path)
+        if sound is None:
+            sound = get_audio_bank().load(path)
+            volume = SOUND_VOLUMES.get(path)
+            if volume is not None:
+                sound.set_volume(volume)
+            self.sounds[path] = sound
+            self.categories[sound] = SOUND_CATEGORIES.get(path, DEFAULT_CATEGORY)
+        return sound
 
-        self.combo_sound.set_volume(0.7)
-        self.duck_flapping_sound.set_volume(0.7)
-        self.gunshot_sound.set_volume(0.8)
+    @property
+    def combo_sound(self) -> pygame.mixer.Sound:
+        """
+        Return the sound played when a milestone is reached.
+        """
+        return self.get_sound(COMBO_SOUND)
+
+    @property
+    def duck_flapping_sound(self) -> pygame.mixer.Sound:
+        """
+        Return the sound of a flying duck.
+        """
+        return self.get_sound(DUCK_FLAPPING_SOUND)
+
+    @property
+    def game_over_sound(self) -> pygame.mixer.Sound:
+        """
+        Return the sound played when the game is over.
+        """
+        return self.get_sound(GAME_OVER_SOUND)
+
+    @property
+    def gunshot_sound(self) -> pygame.mixer.Sound:
+        """
+        Return the sound of a shot.
+        """
+        return self.get_sound(GUNSHOT_SOUND)
+
+    @property
+    def channels(self) -> ChannelPool:
+        """
+        Return the mixer channel pool the sound effects play on.
+        """
+        return get_channel_pool()
 
     def play_music(self, music_file: str, loop: bool = True) -> None:
         """
@@ -40,11 +104,15 @@ class Music:
         """
         pygame.mixer.music.stop()
 
-    def play_sound(self, sound: pygame.mixer.Sound) -> None:
+    def play_sound(self, sound: pygame.mixer.Sound, category: str | None = None) -> None:
         """
-        Play a sound effect.
+        Play a sound effect on a channel of its category (looked up by default).
         """
-        sound.play()
+        if category is None:
+            category = self.categories.get(sound, DEFAULT_CATEGORY)
+        self.channels.play(sound, category)
+        if self.latency_monitor is not None:
+            self.latency_monitor.sound_queued()
 
     def stop_all_sounds(self) -> None:
         """
@@ -0,0 +1,176 @@
+"""
+This module records and replays DuckHunt games. A replay stores everything needed
+to run a game again exactly: the random seed, the mode, the background and the
+simulation step, position and interpolation alpha of every shot (shots hit what
+was drawn, see Gameplay.find_targets). Replays are saved in a compact
+binary format (a fixed header followed by the zlib-compressed shots).
+
+Run it with: python -m src.replay verify <file> [<file> ...]
+         or: python -m src.replay play <file>
+"""
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+
+REPLAY_DIR = "replays"
+REPLAY_EXTENSION = ".dhr"
+MAGIC = b"DHR2"
+ALPHA_STEPS = 255  # Shot alphas are stored as a byte in 1/ALPHA_STEPS
+# magic, seed, mode, background index, step rate, final score, steps, shot count
+HEADER = struct.Struct("<4sQBBHiII")
+MODES = ["standard", "time"]
+
+
+def quantize_alpha(alpha: float) -> float:
+    """
+    Return the alpha a shot is resolved and stored with, so a replay resolves
+    it exactly as the game did.
+    """
+    return round(min(max(alpha, 0.0), 1.0) * ALPHA_STEPS) / ALPHA_STEPS
+
+
+class Replay:
+    """
+    This class holds the recording of one game. Shots are kept in four flat
+    arrays (step, x, y, alpha) so recording a shot never allocates a Python object.
+    """
+    def __init__(self, seed: int, mode: str, background_index: int, step_rate: int) -> None:
+        """
+        Initialize an empty recording for a game started with the given seed.
+        """
+        self.seed = seed
+        self.mode = mode
+        self.background_index = background_index
+        self.step_rate = step_rate
+        self.final_score = 0
+        self.steps = 0
+        self.shot_steps = array("I")
+        self.shot_x = array("i")
+        self.shot_y = array("i")
+        self.shot_alpha = array("B")
+
+    def __len__(self) -> int:
+        """
+        Return the number of recorded shots.
+        """
+        return len(self.shot_steps)
+
+    def add_shot(self, step: int, position: tuple[int, int], alpha: float = 1.0) -> None:
+        """
+        Record a shot fired before the given simulation step, while the frame
+        drawn at the given alpha was on screen.
+        """
+        self.shot_steps.append(step)
+        self.shot_x.append(position[0])
+        self.shot_y.append(position[1])
+        self.shot_alpha.append(round(quantize_alpha(alpha) * ALPHA_STEPS))
+
+    def finish(self, final_score: int, steps: int) -> None:
+        """
+        Record how the game ended.
+        """
+        self.final_score = final_score
+        self.steps = steps
+
+    def shots_by_step(self) -> dict[int, list[tuple[tuple[int, int], float]]]:
+        """
+        Return the recorded shots as (position, alpha) grouped by the step they
+        were fired before.
+        """
+        shots: dict[int, list[tuple[tuple[int, int], float]]] = {}
+        for step, x, y, alpha in zip(self.shot_steps, self.shot_x, self.shot_y, self.shot_alpha):
+            shots.setdefault(step, []).append(((x, y), alpha / ALPHA_STEPS))
+        return shots
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the replay.
+        """
+        header = HEADER.pack(MAGIC, self.seed, MODES.index(self.mode), self.background_index,
+                             self.step_rate, self.final_score, self.steps, len(self))
+        body = (self.shot_steps.tobytes() + self.shot_x.tobytes() + self.shot_y.tobytes()
+                + self.shot_alpha.tobytes())
+        return header + zlib.compress(body, 9)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Replay":
+        """
+        Deserialize a replay.
+        """
+        magic, seed, mode, background_index, step_rate, final_score, steps, count = \
+            HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not a DuckHunt replay")
+        replay = cls(seed, MODES[mode], background_index, step_rate)
+        replay.finish(final_score, steps)
+        body = zlib.decompress(data[HEADER.size:])
+        step_bytes = count * replay.shot_steps.itemsize
+        coordinate_bytes = count * replay.shot_x.itemsize
+        replay.shot_steps.frombytes(body[:step_bytes])
+        replay.shot_x.frombytes(body[step_bytes:step_bytes + coordinate_bytes])
+        alpha_start = step_bytes + 2 * coordinate_bytes
+        replay.shot_y.frombytes(body[step_bytes + coordinate_bytes:alpha_start])
+        replay.shot_alpha.frombytes(body[alpha_start:])
+        return replay
+
+    def save(self, directory: str = REPLAY_DIR) -> str:
+        """
+        Write the replay to a new file in the directory and return its path.
+        """
+        os.makedirs(directory, exist_ok=True)
+        name = f"{self.mode}_{time.strftime('%Y%m%d_%H%M%S')}_{self.final_score}_{self.seed:x}"
+        path = os.path.join(directory, name + REPLAY_EXTENSION)
+        with open(path, "wb") as file:
+            file.write(self.to_bytes())
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> "Replay":
+        """
+        Read a replay from a file.
+        """
+        with open(path, "rb") as file:
+            return cls.from_bytes(file.read())
+
+
+def main(argv: list[str]) -> int:
+    """
+    Verify replays by fast-forwarding them, or play one back on screen.
+    """
+    if len(argv) < 2 or argv[0] not in ("verify", "play"):
+        print("Usage: python -m src.replay verify <file> [<file> ...] | play <file>")
+        return 2
+    if argv[0] == "verify":
+        # Fast-forward needs neither a window nor sound
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    import pygame
+    from src.gameplay import Gameplay
+    pygame.init()
+    game = Gameplay()
+
+    if argv[0] == "play":
+        replay = Replay.load(argv[1])
+        score = game.play_replay(replay, fast_forward=False)
+        print(f"{argv[1]}: recorded {replay.final_score}, replayed {score}")
+        return 0 if score == replay.final_score else 1
+
+    failures = 0
+    for path in argv[1:]:
+        replay = Replay.load(path)
+        start = time.perf_counter()
+        score = game.play_replay(replay)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        status = "OK" if score == replay.final_score else "MISMATCH"
+        failures += status != "OK"
+        print(f"{path}: {status} recorded {replay.final_score}, replayed {score} "
+              f"({replay.steps} steps in {elapsed_ms:.1f} ms)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,398 @@
+"""
+This module provides the ResultsList class, a virtualized list of leaderboard
+scores for the Top Results screen. Only the rows that are visible, plus a few
+rows of overscan on each side, are fetched from the score source and drawn, so
+drawing the list costs the same whether a mode has 10 scores or 100,000. The
+source is the local ScoreStore, or a LeaderboardSource that pages through the
+shared leaderboard.
+"""
+import time
+from collections.abc import Callable
+from typing import Any, Protocol
+import pygame
+from src.leaderboard import (CACHE_TTL, LeaderboardClient, MAX_RETRY_DELAY, MODES, PAGE_ROWS,
+                             RETRY_DELAY)
+from src.text_cache import get_text_cache
+
+ROW_HEIGHT = 30             # Height of a row in pixels
+OVERSCAN = 10               # Rows fetched above and below the visible ones
+WHEEL_ROWS = 3              # Rows scrolled per mouse wheel step
+SCROLLBAR_WIDTH = 8
+MIN_THUMB_HEIGHT = 20
+RANK_WIDTH = 110            # Width of the rank column in pixels
+SCORE_RIGHT_MARGIN = 24     # Space between the score column and the scrollbar
+RESULTS_UPDATED = pygame.event.custom_type()  # Posted when a source received new rows
+
+
+class ScoreSource(Protocol):
+    """
+    The part of the ScoreStore interface the list uses.
+    """
+    def count(self, mode: str) -> int:
+        """
+        Return the number of scores in a mode.
+        """
+
+    def rows(self, mode: str, start: int, count: int) -> list[tuple[int, str, int]]:
+        """
+        Return the (position, name, score) of count scores starting at position start.
+        """
+
+    def last_position(self, mode: str) -> int | None:
+        """
+        Return the position of the score saved last on this machine, if any.
+        """
+
+
+class LeaderboardSource:
+    """
+    This class serves the list from the leaderboard server. It is responsible for:
+      - Fetching the ranking a page at a time in the background and caching the pages;
+        pages older than the TTL are shown until they were fetched again.
+      - Starting from the first pages the client keeps warm, so a mode it knows
+        shows the server's ranking right away.
+      - Showing the fallback source (the scores saved on this machine) for a mode
+        until the server answered for it, or if it cannot be reached.
+      - Fetching the position of the score this machine submitted last.
+      - Sending failed requests again after a delay that doubles with every failure.
+    The game thread never waits: on_update is called from the client thread
+    whenever an answer arrives, and when a failed request may be sent again.
+    """
+    def __init__(self, client: LeaderboardClient, fallback: ScoreSource,
+                 on_update: Callable[[], object], page_rows: int = PAGE_ROWS,
+                 ttl: float = CACHE_TTL) -> None:
+        """
+        Initialize the source and fetch the first page of every mode the client
+        has no fresh copy of.
+        """
+        self.client = client
+        self.fallback = fallback
+        self.on_update = on_update
+        self.page_rows = page_rows
+        self.ttl = ttl
+        self.counts: dict[str, int] = {}
+        self.pages: dict[tuple[str, int], list[tuple[int, str, int]]] = {}
+        self.fetched: dict[tuple[str, int], float] = {}  # When every page was received
+        # Position of a submission and when it was received
+        self.positions: dict[tuple[str, str], tuple[float, int]] = {}
+        # Requests waiting for an answer, and when failed ones may be sent again
+        self.requested: set[tuple[str, str, int | str]] = set()
+        self.retry_at: dict[tuple[str, str, int | str], float] = {}
+        self.retry_delays: dict[tuple[str, str, int | str], float] = {}
+        for mode in MODES:
+            self.page(mode, 0)
+
+    def stale(self, fetched: float | None) -> bool:
+        """
+        Return whether data received at the given time has to be fetched again.
+        """
+        return fetched is None or time.monotonic() - fetched > self.ttl
+
+    def adopt_first_page(self, mode: str) -> None:
+        """
+        Take the first page of a mode from the client's cache if it is newer than
+        ours. The other pages of the mode are then out of date.
+        """
+        entry = self.client.first_page(mode)
+        if entry is None:
+            return
+        fetched, rows, count = entry
+        if fetched <= self.fetched.get((mode, 0), float("-inf")):
+            return
+        if len(rows) < min(self.page_rows, count):
+            return
+        for key in list(self.fetched):
+            if key[0] == mode:
+                self.fetched[key] = float("-inf")
+        self.pages[(mode, 0)] = rows[:self.page_rows]
+        self.fetched[(mode, 0)] = fetched
+        self.counts[mode] = count
+
+    def page(self, mode: str, page: int) -> list[tuple[int, str, int]] | None:
+        """
+        Return a cached page of a mode, or None. A missing or stale page is
+        requested in the background.
+        """
+        if page == 0:
+            self.adopt_first_page(mode)
+        if self.stale(self.fetched.get((mode, page))):
+            self.fetch_page(mode, page)
+        return self.pages.get((mode, page))
+
+    def count(self, mode: str) -> int:
+        """
+        Return the number of scores in a mode.
+        """
+        self.page(mode, 0)
+        if mode not in self.counts:
+            return self.fallback.count(mode)
+        return self.counts[mode]
+
+    def rows(self, mode: str, start: int, count: int) -> list[tuple[int, str, int]]:
+        """
+        Return the cached rows from position start on, fetching the first missing
+        page; the rows stop before it until it arrives.
+        """
+        self.page(mode, 0)
+        if mode not in self.counts:
+            return self.fallback.rows(mode, start, count)
+        rows: list[tuple[int, str, int]] = []
+        end = min(start + count, self.counts[mode])
+        for page in range(start // self.page_rows, -(-end // self.page_rows)):
+            cached = self.page(mode, page)
+            if cached is None:
+                break
+            rows.extend(row for row in cached if start <= row[0] < end)
+        return rows
+
+    def last_position(self, mode: str) -> int | None:
+        """
+        Return the position of the score submitted last from this machine, once known.
+        """
+        if mode not in self.counts:
+            return self.fallback.last_position(mode)
+        submission_id = self.client.last_submitted.get(mode)
+        if submission_id is None:
+            return None
+        entry = self.positions.get((mode, submission_id))
+        if entry is None or self.stale(entry[0]):
+            self.fetch_position(mode, submission_id)
+        return entry[1] if entry is not None else None
+
+    def start_request(self, key: tuple[str, str, int | str]) -> bool:
+        """
+        Return whether a request should be sent now, i.e. it is not waiting for
+        an answer and not waiting to be sent again after a failure.
+        """
+        if key in self.requested or time.monotonic() < self.retry_at.get(key, 0.0):
+            return False
+        self.requested.add(key)
+        return True
+
+    def finish_request(self, key: tuple[str, str, int | str], failed: bool = False) -> None:
+        """
+        Forget a request that was answered. A failed one may be sent again after
+        the retry delay; on_update is called then, so the list asks again.
+        """
+        self.requested.discard(key)
+        if not failed:
+            self.retry_at.pop(key, None)
+            self.retry_delays.pop(key, None)
+            return
+        delay = min(self.retry_delays.get(key, RETRY_DELAY / 2) * 2, MAX_RETRY_DELAY)
+        self.retry_delays[key] = delay
+        self.retry_at[key] = time.monotonic() + delay
+        self.client.call_later(delay, self.on_update)
+
+    def fetch_page(self, mode: str, page: int) -> None:
+        """
+        Request a page of a mode, unless it is on its way.
+        """
+        key = ("rows", mode, page)
+        if not self.start_request(key):
+            return
+
+        def received(response: dict[str, Any] | None) -> None:
+            self.finish_request(key, failed=response is None)
+            if response is None:
+                return
+            self.pages[(mode, page)] = [(position, name, score)
+                                        for position, name, score in response["rows"]]
+            self.fetched[(mode, page)] = time.monotonic()
+            self.counts[mode] = response["count"]
+            self.on_update()
+        self.client.fetch({"op": "rows", "mode": mode, "start": page * self.page_rows,
+                           "count": self.page_rows}, received)
+
+    def fetch_position(self, mode: str, submission_id: str) -> None:
+        """
+        Request the position of a submission, unless it is on its way. A
+        submission still waiting in the outbox has no position yet, so it is
+        requested again next time.
+        """
+        key = ("position", mode, submission_id)
+        if not self.start_request(key):
+            return
+
+        def received(response: dict[str, Any] | None) -> None:
+            self.finish_request(key, failed=response is None)
+            if response is None or response["position"] is None:
+                return
+            self.positions[(mode, submission_id)] = (time.monotonic(), response["position"])
+            self.on_update()
+        self.client.fetch({"op": "position", "mode": mode, "id": submission_id}, received)
+
+
+leaderboard_source: LeaderboardSource | None = None
+
+
+def get_leaderboard_source(client: LeaderboardClient, fallback: ScoreSource,
+                           on_update: Callable[[], object]) -> LeaderboardSource:
+    """
+    Return the source of the shared leaderboard. It is kept across visits of the
+    results screen, so its pages stay cached.
+    """
+    global leaderboard_source
+    if leaderboard_source is None or leaderboard_source.client is not client:
+        leaderboard_source = LeaderboardSource(client, fallback, on_update)
+    return leaderboard_source
+
+
+class ResultsList:
+    """
+    This class shows the scores of one mode as a scrollable list. It is responsible for:
+      - Fetching only the visible rows plus OVERSCAN rows around them, and fetching
+        again only when scrolling leaves the fetched window.
+      - Scrolling with the mouse wheel and the arrow, page, Home and End keys.
+      - Switching between modes and jumping to the score saved last.
+      - Drawing the visible rows, the highlighted row and a scrollbar.
+    """
+    def __init__(self, rect: pygame.Rect, font: pygame.font.Font, source: ScoreSource,
+                 mode: str = "standard", row_height: int = ROW_HEIGHT,
+                 overscan: int = OVERSCAN) -> None:
+        """
+        Initialize the list in the given area of the screen.
+        """
+        self.rect = pygame.Rect(rect)
+        self.font = font
+        self.source = source
+        self.row_height = row_height
+        self.overscan = overscan
+        self.fetches = 0
+        self.mode = mode
+        self.total = 0
+        self.scroll = 0
+        self.highlighted: int | None = None
+        self.jump_requested = False
+        self.window_start = 0
+        self.window: list[tuple[int, str, int]] = []
+        self.set_mode(mode)
+
+    def set_mode(self, mode: str) -> None:
+        """
+        Show the scores of another mode from the top.
+        """
+        self.mode = mode
+        self.total = self.source.count(mode)
+        self.scroll = 0
+        self.highlighted = None
+        self.jump_requested = False
+        self.window_start = 0
+        self.window = []
+
+    def refresh(self) -> None:
+        """
+        Read the number of scores again and drop the fetched rows, keeping the
+        scroll position; called when the source received new data. A jump that
+        waited for the position of the score is done now.
+        """
+        self.total = self.source.count(self.mode)
+        self.window_start = 0
+        self.window = []
+        self.scroll_to(self.scroll)
+        if self.jump_requested:
+            self.jump_to_last_saved()
+
+    def max_scroll(self) -> int:
+        """
+        Return the largest scroll offset in pixels.
+        """
+        return max(0, self.total * self.row_height - self.rect.height)
+
+    def scroll_to(self, offset: int) -> None:
+        """
+        Scroll to the given offset in pixels, within bounds.
+        """
+        self.scroll = max(0, min(offset, self.max_scroll()))
+
+    def visible_range(self) -> tuple[int, int]:
+        """
+        Return the positions of the first visible row and the one after the last.
+        """
+        first = self.scroll // self.row_height
+        last = -(-(self.scroll + self.rect.height) // self.row_height)
+        return first, min(last, self.total)
+
+    def visible_rows(self) -> list[tuple[int, str, int]]:
+        """
+        Return the visible rows, fetching a new window around them if needed.
+        """
+        first, last = self.visible_range()
+        window_end = self.window_start + len(self.window)
+        if first < self.window_start or (last > window_end and window_end < self.total):
+            self.window_start = max(0, first - self.overscan)
+            count = last - self.window_start + self.overscan
+            self.window = self.source.rows(self.mode, self.window_start, count)
+            self.fetches += 1
+        return self.window[first - self.window_start:last - self.window_start]
+
+    def jump_to_last_saved(self) -> bool:
+        """
+        Scroll to the score saved last in the current mode and highlight it.
+        Return whether there is such a score. If the source does not know its
+        position yet, the jump is done by the next refresh() that knows it.
+        """
+        position = self.source.last_position(self.mode)
+        self.jump_requested = position is None
+        if position is None:
+            return False
+        self.highlighted = position
+        self.scroll_to(position * self.row_height - (self.rect.height - self.row_height) // 2)
+        return True
+
+    def handle_event(self, event: pygame.event.Event) -> bool:
+        """
+        Scroll on wheel and key events. Return whether the list has to be redrawn.
+        """
+        previous = self.scroll
+        page = self.rect.height - self.row_height
+        if event.type == pygame.MOUSEWHEEL:
+            self.scroll_to(self.scroll - event.y * WHEEL_ROWS * self.row_height)
+        elif event.type == pygame.KEYDOWN:
+            steps = {pygame.K_UP: -self.row_height, pygame.K_DOWN: self.row_height,
+                     pygame.K_PAGEUP: -page, pygame.K_PAGEDOWN: page}
+            if event.key in steps:
+                self.scroll_to(self.scroll + steps[event.key])
+            elif event.key == pygame.K_HOME:
+                self.scroll_to(0)
+            elif event.key == pygame.K_END:
+                self.scroll_to(self.max_scroll())
+        return self.scroll != previous
+
+    def draw(self, screen: pygame.Surface) -> None:
+        """
+        Draw the visible rows and the scrollbar.
+        """
+        text_cache = get_text_cache()
+        pygame.draw.rect(screen, pygame.Color("black"), self.rect)
+        if self.total == 0:
+            text = text_cache.render(self.font, "No results yet", "gray")
+            screen.blit(text, text.get_rect(center=self.rect.center))
+            return
+
+        previous_clip = screen.get_clip()
+        screen.set_clip(self.rect)
+        score_right = self.rect.right - SCORE_RIGHT_MARGIN
+        for position, name, score in self.visible_rows():
+            y = self.rect.y + position * self.row_height - self.scroll
+            if position == self.highlighted:
+                pygame.draw.rect(screen, pygame.Color("steelblue"),
+                                 (self.rect.x, y, self.rect.width, self.row_height))
+            screen.blit(text_cache.render(self.font, f"{position + 1}.", "white"),
+                        (self.rect.x, y))
+            screen.blit(text_cache.render(self.font, name, "white"),
+                        (self.rect.x + RANK_WIDTH, y))
+            score_text = text_cache.render(self.font, str(score), "white")
+            screen.blit(score_text, score_text.get_rect(topright=(score_right, y)))
+        screen.set_clip(previous_clip)
+
+        content_height = self.total * self.row_height
+        if content_height > self.rect.height:
+            track = pygame.Rect(self.rect.right - SCROLLBAR_WIDTH, self.rect.y,
+                                SCROLLBAR_WIDTH, self.rect.height)
+            thumb_height = max(MIN_THUMB_HEIGHT,
+                               track.height * self.rect.height // content_height)
+            thumb_y = track.y + (track.height - thumb_height) * self.scroll // self.max_scroll()
+            pygame.draw.rect(screen, pygame.Color("gray20"), track)
+            pygame.draw.rect(screen, pygame.Color("gray70"),
+                             (track.x, thumb_y, SCROLLBAR_WIDTH, thumb_height))
@@ -0,0 +1,275 @@
+"""
+This module provides the ScoreStore class, which keeps the high scores of both
+game modes in an SQLite database. Every score is inserted in its own transaction,
+so two kiosks saving at once or a crash in the middle of a save never lose
+scores. Scores are indexed by (mode, score) for the top-K queries, and a count
+per distinct score keeps "rank of this score" fast with millions of rows. The
+old standard_results.txt and time_results.txt files are imported once.
+"""
+import os
+import sqlite3
+import time
+
+SCORES_DB = "scores.db"     # Next to the old results files
+LEGACY_FILES = {"standard": "standard_results.txt", "time": "time_results.txt"}
+TOP_RESULTS = 10            # Scores shown on the results screen
+BUSY_TIMEOUT = 10.0         # Seconds to wait for another process's write to finish
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    mode TEXT NOT NULL,
+    name TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_by_mode_score ON scores (mode, score);
+CREATE TABLE IF NOT EXISTS score_counts (
+    mode TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (mode, score)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS submissions (
+    id TEXT PRIMARY KEY,
+    score_id INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS imports (
+    path TEXT PRIMARY KEY,
+    imported REAL NOT NULL
+);
+"""
+
+
+def parse_results(path: str) -> list[tuple[str, int]]:
+    """
+    Return the (name, score) lines of an old results file, skipping broken lines.
+    """
+    results = []
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            name, _, score = line.strip().rpartition(",")
+            try:
+                results.append((name, int(score)))
+            except ValueError:
+                continue
+    return results
+
+
+class ScoreStore:
+    """
+    This class stores the scores of every game. It is responsible for:
+      - Inserting scores atomically, safe against concurrent writers and crashes.
+      - Inserting batches of submissions from the leaderboard service exactly once.
+      - Returning the top scores of a mode, best first and oldest first on ties,
+        and any page of that ranking.
+      - Returning the rank a score has (or would have) within its mode.
+      - Importing the old results files once.
+    """
+    def __init__(self, path: str = SCORES_DB) -> None:
+        """
+        Open (or create) the database at the given path.
+        """
+        self.path = path
+        # Transactions are started explicitly, so autocommit mode is used otherwise.
+        # The leaderboard server uses the store from a worker thread; callers
+        # must not use one store from two threads at once.
+        self.connection = sqlite3.connect(path, timeout=BUSY_TIMEOUT, isolation_level=None,
+                                          check_same_thread=False)
+        if path != ":memory:":
+            # Readers do not block the writer, and a commit only waits for the log
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.last_saved: dict[str, int] = {}  # Row id of the last score saved per mode
+
+    def insert(self, mode: str, name: str, score: int) -> int:
+        """
+        Insert a score without starting a transaction and return its row id.
+        """
+        cursor = self.connection.execute(
+            "INSERT INTO scores (mode, name, score, created) VALUES (?, ?, ?, ?)",
+            (mode, name, score, time.time()))
+        self.connection.execute(
+            "INSERT INTO score_counts (mode, score, count) VALUES (?, ?, 1) "
+            "ON CONFLICT (mode, score) DO UPDATE SET count = count + 1",
+            (mode, score))
+        assert cursor.lastrowid is not None
+        return cursor.lastrowid
+
+    def add(self, mode: str, name: str, score: int) -> int:
+        """
+        Save a score and return its rank (1 is the best). The row of the score is
+        remembered as the last one saved in its mode.
+        """
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            self.last_saved[mode] = self.insert(mode, name, score)
+            rank = self.rank(mode, score)
+            self.connection.execute("COMMIT")
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+        return rank
+
+    def add_many(self, submissions: list[tuple[str, str, str, int]]) -> list[int]:
+        """
+        Save a batch of (id, mode, name, score) submissions in one transaction and
+        return their ranks. A submission whose id was saved before is not saved
+        again, so a client can safely resend a batch it got no answer for.
+        """
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            for submission_id, mode, name, score in submissions:
+                saved = self.connection.execute(
+                    "SELECT 1 FROM submissions WHERE id = ?", (submission_id,)).fetchone()
+                if saved is None:
+                    self.connection.execute(
+                        "INSERT INTO submissions (id, score_id) VALUES (?, ?)",
+                        (submission_id, self.insert(mode, name, score)))
+            ranks = [self.rank(mode, score) for _, mode, _, score in submissions]
+            self.connection.execute("COMMIT")
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+        return ranks
+
+    def top(self, mode: str, limit: int = TOP_RESULTS) -> list[tuple[str, int]]:
+        """
+        Return the (name, score) of the best scores of a mode. Equal scores are
+        listed in the order they were saved.
+        """
+        rows = self.connection.execute(
+            "SELECT name, score FROM scores WHERE mode = ? "
+            "ORDER BY score DESC, id LIMIT ?", (mode, limit))
+        return [(name, score) for name, score in rows]
+
+    def rows(self, mode: str, start: int, count: int) -> list[tuple[int, str, int]]:
+        """
+        Return the (position, name, score) of count scores of a mode, starting at
+        the zero-based position start of the ranking. The score at start is found
+        from the counts per distinct score, and the rows from there with the index,
+        so the cost does not grow with start.
+        """
+        if count <= 0 or start < 0:
+            return []
+        bucket = self.connection.execute(
+            "SELECT score, total - count FROM (SELECT score, count, SUM(count) OVER "
+            "(ORDER BY score DESC) AS total FROM score_counts WHERE mode = ?) "
+            "WHERE total > ? LIMIT 1", (mode, start)).fetchone()
+        if bucket is None:
+            return []
+        score, before = bucket
+        (first_id,) = self.connection.execute(
+            "SELECT id FROM scores WHERE mode = ? AND score = ? ORDER BY id LIMIT 1 OFFSET ?",
+            (mode, score, start - before)).fetchone()
+        rows = self.connection.execute(
+            "SELECT name, score FROM scores WHERE mode = ? AND score <= ? "
+            "AND (score < ? OR id >= ?) ORDER BY score DESC, id LIMIT ?",
+            (mode, score, score, first_id, count))
+        return [(start + index, name, score) for index, (name, score) in enumerate(rows)]
+
+    def position(self, mode: str, row_id: int) -> int | None:
+        """
+        Return the zero-based position of a saved score in the ranking of its mode,
+        or None if there is no such score.
+        """
+        row = self.connection.execute("SELECT score FROM scores WHERE id = ? AND mode = ?",
+                                      (row_id, mode)).fetchone()
+        if row is None:
+            return None
+        (ties,) = self.connection.execute(
+            "SELECT COUNT(*) FROM scores WHERE mode = ? AND score = ? AND id < ?",
+            (mode, row[0], row_id)).fetchone()
+        return self.rank(mode, row[0]) - 1 + ties
+
+    def submission_position(self, mode: str, submission_id: str) -> int | None:
+        """
+        Return the position of the score saved by a leaderboard submission, or
+        None if it was not saved (yet).
+        """
+        row = self.connection.execute("SELECT score_id FROM submissions WHERE id = ?",
+                                      (submission_id,)).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return self.position(mode, row[0])
+
+    def last_position(self, mode: str) -> int | None:
+        """
+        Return the position of the score saved last in a mode by this store, if any.
+        """
+        row_id = self.last_saved.get(mode)
+        return self.position(mode, row_id) if row_id is not None else None
+
+    def rank(self, mode: str, score: int) -> int:
+        """
+        Return the rank of a score within its mode: one more than the number of
+        better scores. Counting by distinct score keeps this fast for any number of rows.
+        """
+        (better,) = self.connection.execute(
+            "SELECT COALESCE(SUM(count), 0) FROM score_counts WHERE mode = ? AND score > ?",
+            (mode, score)).fetchone()
+        return better + 1
+
+    def count(self, mode: str) -> int:
+        """
+        Return the number of scores saved in a mode.
+        """
+        (count,) = self.connection.execute(
+            "SELECT COALESCE(SUM(count), 0) FROM score_counts WHERE mode = ?", (mode,)).fetchone()
+        return count
+
+    def import_results(self, mode: str, path: str) -> int:
+        """
+        Import an old results file into a mode, unless it was imported before, and
+        return the number of scores imported. The import is one transaction.
+        """
+        if not os.path.exists(path):
+            return 0
+        key = os.path.abspath(path)
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            if self.connection.execute("SELECT 1 FROM imports WHERE path = ?",
+                                       (key,)).fetchone() is not None:
+                self.connection.execute("ROLLBACK")
+                return 0
+            results = parse_results(path)
+            for name, score in results:
+                self.insert(mode, name, score)
+            self.connection.execute("INSERT INTO imports (path, imported) VALUES (?, ?)",
+                                    (key, time.time()))
+            self.connection.execute("COMMIT")
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+        return len(results)
+
+    def import_legacy(self, files: dict[str, str] = LEGACY_FILES) -> None:
+        """
+        Import the old results file of every mode once.
+        """
+        for mode, path in files.items():
+            imported = self.import_results(mode, path)
+            if imported:
+                print(f"Imported {imported} {mode} scores from {path} into {self.path}")
+
+    def close(self) -> None:
+        """
+        Close the database.
+        """
+        self.connection.close()
+
+
+score_store: ScoreStore | None = None
+
+
+def get_score_store() -> ScoreStore:
+    """
+    Return the process-wide score store, opening it and importing the old
+    results files on first use.
+    """
+    global score_store
+    if score_store is None:
+        score_store = ScoreStore()
+        score_store.import_legacy()
+    return score_store
@@ -1,26 +1,46 @@
 """
 This module initializes the game environment for the DuckHunt game.
 """
+import os
+import random
 import pygame
-from src.duck import Duck
-from src.music import Music
+from src.assets import BackgroundCache, get_registry
+from src.audio import get_audio_bank
+from src.core import Clock
+from src.display import create_screen
+from src.duck import Duck, ASSETS_DIR, SHOT_IMAGES
+from src.loader import AssetLoader, LoadingScreen
+from src.music import Music, SOUND_FILES
+from src.startup import get_timeline
+from src.text_cache import get_font
+
+SCOPE_IMAGE = "assets/scope.png"
+DUCK_SPRITES = {
+    "normal": "assets/final_normal_duck.png",
+    "red": "assets/final_red_duck.png",
+    "special": "assets/final_special_duck.png"
+}
 
 class Setup:
     """
     This class creates the main display window, loads and cycles through background images,
     initializes fonts and scope images, and instantiates game objects like ducks and
     the music manager. The class provides several getter methods to retrieve these assets
-    for use by other parts of the game.
+    for use by other parts of the game. Only the window and the first background are
+    created before the title screen; load_game() loads the rest when a game starts.
 """
-    def __init__(self) -> None:
+    def __init__(self, backend: str = "software") -> None:
         """
-        Initialize Pygame, create the window, and load assets.
+        Initialize Pygame, create the window with the given rendering backend (see
+        src.display) and load the background the title screen shows.
         """
+        timeline = get_timeline()
         self.screen_width = 800
         self.screen_height = 600
 
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
-        pygame.display.set_caption("Duck Hunt")
+        with timeline.span("create display"):
+            self.screen = create_screen((self.screen_width, self.screen_height), "Duck Hunt",
+                                        backend)
 
         # Load backgrounds
         self.backgrounds = [
@@ -29,21 +49,65 @@ class Setup:
             "assets/field.png"
         ]
         self.current_background_index = 0
-        self.background = pygame.image.load(self.backgrounds[self.current_background_index]).convert()
+        self.assets = get_registry()
+        self.background_cache = BackgroundCache(
+            self.backgrounds, (self.screen_width, self.screen_height)
+        )
+        with timeline.span("load first background"):
+            self.background = self.background_cache.get(self.current_background_index)
+        self.game_loaded = False
+
+    def load_game(self, get_ticks: Clock | None = None,
+                  rng: random.Random | None = None) -> None:
+        """
+        Load what a game needs, once: the other backgrounds, the scope and duck
+        images, the font, the mixer and the ducks, which share the given clock and
+        random generator. The images are decoded in parallel while a loading screen
+        is shown; the sound effects keep decoding in the background and are only
+        waited for when first played.
+        """
+        if self.game_loaded:
+            return
+        self.game_loaded = True
+        timeline = get_timeline()
+
+        backgrounds = [path for path in self.backgrounds
+                       if path not in self.background_cache.surfaces]
+        images = [SCOPE_IMAGE, *DUCK_SPRITES.values(),
+                  *(os.path.join(ASSETS_DIR, name) for name in SHOT_IMAGES.values())]
+        loader = AssetLoader()
+        for path in backgrounds + images:
+            loader.submit(path, pygame.image.load, path)
+
+        with timeline.span("load font"):
+            self.font = get_font("Arial Black", 30)
+
+        # Sounds can only be decoded once the mixer is initialized
+        with timeline.span("initialize mixer"):
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+        get_audio_bank().prefetch(SOUND_FILES)
+
+        with timeline.span("wait for images"):
+            decoded = loader.wait(LoadingScreen(self.screen, self.font).draw)
 
-        pygame.font.init()
-        self.font = pygame.font.SysFont("Arial Black", 30)
+        # Converting for the display has to happen on the main thread
+        with timeline.span("convert images"):
+            for path in backgrounds:
+                self.background_cache.add(path, decoded[path])
+            for path in images:
+                self.assets.add_image(path, decoded[path])
 
-        self.scope = pygame.image.load("assets/scope.png").convert_alpha()
-        self.smaller_scope = pygame.transform.scale(self.scope, (40, 40))
+            self.scope = self.assets.load_image(SCOPE_IMAGE)
+            self.smaller_scope = pygame.transform.scale(self.scope, (40, 40))
 
         self.music_manager = Music()
 
-        self.ducks = [
-            Duck(self.screen_width, 360, "assets/final_normal_duck.png", "normal"),
-            Duck(self.screen_width, 360, "assets/final_red_duck.png", "red"),
-            Duck(self.screen_width, 360, "assets/final_special_duck.png", "special")
-        ]
+        with timeline.span("create ducks"):
+            self.ducks = [
+                Duck(self.screen_width, 360, path, duck_type, get_ticks, rng)
+                for duck_type, path in DUCK_SPRITES.items()
+            ]
 
     def get_screen(self) -> pygame.Surface:
         """
@@ -57,14 +121,19 @@ class Setup:
         """
         return self.background
 
-    def change_background(self) -> str:
+    def change_background(self) -> pygame.Surface:
+        """
+        Cycle through the backgrounds and return the new one.
         """
-        Cycle through the backgrounds and return the new path.
+        return self.set_background(self.current_background_index + 1)
+
+    def set_background(self, index: int) -> pygame.Surface:
         """
-        self.current_background_index = (self.current_background_index + 1) % len(self.backgrounds)
-        new_background_path = self.backgrounds[self.current_background_index]
-        self.background = pygame.image.load(new_background_path).convert()
-        return new_background_path
+        Select the background with the given index and return it.
+        """
+        self.current_background_index = index % len(self.backgrounds)
+        self.background = self.background_cache.get(self.current_background_index)
+        return self.background
 
     def get_font(self) -> pygame.font.Font:
         """
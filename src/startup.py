@@ -0,0 +1,90 @@
+"""
+This module records the startup timeline of the game: imports, display creation,
+every asset load and the first frame presented. Recording is cheap and always on;
+python main.py --startup-report prints the timeline once the title screen is shown.
+"""
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+PROCESS_START = time.perf_counter()  # As close to the start as the first import gets
+
+
+class StartupTimeline:
+    """
+    This class collects the events of the startup. It is responsible for:
+      - Recording instant marks and timed spans relative to the start of the process.
+      - Accepting spans from loader threads, labelled with the thread they ran on.
+      - Printing the timeline once the first frame was presented, if requested.
+    """
+    def __init__(self, start: float = PROCESS_START) -> None:
+        """
+        Initialize an empty timeline starting at the given perf_counter() time.
+        """
+        self.start = start
+        self.events: list[tuple[float, float, str, str]] = []
+        self.lock = threading.Lock()
+        self.report_requested = False
+        self.finished = False
+
+    def record(self, label: str, begin: float, end: float) -> None:
+        """
+        Record an event that ran from begin to end (perf_counter() times).
+        """
+        with self.lock:
+            self.events.append((begin, end, label, threading.current_thread().name))
+
+    def mark(self, label: str) -> None:
+        """
+        Record an instant event.
+        """
+        now = time.perf_counter()
+        self.record(label, now, now)
+
+    @contextmanager
+    def span(self, label: str) -> Iterator[None]:
+        """
+        Record the time taken by the body of a with statement.
+        """
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(label, begin, time.perf_counter())
+
+    def finish(self, label: str) -> None:
+        """
+        Mark the end of the startup (the first time only) and print the timeline
+        if a report was requested.
+        """
+        if self.finished:
+            return
+        self.finished = True
+        self.mark(label)
+        if self.report_requested:
+            print(self.report())
+
+    def report(self) -> str:
+        """
+        Return the timeline as text, one event per line in order of their start.
+        """
+        lines = ["Startup timeline (ms since process start):"]
+        with self.lock:
+            events = sorted(self.events)
+        for begin, end, label, thread in events:
+            offset = (begin - self.start) * 1000
+            duration = f"{(end - begin) * 1000:8.1f} ms" if end > begin else " " * 11
+            where = "" if thread == "MainThread" else f"  [{thread}]"
+            lines.append(f"{offset:9.1f}  {duration}  {label}{where}")
+        return "\n".join(lines)
+
+
+timeline = StartupTimeline()
+
+
+def get_timeline() -> StartupTimeline:
+    """
+    Return the process-wide startup timeline.
+    """
+    return timeline
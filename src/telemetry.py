@@ -0,0 +1,378 @@
+"""
+This module records every shot of the game for later analysis. A shot is
+written into a preallocated ring of NumPy columns, which the game thread only
+fills; a background thread copies the new rows out and appends them to a
+binary columnar file, so the frame loop never waits for the disk. Shot files
+are a MAGIC header followed by chunks: a row count and then every column of
+those rows, each padded to 8 bytes. The analysis memory-maps the files and
+works chunk by chunk, so millions of shots are never loaded at once.
+
+Run it with: python -m src.telemetry analyze <file or directory> [...] [--heatmap PNG]
+"""
+import argparse
+import glob
+import os
+import struct
+import sys
+import threading
+import time
+from collections.abc import Iterator
+import numpy as np
+import pygame
+from src.core import DUCK_TYPES
+
+TELEMETRY_DIR = "telemetry"
+TELEMETRY_EXTENSION = ".dhs"
+MAGIC = b"DHS1"
+HEADER = struct.Struct("<4sI")  # magic, column count
+CHUNK = struct.Struct("<Q")     # rows in the chunk
+ALIGNMENT = 8                   # Every column starts on a multiple of this
+RING_CAPACITY = 4096            # Shots buffered before new ones are dropped
+FLUSH_ROWS = 256                # Buffered shots that wake the writer early
+FLUSH_INTERVAL = 1.0            # Seconds between writes otherwise
+MODES = ["standard", "time"]
+DUCK_TYPE_CODES = {duck_type: code for code, duck_type in enumerate(DUCK_TYPES)}
+NO_DUCK = 255                   # duck_type of a miss while no duck was on screen
+SCREEN_SIZE = (800, 600)        # Area the heatmap covers
+HEATMAP_CELL = 20               # Heatmap cell size in pixels
+REACTION_BIN_MS = 50            # Width of a reaction-time histogram bin
+REACTION_MAX_MS = 10000         # Slower reactions go into the last bin
+REPORT_BIN_MS = 250             # Width of a bin in the printed histogram
+
+# Columns in file order. Times are in milliseconds; -1 means "not in this mode".
+COLUMNS: list[tuple[str, np.dtype]] = [
+    ("time", np.dtype("<f8")),         # Unix time of the shot in seconds
+    ("x", np.dtype("<i2")),            # Cursor position
+    ("y", np.dtype("<i2")),
+    ("hit", np.dtype("u1")),           # 1 if the shot hit a duck
+    ("duck_type", np.dtype("u1")),     # Index in DUCK_TYPES of the duck hit or on screen, or NO_DUCK
+    ("duck_x", np.dtype("<i2")),       # Centre of that duck, -1 without one
+    ("duck_y", np.dtype("<i2")),
+    ("speed_x", np.dtype("<f4")),      # Its speed in pixels per step
+    ("speed_y", np.dtype("<f4")),
+    ("since_spawn", np.dtype("<u4")),  # Time since that duck appeared: the reaction time
+    ("mode", np.dtype("u1")),          # Index in MODES
+    ("lives", np.dtype("i1")),         # Standard mode, after the shot
+    ("shots_left", np.dtype("i1")),
+    ("time_left", np.dtype("<i2")),    # Whole seconds left in time mode
+]
+
+
+def padded(size: int) -> int:
+    """
+    Return a byte count rounded up to the column alignment.
+    """
+    return -(-size // ALIGNMENT) * ALIGNMENT
+
+
+class ShotRecorder:
+    """
+    This class streams shots to a file without blocking the game. It is responsible for:
+      - Storing shots in a ring of preallocated columns; when the writer falls
+        a whole ring behind, new shots are dropped and counted instead of waiting.
+      - Appending the buffered shots as a chunk from a background thread, every
+        FLUSH_INTERVAL or as soon as FLUSH_ROWS shots are waiting.
+      - Writing the last shots when it is closed.
+    """
+    def __init__(self, path: str, capacity: int = RING_CAPACITY, flush_rows: int = FLUSH_ROWS,
+                 flush_interval: float = FLUSH_INTERVAL) -> None:
+        """
+        Allocate the ring and start the writer thread. The file is created by the
+        writer when the first shots are flushed.
+        """
+        self.path = path
+        self.capacity = capacity
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.columns = [np.zeros(capacity, dtype) for _, dtype in COLUMNS]
+        self.head = 0      # Shots recorded so far
+        self.tail = 0      # Shots handed to the writer so far
+        self.dropped = 0
+        self.written = 0
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.closing = False
+        self.thread = threading.Thread(target=self.run, name="shot-telemetry", daemon=True)
+        self.thread.start()
+
+    def __len__(self) -> int:
+        """
+        Return the number of shots waiting to be written.
+        """
+        return self.head - self.tail
+
+    def record(self, row: tuple) -> bool:
+        """
+        Buffer a shot given as one value per column, in COLUMNS order. Return
+        False if the ring is full and the shot was dropped.
+        """
+        with self.lock:
+            if self.head - self.tail >= self.capacity:
+                self.dropped += 1
+                return False
+            index = self.head % self.capacity
+            for column, value in zip(self.columns, row):
+                column[index] = value
+            self.head += 1
+            waiting = self.head - self.tail
+        if waiting >= self.flush_rows:
+            self.wake.set()
+        return True
+
+    def take(self) -> list[np.ndarray]:
+        """
+        Copy the buffered shots out of the ring and free their slots.
+        """
+        with self.lock:
+            tail, head = self.tail, self.head
+        # The game never overwrites slots between tail and head, so no lock is needed
+        indices = np.arange(tail, head) % self.capacity
+        rows = [column[indices] for column in self.columns]
+        with self.lock:
+            self.tail = head
+        return rows
+
+    def run(self) -> None:
+        """
+        Write the buffered shots until the recorder is closed.
+        """
+        while True:
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            closing = self.closing
+            try:
+                self.flush()
+            except OSError as error:
+                print(f"Shot telemetry could not be written: {error}")
+                return
+            if closing:
+                return
+
+    def flush(self) -> None:
+        """
+        Append the buffered shots to the file as one chunk.
+        """
+        rows = self.take()
+        count = len(rows[0])
+        if count == 0:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "ab") as file:
+            if file.tell() == 0:
+                file.write(HEADER.pack(MAGIC, len(COLUMNS)))
+            file.write(CHUNK.pack(count))
+            for column in rows:
+                data = column.tobytes()
+                file.write(data + bytes(padded(len(data)) - len(data)))
+        self.written += count
+
+    def close(self) -> None:
+        """
+        Write the remaining shots and stop the writer thread.
+        """
+        if self.closing:
+            return
+        self.closing = True
+        self.wake.set()
+        self.thread.join()
+        if self.dropped:
+            print(f"Shot telemetry dropped {self.dropped} shots")
+
+
+def session_path(directory: str = TELEMETRY_DIR) -> str:
+    """
+    Return the path of a new shot file for this run of the game.
+    """
+    name = f"shots_{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+    return os.path.join(directory, name + TELEMETRY_EXTENSION)
+
+
+def read_chunks(path: str) -> Iterator[dict[str, np.ndarray]]:
+    """
+    Yield the chunks of a shot file as columns by name. The columns are views of
+    the memory-mapped file; a chunk cut short by a crash ends the file.
+    """
+    if os.path.getsize(path) < HEADER.size:
+        raise ValueError(f"{path} is not a shot telemetry file")
+    data = np.memmap(path, dtype=np.uint8, mode="r")
+    magic, column_count = HEADER.unpack(bytes(data[:HEADER.size]))
+    if magic != MAGIC or column_count != len(COLUMNS):
+        raise ValueError(f"{path} is not a shot telemetry file")
+    offset = HEADER.size
+    while offset + CHUNK.size <= len(data):
+        (rows,) = CHUNK.unpack(bytes(data[offset:offset + CHUNK.size]))
+        offset += CHUNK.size
+        end = offset + sum(padded(rows * dtype.itemsize) for _, dtype in COLUMNS)
+        if end > len(data):
+            return
+        chunk = {}
+        for name, dtype in COLUMNS:
+            size = rows * dtype.itemsize
+            chunk[name] = data[offset:offset + size].view(dtype)
+            offset += padded(size)
+        yield chunk
+
+
+def shot_files(paths: list[str]) -> list[str]:
+    """
+    Return the shot files among the paths, looking into directories.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "*" + TELEMETRY_EXTENSION))))
+        else:
+            files.append(path)
+    return files
+
+
+class ShotAnalysis:
+    """
+    This class summarizes any number of shots chunk by chunk. It is responsible for:
+      - Counting shots and hits in total, per duck type and per heatmap cell, and
+        the misses while no duck was on screen.
+      - Building a histogram of the reaction times of the hits.
+      - Reporting accuracy and reaction-time percentiles, and saving the heatmap.
+    """
+    def __init__(self, screen_size: tuple[int, int] = SCREEN_SIZE,
+                 cell: int = HEATMAP_CELL) -> None:
+        """
+        Initialize empty counts for a screen of the given size.
+        """
+        self.cell = cell
+        self.grid = (-(-screen_size[1] // cell), -(-screen_size[0] // cell))  # rows, columns
+        self.shots = np.zeros(self.grid, np.int64)
+        self.hits = np.zeros(self.grid, np.int64)
+        self.type_shots = np.zeros(len(DUCK_TYPES), np.int64)
+        self.type_hits = np.zeros(len(DUCK_TYPES), np.int64)
+        self.no_duck_shots = 0
+        self.reactions = np.zeros(REACTION_MAX_MS // REACTION_BIN_MS + 1, np.int64)
+
+    def add(self, chunk: dict[str, np.ndarray]) -> None:
+        """
+        Add the shots of one chunk to the counts.
+        """
+        hit = chunk["hit"].astype(bool)
+        rows = np.clip(chunk["y"] // self.cell, 0, self.grid[0] - 1)
+        columns = np.clip(chunk["x"] // self.cell, 0, self.grid[1] - 1)
+        cells = rows.astype(np.int64) * self.grid[1] + columns
+        size = self.grid[0] * self.grid[1]
+        self.shots += np.bincount(cells, minlength=size).reshape(self.grid)
+        self.hits += np.bincount(cells[hit], minlength=size).reshape(self.grid)
+        known = chunk["duck_type"] < len(DUCK_TYPES)
+        types = chunk["duck_type"][known]
+        self.type_shots += np.bincount(types, minlength=len(DUCK_TYPES))
+        self.type_hits += np.bincount(types[hit[known]], minlength=len(DUCK_TYPES))
+        self.no_duck_shots += int(np.count_nonzero(chunk["duck_type"] == NO_DUCK))
+        bins = np.minimum(chunk["since_spawn"][hit] // REACTION_BIN_MS, len(self.reactions) - 1)
+        self.reactions += np.bincount(bins, minlength=len(self.reactions))
+
+    def add_file(self, path: str) -> None:
+        """
+        Add every shot of a shot file.
+        """
+        for chunk in read_chunks(path):
+            self.add(chunk)
+
+    def total(self) -> tuple[int, int]:
+        """
+        Return the number of shots and hits.
+        """
+        return int(self.shots.sum()), int(self.hits.sum())
+
+    def accuracy_map(self) -> np.ndarray:
+        """
+        Return the share of hits per heatmap cell, NaN where nobody shot.
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.shots > 0, self.hits / self.shots, np.nan)
+
+    def reaction_percentile(self, percent: float) -> float | None:
+        """
+        Return a reaction-time percentile of the hits in milliseconds, to the
+        histogram resolution, or None without hits.
+        """
+        cumulative = np.cumsum(self.reactions)
+        if cumulative[-1] == 0:
+            return None
+        index = int(np.searchsorted(cumulative, cumulative[-1] * percent / 100))
+        return (index + 0.5) * REACTION_BIN_MS
+
+    def report(self) -> list[str]:
+        """
+        Return the summary as lines of text.
+        """
+        shots, hits = self.total()
+        lines = [f"{shots} shots, {hits} hits ({hits / max(shots, 1):.1%} accuracy)"]
+        for duck_type, type_shots, type_hits in zip(DUCK_TYPES, self.type_shots, self.type_hits):
+            lines.append(f"  {duck_type:<8} {type_shots:>10} shots "
+                         f"{type_hits / max(int(type_shots), 1):>7.1%} hit")
+        if self.no_duck_shots:
+            lines.append(f"  {'no duck':<8} {self.no_duck_shots:>10} shots")
+        percentiles = [(percent, self.reaction_percentile(percent)) for percent in (10, 50, 90, 99)]
+        if percentiles[0][1] is not None:
+            lines.append("Reaction time to a hit: " + ", ".join(
+                f"p{percent} {value:.0f} ms" for percent, value in percentiles))
+            factor = REPORT_BIN_MS // REACTION_BIN_MS
+            bins = np.append(self.reactions[:-1].reshape(-1, factor).sum(axis=1),
+                             self.reactions[-1])
+            peak = bins.max()
+            for index in np.flatnonzero(bins):
+                start = index * REPORT_BIN_MS
+                label = f"{start}+ ms" if index == len(bins) - 1 else f"{start} ms"
+                bar = "#" * max(1, int(40 * bins[index] / peak))
+                lines.append(f"  {label:>9} {bins[index]:>10} {bar}")
+        return lines
+
+    def save_heatmap(self, path: str) -> None:
+        """
+        Save the accuracy per cell as an image the size of the screen: red for
+        misses, green for hits, black where nobody shot.
+        """
+        accuracy = self.accuracy_map()
+        shot = ~np.isnan(accuracy)
+        share = np.nan_to_num(accuracy)
+        pixels = np.zeros(self.grid + (3,), np.uint8)
+        pixels[..., 0] = np.where(shot, 255 * (1 - share), 0)
+        pixels[..., 1] = np.where(shot, 255 * share, 0)
+        # Surfaces are indexed by (x, y)
+        surface = pygame.surfarray.make_surface(pixels.transpose(1, 0, 2))
+        size = (self.grid[1] * self.cell, self.grid[0] * self.cell)
+        pygame.image.save(pygame.transform.scale(surface, size), path)
+
+
+def main(argv: list[str]) -> int:
+    """
+    Analyze shot files from the command line.
+    """
+    parser = argparse.ArgumentParser(description="DuckHunt shot telemetry")
+    commands = parser.add_subparsers(dest="command", required=True)
+    analyze_parser = commands.add_parser("analyze", help="summarize accuracy and reaction times")
+    analyze_parser.add_argument("paths", nargs="+", help="shot files or directories of them")
+    analyze_parser.add_argument("--heatmap", metavar="PNG", help="save the accuracy heatmap")
+    analyze_parser.add_argument("--cell", type=int, default=HEATMAP_CELL,
+                                help="heatmap cell size in pixels (default %(default)s)")
+    args = parser.parse_args(argv)
+
+    analysis = ShotAnalysis(cell=args.cell)
+    files = shot_files(args.paths)
+    start = time.perf_counter()
+    for path in files:
+        try:
+            analysis.add_file(path)
+        except ValueError as error:
+            print(error)
+            return 1
+    elapsed = time.perf_counter() - start
+    print(f"Read {len(files)} files in {elapsed:.2f} s")
+    print("\n".join(analysis.report()))
+    if args.heatmap:
+        analysis.save_heatmap(args.heatmap)
+        print(f"Heatmap saved to {args.heatmap}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,97 @@
+"""
+This module provides a process-wide cache of rendered text for the DuckHunt game.
+The HUD, buttons, menus and the game-over screen draw mostly the same strings
+every frame, so each string is rasterized once and the surface is reused until
+it is evicted as least recently used. Fonts are shared the same way: each
+(name, size) is created once, on first use.
+"""
+from collections import OrderedDict
+from typing import Any
+import pygame
+
+MAX_ENTRIES = 256  # Rendered strings kept before the least recently used is dropped
+
+
+class TextCache:
+    """
+    This class caches the surfaces returned by pygame.font.Font.render. It is responsible for:
+      - Rendering each (font, text, colour, antialias) combination once.
+      - Evicting the least recently used surface when it holds max_entries surfaces.
+      - Counting hits and misses, so the hit rate can be checked in profiles.
+    """
+    def __init__(self, max_entries: int = MAX_ENTRIES) -> None:
+        """
+        Initialize an empty cache.
+        """
+        self.max_entries = max_entries
+        self.surfaces: OrderedDict[tuple[Any, ...], pygame.Surface] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """
+        Return the number of cached surfaces.
+        """
+        return len(self.surfaces)
+
+    def render(self, font: pygame.font.Font, text: str, color: pygame.Color | str,
+               antialias: bool = True) -> pygame.Surface:
+        """
+        Return the text rendered with the font, like font.render(text, antialias, color).
+        The returned surface is shared, so it must not be drawn on.
+        """
+        key = (font, text, tuple(pygame.Color(color)), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def hit_rate(self) -> float:
+        """
+        Return the fraction of render calls served from the cache.
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self) -> None:
+        """
+        Drop every cached surface and reset the counters.
+        """
+        self.surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+text_cache = TextCache()
+fonts: dict[tuple[str, int], pygame.font.Font] = {}
+
+
+def get_text_cache() -> TextCache:
+    """
+    Return the process-wide text cache.
+    """
+    return text_cache
+
+
+def get_font(name: str, size: int) -> pygame.font.Font:
+    """
+    Return the shared system font with the given name and size, creating it on
+    first use. Looking up system fonts is slow, so every screen shares them.
+    """
+    font = fonts.get((name, size))
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        if not fonts:
+            # Fonts cannot be used once pygame quits, so forget them then
+            pygame.register_quit(fonts.clear)
+        font = pygame.font.SysFont(name, size)
+        fonts[(name, size)] = font
+    return font
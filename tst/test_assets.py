@@ -0,0 +1,127 @@
+import unittest
+import pygame
+from unittest.mock import patch
+from src.assets import AssetRegistry, BackgroundCache, surface_size
+from src.duck import Duck
+
+def dummy_load(path):
+    """
+    A dummy image loader that returns a 255x90 sheet whose left half is opaque.
+    """
+    surface = pygame.Surface((255, 90), pygame.SRCALPHA)
+    surface.fill((255, 0, 0, 255), pygame.Rect(0, 0, 40, 90))
+    return surface
+
+class AssetRegistryTest(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        pygame.display.set_mode((800, 600))
+        self.patcher = patch("pygame.image.load", side_effect=dummy_load)
+        self.mock_load = self.patcher.start()
+        self.registry = AssetRegistry()
+
+    def tearDown(self):
+        self.patcher.stop()
+        pygame.quit()
+
+    def test_image_decoded_once(self):
+        """
+        Loading the same path twice should decode it once and return the same surface.
+        """
+        first = self.registry.load_image("sheet.png")
+        second = self.registry.load_image("sheet.png")
+        self.assertIs(first, second)
+        self.assertEqual(self.mock_load.call_count, 1)
+
+    def test_frames_are_sliced_and_flipped(self):
+        """
+        The frame set should contain three frames per direction, with the left frames mirrored.
+        """
+        frames = self.registry.load_frames("sheet.png", 85, 90)
+        self.assertEqual(len(frames), 3)
+        self.assertEqual(frames.right[0].get_at((0, 0)).a, 255)
+        self.assertEqual(frames.left[0].get_at((0, 0)).a, 0)
+        self.assertEqual(frames.left[0].get_at((84, 0)).a, 255)
+        self.assertIs(frames, self.registry.load_frames("sheet.png", 85, 90))
+
+    def test_frame_masks(self):
+        """
+        Every frame should have a precomputed mask that follows its opaque pixels.
+        """
+        frames = self.registry.load_frames("sheet.png", 85, 90)
+        self.assertEqual(frames.get_mask(0, True).get_at((0, 0)), 1)
+        self.assertEqual(frames.get_mask(0, False).get_at((0, 0)), 0)
+        self.assertEqual(frames.get_mask(1, True).count(), 0)
+
+    def test_flipped_pair(self):
+        """
+        load_flipped() should return the cached image and its mirrored variant.
+        """
+        right, left = self.registry.load_flipped("shot.png")
+        self.assertIs(right, self.registry.load_image("shot.png"))
+        self.assertEqual(left.get_at((254, 0)).a, 255)
+        self.assertIs(left, self.registry.load_flipped("shot.png")[1])
+
+    def test_memory_usage(self):
+        """
+        The memory report should count the sheet and its mirrored frames.
+        """
+        frames = self.registry.load_frames("sheet.png", 85, 90)
+        usage = self.registry.memory_usage()
+        sheet = self.registry.load_image("sheet.png")
+        expected = surface_size(sheet) + sum(surface_size(f) for f in frames.left)
+        self.assertEqual(usage["sheet.png"], expected)
+        self.assertEqual(self.registry.total_memory(), expected)
+
+    def test_ducks_share_frames(self):
+        """
+        Ducks of the same type should share frames and shot images.
+        """
+        with patch("src.animation.get_registry", return_value=self.registry), \
+                patch("src.duck.get_registry", return_value=self.registry):
+            first = Duck(800, 360, "sheet.png", "normal")
+            second = Duck(800, 360, "sheet.png", "normal")
+        self.assertIs(first.animation.frames, second.animation.frames)
+        self.assertIs(first.shot_image_flipped, second.shot_image_flipped)
+
+class BackgroundCacheTest(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        pygame.display.set_mode((800, 600))
+        self.patcher = patch("pygame.image.load", side_effect=dummy_load)
+        self.mock_load = self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+        pygame.quit()
+
+    def test_preloaded_backgrounds_are_not_read_again(self):
+        """
+        After preloading, cycling through the backgrounds should not decode anything
+        and should return the scaled surfaces.
+        """
+        cache = BackgroundCache(["a.png", "b.png", "c.png"], size=(800, 600))
+        cache.preload()
+        self.assertEqual(self.mock_load.call_count, 3)
+        first = cache.get(0)
+        self.assertIs(cache.get(3), first)
+        self.assertEqual(first.get_size(), (800, 600))
+        cache.get(1)
+        cache.get(2)
+        self.assertEqual(self.mock_load.call_count, 3)
+        self.assertEqual(cache.memory_usage(), 3 * surface_size(first))
+
+    def test_least_recently_used_background_is_dropped(self):
+        """
+        A bounded cache should drop the least recently used background.
+        """
+        cache = BackgroundCache(["a.png", "b.png", "c.png"], max_entries=2)
+        cache.preload()
+        cache.get(0)
+        cache.get(2)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(list(cache.surfaces), ["a.png", "c.png"])
+        self.assertEqual(cache.get(0).get_size(), (255, 90))
+
+if __name__ == "__main__":
+    unittest.main()
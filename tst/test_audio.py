@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+import pygame
+from src.audio import AudioBank, AudioProfile, LatencyMonitor, PROFILES
+
+SOUND_PATH = "assets/gunshot.mp3"
+
+class AudioBankTest(unittest.TestCase):
+    def setUp(self):
+        pygame.mixer.init()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def tearDown(self):
+        pygame.mixer.quit()
+
+    def test_sound_is_decoded_once_per_process(self):
+        """
+        Loading the same sound twice should return the shared Sound object.
+        """
+        bank = AudioBank(cache_dir=None)
+        self.assertIs(bank.load(SOUND_PATH), bank.load(SOUND_PATH))
+        self.assertEqual(bank.decodes, 1)
+
+    def test_prefetched_sound_is_decoded_once(self):
+        """
+        A prefetched sound should be decoded in the background and returned by load().
+        """
+        bank = AudioBank(cache_dir=None)
+        bank.prefetch([SOUND_PATH])
+        bank.prefetch([SOUND_PATH])
+        sound = bank.load(SOUND_PATH)
+        self.assertIs(bank.load(SOUND_PATH), sound)
+        self.assertEqual(bank.decodes, 1)
+        self.assertEqual(bank.pending, {})
+
+    def test_decoded_samples_are_cached_on_disk(self):
+        """
+        A second bank should load the samples written by the first one instead of
+        decoding the file again.
+        """
+        first = AudioBank(self.directory.name)
+        decoded = first.load(SOUND_PATH)
+        self.assertEqual(len(os.listdir(self.directory.name)), 1)
+
+        second = AudioBank(self.directory.name)
+        cached = second.load(SOUND_PATH)
+        self.assertEqual((second.decodes, second.cache_hits), (0, 1))
+        self.assertEqual(cached.get_raw(), decoded.get_raw())
+
+    def test_cache_is_keyed_by_mixer_format(self):
+        """
+        Samples decoded for one mixer format should not be used with another.
+        """
+        bank = AudioBank(self.directory.name)
+        path = bank.cache_path(SOUND_PATH)
+        pygame.mixer.quit()
+        pygame.mixer.init(frequency=22050)
+        self.assertNotEqual(bank.cache_path(SOUND_PATH), path)
+
+class LatencyTest(unittest.TestCase):
+    def test_buffer_latency(self):
+        """
+        The buffer latency should be the time one buffer takes to play.
+        """
+        self.assertAlmostEqual(AudioProfile("test", 48000, 480, 2).buffer_latency_ms(), 10.0)
+        self.assertLess(PROFILES["low_latency"].buffer_latency_ms(),
+                        PROFILES["low_cpu"].buffer_latency_ms())
+
+    def test_monitor_measures_click_to_sound(self):
+        """
+        Only a sound queued after a click should be measured, once per click.
+        """
+        monitor = LatencyMonitor(PROFILES["default"], verbose=False)
+        monitor.sound_queued()
+        monitor.click()
+        monitor.sound_queued()
+        monitor.sound_queued()
+        self.assertEqual(len(monitor.samples), 1)
+        self.assertGreaterEqual(monitor.samples[0], 0.0)
+        self.assertIn("1 sounds", monitor.summary())
+        self.assertIn("11.6 ms buffer", monitor.summary())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from src.balance import Aggregate, Distribution, Job, make_tuning, parse_sweep, run_job
+from src.core import DEFAULT_TUNING
+
+class BalanceTest(unittest.TestCase):
+    def test_merged_distribution_matches_direct(self):
+        """
+        Merging two partial distributions should give the same summary as adding
+        every value to one distribution.
+        """
+        values = [3.0, 10.0, 250.0, 75.0, 75.0, 1.0, 990.0]
+        direct = Distribution(25.0)
+        first, second = Distribution(25.0), Distribution(25.0)
+        for index, value in enumerate(values):
+            direct.add(value)
+            (first if index < 3 else second).add(value)
+        first.merge(second)
+        self.assertEqual(first.count, direct.count)
+        self.assertAlmostEqual(first.mean, direct.mean)
+        self.assertAlmostEqual(first.stdev(), direct.stdev())
+        self.assertEqual(first.bins, direct.bins)
+        self.assertEqual(first.percentile(0.5), direct.percentile(0.5))
+        self.assertEqual(direct.percentile(1.0), 990.0)
+
+    def test_make_tuning(self):
+        """
+        Sweep values should override the defaults without changing DEFAULT_TUNING.
+        """
+        tuning = make_tuning({"points.red": -50, "speed_multiplier": 1.3,
+                              "zigzag_change_chance": 10})
+        self.assertEqual(tuning.points["red"], -50)
+        self.assertEqual(tuning.points["normal"], DEFAULT_TUNING.points["normal"])
+        self.assertEqual(tuning.speed_multiplier, 1.3)
+        self.assertEqual(tuning.zigzag_change_chance, 10)
+        self.assertEqual(DEFAULT_TUNING.points["red"], -25)
+        with self.assertRaises(ValueError):
+            make_tuning({"lives": 5})
+
+    def test_parse_sweep(self):
+        """
+        A sweep argument should be split into its parameter name and values.
+        """
+        self.assertEqual(parse_sweep(["speed_multiplier=1.0,1.1"]),
+                         [("speed_multiplier", [1.0, 1.1])])
+
+    def test_run_job_is_reproducible(self):
+        """
+        The same batch should give the same summary, and split batches should add up.
+        """
+        job = Job("time", "bot:0.7:400", DEFAULT_TUNING, 3, 0, 4)
+        first, second = run_job(job), run_job(job)
+        self.assertEqual(first.games, 4)
+        self.assertEqual(first.score.bins, second.score.bins)
+
+        combined = Aggregate()
+        combined.merge(run_job(Job("time", "bot:0.7:400", DEFAULT_TUNING, 3, 0, 2)))
+        combined.merge(run_job(Job("time", "bot:0.7:400", DEFAULT_TUNING, 3, 2, 2)))
+        self.assertEqual(combined.score.bins, first.score.bins)
+        self.assertAlmostEqual(combined.hit_rate.mean, first.hit_rate.mean)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from benchmarks.suite import (Benchmark, Case, compare, load_baseline, measure,
+                              parse_thresholds, save_baseline, BASELINE_VERSION)
+
+def make_baseline(results):
+    return {"version": BASELINE_VERSION,
+            "results": {key: {"median": value, "min": value, "number": 1, "repeat": 1}
+                        for key, value in results.items()}}
+
+class BenchmarkSuiteTest(unittest.TestCase):
+    def test_compare_flags_regressions(self):
+        """
+        Only benchmarks slower than their threshold should be reported, and a
+        threshold given for a benchmark name should replace the general one.
+        """
+        baseline = make_baseline({"duck_move/10": 1.0, "duck_move/100": 1.0, "startup/1": 1.0})
+        current = make_baseline({"duck_move/10": 1.1, "duck_move/100": 1.5,
+                                 "startup/1": 1.4, "animation_update/1": 1.0})
+        with patch("builtins.print"):
+            self.assertEqual(compare(baseline, current, 0.2), ["duck_move/100", "startup/1"])
+            self.assertEqual(compare(baseline, current, 0.2, {"startup": 0.5}),
+                             ["duck_move/100"])
+        self.assertEqual(parse_thresholds(["startup=0.5"]), {"startup": 0.5})
+
+    def test_measure_skips_resets(self):
+        """
+        The reset of a case should run before every call without being timed.
+        """
+        calls = []
+        case = Case(lambda: calls.append("run"), lambda: calls.append("reset"))
+        benchmark = Benchmark("fake", lambda scale: case, [1], number=3, repeat=2)
+        result = measure(benchmark, 1)
+        self.assertEqual(calls, ["reset", "run"] * 6)
+        self.assertEqual((result["number"], result["repeat"]), (3, 2))
+        self.assertLessEqual(result["min"], result["median"])
+
+    def test_baseline_round_trip(self):
+        """
+        Saved results should load unchanged, and other JSON files should be rejected.
+        """
+        baseline = make_baseline({"save_new_score/1": 0.25})
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "baseline.json")
+            save_baseline(baseline, path)
+            self.assertEqual(load_baseline(path), baseline)
+            save_baseline({"results": {}}, path)
+            with self.assertRaises(ValueError):
+                load_baseline(path)
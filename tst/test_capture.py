@@ -0,0 +1,53 @@
+import os
+import pstats
+import tempfile
+import unittest
+from unittest.mock import patch
+from src.capture import ProfileCapture
+
+class ProfileCaptureTest(unittest.TestCase):
+    def test_capture_stops_after_its_frames(self):
+        """
+        A capture should profile its frames, then write a pstats dump and a summary.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            capture = ProfileCapture(frames=3, directory=directory)
+            with patch("builtins.print"):
+                capture.toggle()
+                self.assertTrue(capture.active)
+                for _ in range(3):
+                    sum(range(1000))
+                    capture.end_frame()
+            self.assertFalse(capture.active)
+            assert capture.last_paths is not None
+            stats_path, summary_path = capture.last_paths
+            self.assertEqual(os.path.dirname(stats_path), directory)
+            self.assertGreater(pstats.Stats(stats_path).total_calls, 0)
+            with open(summary_path, encoding="utf-8") as file:
+                self.assertTrue(file.readline().startswith("3 frames in"))
+
+    def test_toggle_ends_capture_early(self):
+        """
+        Pressing the hotkey again should write the frames captured so far, and
+        captures in the same second should not overwrite each other.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            capture = ProfileCapture(frames=100, directory=directory)
+            paths = []
+            with patch("builtins.print"):
+                for _ in range(2):
+                    capture.toggle()
+                    capture.end_frame()
+                    capture.toggle()
+                    paths.append(capture.last_paths)
+            self.assertFalse(capture.active)
+            self.assertNotEqual(paths[0], paths[1])
+            self.assertEqual(len(os.listdir(directory)), 4)
+            with open(paths[1][1], encoding="utf-8") as file:
+                self.assertTrue(file.readline().startswith("1 frames in"))
+
+    def test_stop_without_capture(self):
+        """
+        Stopping an idle capture should do nothing.
+        """
+        self.assertIsNone(ProfileCapture().stop())
@@ -0,0 +1,78 @@
+import os
+import unittest
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+import pygame
+from src.channels import ChannelPool, SoundCategory
+
+class ChannelPoolTest(unittest.TestCase):
+    def setUp(self):
+        pygame.mixer.init()
+        self.pool = ChannelPool([
+            SoundCategory("gunshot", channels=2, max_voices=2, priority=2),
+            SoundCategory("combo", channels=1, max_voices=1, priority=3),
+            SoundCategory("effects", channels=1, max_voices=1, priority=1),
+        ])
+        self.gunshot = pygame.mixer.Sound("assets/gunshot.mp3")
+        self.combo = pygame.mixer.Sound("assets/combo.mp3")
+        self.flapping = pygame.mixer.Sound("assets/duck_flapping.mp3")
+
+    def tearDown(self):
+        pygame.mixer.quit()
+
+    def test_sounds_play_on_their_reserved_channels(self):
+        """
+        Every category should use its own channels, which SDL no longer hands out.
+        """
+        gunshot = self.pool.play(self.gunshot, "gunshot")
+        combo = self.pool.play(self.combo, "combo")
+        self.assertIn(gunshot, self.pool.channels["gunshot"])
+        self.assertIn(combo, self.pool.channels["combo"])
+        self.assertEqual(self.pool.usage(), {"gunshot": 1, "combo": 1, "effects": 0})
+        self.assertEqual(pygame.mixer.find_channel().get_busy(), False)
+
+    def test_voice_cap_replaces_the_oldest_voice(self):
+        """
+        A sound at its voice cap should restart on its oldest channel.
+        """
+        first = self.pool.play(self.gunshot, "gunshot")
+        self.pool.play(self.gunshot, "gunshot")
+        third = self.pool.play(self.gunshot, "gunshot")
+        self.assertIs(third, first)
+        self.assertEqual(self.pool.steals, 1)
+        self.assertEqual(self.pool.busy_channels("gunshot"), 2)
+
+    def test_full_category_steals_from_lower_priority(self):
+        """
+        A full category should take a channel from a lower-priority category,
+        but never from a higher one.
+        """
+        effect = self.pool.play(self.flapping, "effects")
+        self.pool.play(self.combo, "combo")
+        self.pool.play(self.gunshot, "gunshot")
+        other_sound = pygame.mixer.Sound(buffer=self.gunshot.get_raw())
+        self.pool.play(other_sound, "gunshot")
+        stolen = self.pool.play(pygame.mixer.Sound(buffer=self.combo.get_raw()), "gunshot")
+        self.assertIs(stolen, effect)
+        self.assertTrue(self.pool.channels["combo"][0].get_busy())
+        self.assertEqual(self.pool.channels["combo"][0].get_sound(), self.combo)
+        self.assertEqual(self.pool.peak_busy, 4)
+        self.assertIn("peak 4 of 4 channels", self.pool.report())
+
+    def test_full_lowest_category_drops_new_sounds(self):
+        """
+        With nothing of lower priority to steal, a full category should drop the
+        new sound instead of cutting its own, unless it allows stealing its own.
+        """
+        playing = self.pool.play(self.flapping, "effects")
+        dropped = self.pool.play(pygame.mixer.Sound(buffer=self.gunshot.get_raw()), "effects")
+        self.assertIsNone(dropped)
+        self.assertEqual((self.pool.drops, self.pool.steals), (1, 0))
+        self.assertEqual(playing.get_sound(), self.flapping)
+
+        self.pool.categories["effects"].steal_own = True
+        stolen = self.pool.play(pygame.mixer.Sound(buffer=self.gunshot.get_raw()), "effects")
+        self.assertIs(stolen, playing)
+        self.assertEqual(self.pool.steals, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import unittest
+from src.core import (Box, DuckLogic, GameSession, ManualClock, create_session, simulate,
+                      round_half_away, LIVES, RESPAWN_DELAY, SHOTS_PER_LIFE, SHOT_DISPLAY_TIME)
+
+STEP_MS = 1000 / 60
+
+def perfect_shooter(session):
+    """
+    A shooter that fires at the center of the current duck whenever it can be hit.
+    """
+    duck = session.current_duck
+    if duck.alive and not duck.is_shot:
+        return [duck.rect.center]
+    return []
+
+def blind_shooter(session):
+    """
+    A shooter that always misses.
+    """
+    return [(-1, -1)]
+
+class CoreTest(unittest.TestCase):
+    def test_round_half_away(self):
+        """
+        Rounding should match pygame.Rect: halves go away from zero.
+        """
+        self.assertEqual(round_half_away(2.5), 3)
+        self.assertEqual(round_half_away(-2.5), -3)
+        self.assertEqual(round_half_away(0.3), 0)
+        self.assertEqual(round_half_away(3.7), 4)
+
+    def test_box_collidepoint(self):
+        """
+        A box contains its top-left corner but not its bottom-right edge.
+        """
+        box = Box(10, 20, 5, 5)
+        self.assertTrue(box.collidepoint((10, 20)))
+        self.assertFalse(box.collidepoint((15, 20)))
+        self.assertEqual(box.center, (12, 22))
+
+    def test_duck_uses_injected_clock(self):
+        """
+        A shot duck should respawn only after the injected clock passed SHOT_DISPLAY_TIME.
+        """
+        clock = ManualClock()
+        duck = DuckLogic(800, "normal", get_ticks=clock)
+        duck.mark_shot()
+        clock.advance(SHOT_DISPLAY_TIME)
+        duck.move()
+        self.assertTrue(duck.is_shot)
+        clock.advance(1)
+        duck.move()
+        self.assertFalse(duck.is_shot)
+        self.assertTrue(duck.waiting_to_respawn)
+
+    def test_appear_time_excludes_respawn_delay(self):
+        """
+        A respawned duck should count as appeared when it is back on screen, not
+        when its off-screen respawn delay started.
+        """
+        clock = ManualClock(500)
+        duck = DuckLogic(800, "normal", get_ticks=clock)
+        self.assertEqual(duck.appear_time, 500)
+        duck.respawn()
+        delay = int(RESPAWN_DELAY * 1000)
+        clock.advance(delay)
+        duck.handle_respawn()
+        self.assertTrue(duck.alive)
+        self.assertEqual(duck.appear_time, 500 + delay)
+        self.assertEqual(duck.spawn_time, 500)
+
+    def test_standard_game_ends_without_hits(self):
+        """
+        A shooter that always misses loses every life in LIVES * SHOTS_PER_LIFE steps.
+        """
+        clock = ManualClock()
+        session = simulate(create_session("standard", seed=1, clock=clock), clock, STEP_MS,
+                           blind_shooter)
+        self.assertFalse(session.running)
+        self.assertTrue(session.game_over_flag)
+        self.assertEqual(session.lives, 0)
+        self.assertEqual(session.score, 0)
+        self.assertLessEqual(clock(), (LIVES * SHOTS_PER_LIFE + 1) * STEP_MS)
+
+    def test_time_game_expires(self):
+        """
+        A time-mode game should end once the injected clock passed 60 seconds.
+        """
+        clock = ManualClock()
+        session = simulate(create_session("time", seed=1, clock=clock), clock, STEP_MS,
+                           perfect_shooter)
+        self.assertTrue(session.game_over_flag)
+        self.assertGreaterEqual(clock(), 60000)
+        self.assertLess(clock(), 60100)
+        self.assertGreater(session.duck_hits, 0)
+
+    def test_same_seed_same_game(self):
+        """
+        Two sessions with the same seed should play out identically.
+        """
+        results = []
+        for _ in range(2):
+            clock = ManualClock()
+            session = simulate(create_session("time", seed=7, clock=clock), clock, STEP_MS,
+                               perfect_shooter)
+            results.append((session.score, session.duck_hits, session.current_duck.rect.topleft))
+        self.assertEqual(results[0], results[1])
+
+    def test_hit_and_miss_rules(self):
+        """
+        A hit scores and resets the shots, a miss costs a shot.
+        """
+        clock = ManualClock()
+        session = create_session("standard", seed=3, clock=clock)
+        session.reset_game()
+        clock.advance(1000)
+        session.update()  # The duck appears after the respawn delay
+        duck = session.current_duck
+        session.resolve_shots([(-1, -1)])
+        self.assertEqual(session.shots_remaining, SHOTS_PER_LIFE - 1)
+        session.resolve_shots([duck.rect.center, duck.rect.center])
+        self.assertEqual(session.duck_hits, 1)
+        self.assertEqual(session.shots_remaining, SHOTS_PER_LIFE)
+        self.assertTrue(duck.is_shot)
+
+    def test_session_accepts_any_duck_logic(self):
+        """
+        GameSession should work with plain DuckLogic objects and no pygame at all.
+        """
+        session = GameSession([DuckLogic(800, "special")], "standard")
+        session.reset_game()
+        session.process_hit()
+        self.assertEqual(session.score, 100)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import pygame
+from unittest.mock import patch
+from src.dirty_rects import DirtyRectRenderer, merge_rects
+
+class DirtyRectRendererTest(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.screen = pygame.display.set_mode((200, 100))
+        self.background = pygame.Surface((200, 100))
+        self.background.fill((0, 0, 255))
+        self.sprite = pygame.Surface((10, 10))
+        self.sprite.fill((255, 0, 0))
+        self.renderer = DirtyRectRenderer(self.screen)
+
+    def tearDown(self):
+        pygame.quit()
+
+    def present(self):
+        with patch("pygame.display.update") as update, patch("pygame.display.flip"):
+            rects = self.renderer.present(self.background)
+        return rects, update
+
+    def test_first_frame_is_full(self):
+        """
+        The first frame should draw and push the whole screen.
+        """
+        self.renderer.blit("duck", self.sprite, (20, 20))
+        rects, _ = self.present()
+        self.assertEqual(rects, [self.screen.get_rect()])
+        self.assertEqual(self.screen.get_at((25, 25)), pygame.Color(255, 0, 0))
+
+    def test_moved_sprite_updates_old_and_new_rect(self):
+        """
+        A moved sprite should restore the background at its old position and
+        push only the union of its old and new rect.
+        """
+        self.renderer.blit("duck", self.sprite, (20, 20))
+        self.present()
+        self.renderer.blit("duck", self.sprite, (25, 20))
+        rects, update = self.present()
+        self.assertEqual(rects, [pygame.Rect(20, 20, 15, 10)])
+        update.assert_called_once_with(rects)
+        self.assertEqual(self.screen.get_at((21, 21)), pygame.Color(0, 0, 255))
+        self.assertEqual(self.screen.get_at((30, 25)), pygame.Color(255, 0, 0))
+
+    def test_unchanged_frame_updates_nothing(self):
+        """
+        A sprite that neither moved nor changed its key should not be redrawn.
+        """
+        self.renderer.blit("score", self.sprite, (50, 50), key="Score: 0")
+        self.present()
+        self.renderer.blit("score", self.sprite.copy(), (50, 50), key="Score: 0")
+        rects, _ = self.present()
+        self.assertEqual(rects, [])
+        self.assertAlmostEqual(self.renderer.pixels_saved_per_frame(), 200 * 100 / 2)
+
+    def test_overlapped_sprite_is_redrawn(self):
+        """
+        An unchanged sprite under a dirty rect should be drawn again on top of
+        the restored background.
+        """
+        self.renderer.blit("score", self.sprite, (50, 50), key="Score: 0")
+        self.renderer.blit("scope", self.sprite, (55, 55))
+        self.present()
+        self.renderer.blit("score", self.sprite, (50, 50), key="Score: 0")
+        self.renderer.blit("scope", self.sprite, (100, 55))
+        rects, _ = self.present()
+        self.assertEqual(self.screen.get_at((52, 52)), pygame.Color(255, 0, 0))
+        self.assertEqual(self.screen.get_at((63, 63)), pygame.Color(0, 0, 255))
+        self.assertIn(pygame.Rect(50, 50, 15, 15), rects)
+
+    def test_merge_rects(self):
+        """
+        Overlapping rects should be merged, separate ones kept.
+        """
+        merged = merge_rects([pygame.Rect(0, 0, 10, 10), pygame.Rect(50, 50, 5, 5),
+                              pygame.Rect(5, 5, 10, 10)])
+        self.assertCountEqual(merged, [pygame.Rect(0, 0, 15, 15), pygame.Rect(50, 50, 5, 5)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import unittest
+from unittest.mock import patch
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+from src import display
+
+class TextureRendererTest(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        with patch("builtins.print"):
+            self.screen = display.create_screen((200, 100), "Test", "gpu")
+        self.textures = display.get_texture_renderer()
+
+    def tearDown(self):
+        display.close_texture_renderer()
+        pygame.quit()
+
+    def test_gpu_backend_falls_back_to_software_renderer(self):
+        """
+        Without a GPU the gpu backend should still open a renderer, and screens
+        should draw on an off-screen surface that flip() uploads.
+        """
+        self.assertIsNotNone(self.textures)
+        self.assertEqual(self.screen.get_size(), (200, 100))
+        self.assertIs(self.screen, self.textures.screen)
+        self.screen.fill(pygame.Color("red"))
+        display.flip()
+
+    def test_surfaces_are_uploaded_once(self):
+        """
+        Drawing the same surfaces in every frame should upload each of them once.
+        """
+        sprite = pygame.Surface((10, 10), pygame.SRCALPHA)
+        background = pygame.Surface((200, 100))
+        for x in range(3):
+            self.textures.clear()
+            self.textures.copy(background, (0, 0))
+            self.textures.copy(sprite, (x, 5))
+            self.textures.present()
+        self.assertEqual(self.textures.uploads, 2)
+
+    def test_least_recently_used_texture_is_dropped(self):
+        """
+        The renderer should keep at most max_textures uploaded surfaces.
+        """
+        self.textures.max_textures = 2
+        surfaces = [pygame.Surface((4, 4)) for _ in range(3)]
+        for surface in surfaces:
+            self.textures.texture(surface)
+        self.textures.texture(surfaces[2])
+        self.assertEqual(list(self.textures.textures), [id(surfaces[1]), id(surfaces[2])])
+
+    def test_unknown_backend(self):
+        """
+        An unknown backend name should raise ValueError.
+        """
+        with self.assertRaises(ValueError):
+            display.create_screen((200, 100), "Test", "vulkan")
@@ -1,7 +1,8 @@
 import unittest
 import pygame
 import random
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
+from src.assets import get_registry
 from src.duck import Duck, FLYING_WINDOW_HEIGHT, ZIGZAG_CHANGE_CHANCE, SHOT_DISPLAY_TIME
 
 def dummy_load(path):
@@ -19,6 +20,7 @@ class DuckTest(unittest.TestCase):
         # Patch pygame.image.load so that any call returns our dummy surface.
         self.patcher = patch("pygame.image.load", side_effect=dummy_load)
         self.mock_load = self.patcher.start()
+        get_registry().clear()
 
         # Set screen dimensions
         self.screen_width = 800
@@ -107,10 +109,10 @@ class DuckTest(unittest.TestCase):
     def test_zigzag_changes_speed(self):
         """
         The move() method has a chance to reverse the vertical speed (zigzag). We force this branch
-        by patching random.randint to always return a value that triggers the change.
+        by patching the duck's random generator to always return a value that triggers the change.
         """
         original_speed_y = self.duck.speed_y
-        with patch('random.randint', return_value=1):
+        with patch.object(self.duck.rng, 'randint', return_value=1):
             self.duck.rect.x = (self.duck.x_min + self.duck.x_max) // 2
             self.duck.rect.y = self.duck.y_min + 10
             self.duck.move()
@@ -172,5 +174,24 @@ class DuckTest(unittest.TestCase):
         self.assertEqual(self.duck.speed_y, abs(self.duck.speed_y),
                          "Duck's vertical speed should be set to abs(speed_y) when bouncing off the top edge")
 
+    def test_draw_interpolates_position(self):
+        """
+        draw() with alpha between 0 and 1 should blit the duck between its previous
+        and current position.
+        """
+        self.duck.previous_position = (100, 200)
+        self.duck.rect.topleft = (110, 180)
+        screen = MagicMock()
+        self.duck.draw(screen, 0.5)
+        screen.blit.assert_called_once_with(self.duck.image, (105, 190))
+
+    def test_move_records_previous_position(self):
+        """
+        move() should remember the position the duck had before the step.
+        """
+        start = self.duck.rect.topleft
+        self.duck.move()
+        self.assertEqual(self.duck.previous_position, start)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,105 @@
+import unittest
+import numpy as np
+import pygame
+from unittest.mock import patch
+from src.assets import get_registry
+from src.duck import Duck, SHOT_DISPLAY_TIME, RESPAWN_DELAY
+from src.flock import DuckFlock, FLY_OFF_TIME_MS, OFF_SCREEN
+
+def dummy_load(path):
+    """
+    A dummy image loader function that returns a pygame.Surface of size 255x90.
+    """
+    return pygame.Surface((255, 90), pygame.SRCALPHA)
+
+class DuckFlockTest(unittest.TestCase):
+    def setUp(self):
+        self.flock = DuckFlock(4, seed=1)
+
+    def test_initial_spawn(self):
+        """
+        All ducks should start alive on the grass level inside the flying window.
+        """
+        self.assertTrue(self.flock.alive.all())
+        self.assertTrue((self.flock.y == self.flock.y_max).all())
+        self.assertTrue((self.flock.x >= self.flock.x_min).all())
+        self.assertTrue((self.flock.x <= self.flock.x_max).all())
+
+    def test_bounce_off_edges(self):
+        """
+        Ducks at the left or right edge should reverse their horizontal speed and facing.
+        """
+        self.flock.x[:] = [self.flock.x_min, self.flock.x_max, 300, 300]
+        self.flock.speed_x[:] = [-3, 3, 3, 3]
+        self.flock.facing_right[:] = [False, True, True, True]
+        with patch("src.flock.ZIGZAG_CHANGE_CHANCE", 0):
+            self.flock.move(0)
+        np.testing.assert_array_equal(self.flock.speed_x, [3, -3, 3, 3])
+        np.testing.assert_array_equal(self.flock.facing_right, [True, False, True, True])
+
+    def test_bounce_off_bottom_and_top(self):
+        """
+        Ducks below y_max are clamped and sent up, ducks above y_min are sent down.
+        """
+        self.flock.y[:2] = [self.flock.y_max + 10, self.flock.y_min - 10]
+        self.flock.speed_y[:2] = [3, -3]
+        with patch("src.flock.ZIGZAG_CHANGE_CHANCE", 0):
+            self.flock.move(0)
+        self.assertEqual(self.flock.y[0], self.flock.y_max)
+        self.assertEqual(self.flock.speed_y[0], -3)
+        self.assertEqual(self.flock.speed_y[1], 3)
+
+    def test_shot_duck_respawns_after_display_time(self):
+        """
+        A shot duck stays put, then moves off-screen and waits, then respawns faster.
+        """
+        hit = self.flock.shoot(np.array([0, 0]), 0)
+        np.testing.assert_array_equal(hit, [0])
+        position = (self.flock.x[0], self.flock.y[0])
+        self.flock.step(SHOT_DISPLAY_TIME)
+        self.assertEqual((self.flock.x[0], self.flock.y[0]), position)
+
+        self.flock.step(SHOT_DISPLAY_TIME + 1)
+        self.assertFalse(self.flock.alive[0])
+        self.assertTrue(self.flock.waiting_to_respawn[0])
+        self.assertEqual(self.flock.x[0], OFF_SCREEN)
+        self.assertAlmostEqual(self.flock.speed_x[0], 3.3)
+
+        self.flock.step(SHOT_DISPLAY_TIME + 1 + int(RESPAWN_DELAY * 1000))
+        self.assertTrue(self.flock.alive[0])
+        self.assertFalse(self.flock.waiting_to_respawn[0])
+
+    def test_fly_off(self):
+        """
+        After FLY_OFF_TIME_MS ducks fly upwards and respawn once they leave the screen.
+        """
+        now = FLY_OFF_TIME_MS + 1
+        self.flock.move(now)
+        self.assertTrue(self.flock.flying_off_screen.all())
+        self.assertTrue((self.flock.speed_y < 0).all())
+        for _ in range(200):
+            self.flock.move(now)
+        self.assertFalse(self.flock.alive.any())
+        self.assertTrue(self.flock.waiting_to_respawn.all())
+
+    def test_matches_duck_movement(self):
+        """
+        Without zigzag the flock should follow exactly the same path as a Duck.
+        """
+        pygame.init()
+        pygame.display.set_mode((800, 600))
+        get_registry().clear()
+        with patch("pygame.image.load", side_effect=dummy_load):
+            duck = Duck(800, 360, "dummy_sprite.png", "normal")
+        flock = DuckFlock(1, seed=0)
+        flock.x[0], flock.y[0] = duck.rect.x, duck.rect.y
+        with patch.object(duck.rng, "randint", return_value=100), \
+                patch("src.flock.ZIGZAG_CHANGE_CHANCE", 0):
+            for _ in range(300):
+                duck.move()
+                flock.move(0)
+                self.assertEqual((flock.x[0], flock.y[0]), duck.rect.topleft)
+        pygame.quit()
+
+if __name__ == "__main__":
+    unittest.main()
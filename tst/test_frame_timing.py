@@ -0,0 +1,71 @@
+import json
+import os
+import tempfile
+import unittest
+import pygame
+from unittest.mock import patch
+from src.frame_timing import FrameProfiler, percentile
+
+class FrameProfilerTest(unittest.TestCase):
+    def test_phases_are_stored_per_frame(self):
+        """
+        Every phase should be stored once per frame, adding up repeated entries
+        and storing 0 for phases that did not run.
+        """
+        times = iter([0.0, 0.0, 0.0, 0.001, 0.002, 0.003, 0.005, 0.010])
+        profiler = FrameProfiler(timer=lambda: next(times))
+        profiler.reset_frame()
+        with profiler.phase("update"):
+            pass
+        with profiler.phase("update"):
+            pass
+        profiler.end_frame()
+        self.assertAlmostEqual(profiler.samples["update"][-1], 3.0)
+        self.assertEqual(profiler.samples["render"][-1], 0.0)
+        self.assertAlmostEqual(profiler.samples["frame"][-1], 10.0)
+
+    def test_percentiles_use_the_rolling_window(self):
+        """
+        Only the last window frames should count towards the percentiles.
+        """
+        profiler = FrameProfiler(window=100)
+        for value in [1000.0] * 50 + [float(ms) for ms in range(1, 101)]:
+            profiler.samples["render"].append(value)
+        self.assertEqual(profiler.percentiles("render"), (51.0, 96.0, 100.0))
+        self.assertEqual(percentile([], 0.5), 0.0)
+
+    def test_trace_export(self):
+        """
+        The exported trace should contain the phases and scenes as complete events.
+        """
+        profiler = FrameProfiler(trace=True)
+        with profiler.scene("gameplay"):
+            with profiler.phase("events"):
+                pass
+            profiler.end_frame()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "trace.json")
+            with patch("builtins.print"):
+                profiler.save_trace(path)
+            with open(path, encoding="utf-8") as file:
+                events = json.load(file)["traceEvents"]
+        self.assertEqual([(event["name"], event["cat"]) for event in events],
+                         [("events", "frame"), ("frame", "frame"), ("gameplay", "scene")])
+        self.assertTrue(all(event["ph"] == "X" and event["dur"] >= 0 for event in events))
+
+    def test_overlay_lines(self):
+        """
+        The overlay should show the frame and every phase once it is visible.
+        """
+        pygame.font.init()
+        profiler = FrameProfiler()
+        self.assertEqual(profiler.overlay_lines, [])
+        profiler.samples["frame"].extend([20.0] * 10)
+        profiler.toggle_overlay()
+        self.assertEqual(len(profiler.overlay_lines), 6)
+        self.assertTrue(profiler.overlay_lines[0].endswith("!"))
+        items = profiler.overlay_items(pygame.font.Font(None, 16))
+        self.assertEqual([name for name, _, _ in items][:2], ["overlay0", "overlay1"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,13 @@
+import os
+import tempfile
 import unittest
 import pygame
 from unittest.mock import patch
+from src import display
+from src.audio import LatencyMonitor
+from src.frame_timing import FrameProfiler
 from src.gameplay import Gameplay
+from src.telemetry import NO_DUCK, ShotRecorder, read_chunks
 
 class DummyDuck:
     def __init__(self, duck_type="normal"):
@@ -11,12 +17,19 @@ class DummyDuck:
         self.image = None
         # Creating a dummy shot image
         self.shot_image = pygame.Surface((85, 90))
+        self.shot_image_flipped = pygame.Surface((85, 90))
         self.rect = pygame.Rect(100, 100, 85, 90)
+        self.previous_position = self.rect.topleft
         self.speed_x = 3
         self.speed_y = -3
         self.waiting_to_respawn = False
         self.shot_time = None
         self.is_shot = False
+        self.spawn_time = 0
+        self.appear_time = 0
+
+    def get_mask(self):
+        return None
 
     def respawn(self, mode="standard"):
         self.alive = True
@@ -26,21 +39,46 @@ class DummyDuck:
         self.rect.x += self.speed_x
         self.rect.y += self.speed_y
 
+    def reset(self):
+        self.speed_x = 3
+        self.speed_y = -3
+        self.is_shot = False
+
+    def mark_shot(self):
+        self.is_shot = True
+        self.shot_time = pygame.time.get_ticks()
+
     def handle_respawn(self):
         pass
 
     def make_duck_fly_off(self):
         self.alive = False
 
+    def draw_position(self, alpha=1.0):
+        previous_x, previous_y = self.previous_position
+        return (round(previous_x + (self.rect.x - previous_x) * alpha),
+                round(previous_y + (self.rect.y - previous_y) * alpha))
+
+    def draw(self, screen, alpha=1.0):
+        pass
+
+class DummyChannels:
+    def report(self):
+        return "Mixer: no sounds"
+
 class DummyMusicManager:
     def __init__(self):
         self.gunshot_sound = "gunshot"
         self.combo_sound = "combo"
         self.game_over_sound = "game_over"
         self.last_sound = None
+        self.channels = DummyChannels()
+        self.latency_monitor = None
 
     def play_sound(self, sound):
         self.last_sound = sound
+        if self.latency_monitor is not None:
+            self.latency_monitor.sound_queued()
 
 class DummyUI:
     def __init__(self, screen, font):
@@ -53,14 +91,27 @@ class DummyUI:
     def draw_time_ui(self, score, remaining_time):
         pass
 
+    def standard_ui_fields(self, score, lives, shots_remaining):
+        return [("score", f"Score: {score}", (500, 490))]
+
+    def time_ui_fields(self, score, remaining_time):
+        return [("score", f"Score: {score}", (50, 490))]
+
+    def render_text(self, text):
+        return pygame.Surface((100, 30))
+
 class DummySetup:
-    def __init__(self):
+    def __init__(self, backend="software"):
         self.screen = pygame.Surface((800, 600))
         self.background = pygame.Surface((800, 600))
         self.font = pygame.font.SysFont("Arial", 30)
         self.scope = pygame.Surface((40, 40))
         self.ducks = [DummyDuck(), DummyDuck()]
         self.music_manager = DummyMusicManager()
+        self.current_background_index = 0
+
+    def load_game(self, get_ticks=None, rng=None):
+        pass
 
     def get_screen(self):
         return self.screen
@@ -81,7 +132,7 @@ class DummySetup:
         return self.music_manager
 
     def change_background(self):
-        return "dummy_background.png"
+        return self.background
 
 class DummyMenu:
     def __init__(self, screen, clock, background, change_background):
@@ -99,8 +150,9 @@ class DummyGameOver:
     def display(self, score):
         return "TestPlayer"
 
-    def save_new_score(self, filename, score, player_name):
+    def save_new_score(self, mode, score, player_name):
         self.saved = True
+        return 1
 
 class TestGameplay(unittest.TestCase):
     def setUp(self):
@@ -127,6 +179,9 @@ class TestGameplay(unittest.TestCase):
         self.gameplay = Gameplay(mode="standard")
 
     def tearDown(self):
+        # The renderer of the gpu backend has to go before SDL shuts down
+        self.gameplay.textures = None
+        display.close_texture_renderer()
         pygame.quit()
 
     def test_award_milestone_bonus(self):
@@ -143,7 +198,7 @@ class TestGameplay(unittest.TestCase):
         """
         Test that after the delay expires, the duck is switched.
         """
-        self.gameplay.new_duck_timer_start = pygame.time.get_ticks() - 3000  # 3 seconds ago
+        self.gameplay.new_duck_timer_start = self.gameplay.get_ticks() - 3000  # 3 seconds ago
         old_duck = self.gameplay.current_duck
         self.gameplay.switch_duck_with_delay()
         self.assertIsNone(self.gameplay.new_duck_timer_start)
@@ -204,6 +259,66 @@ class TestGameplay(unittest.TestCase):
         self.assertEqual(self.gameplay.lives, 2)
         self.assertEqual(self.gameplay.shots_remaining, 3)
 
+    def test_resolve_shots_scores_target_once(self):
+        """
+        Several shots on the same duck in one frame should score it only once.
+        """
+        self.gameplay.current_duck.rect = pygame.Rect(100, 100, 85, 90)
+        self.gameplay.resolve_shots([(110, 110), (120, 120)])
+        self.assertEqual(self.gameplay.score, 50)
+        self.assertEqual(self.gameplay.duck_hits, 1)
+        self.assertEqual(self.gameplay.shots_remaining, 3)
+
+    def test_shots_are_streamed_to_telemetry(self):
+        """
+        Every resolved shot should be recorded with its outcome and the game state after it.
+        """
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "shots.dhs")
+        self.gameplay.telemetry = ShotRecorder(path)
+        self.gameplay.current_duck.rect = pygame.Rect(100, 100, 85, 90)
+        # The duck was respawned a second before it appeared 250 ms ago
+        self.gameplay.current_duck.spawn_time = self.gameplay.get_ticks() - 1250
+        self.gameplay.current_duck.appear_time = self.gameplay.get_ticks() - 250
+        self.gameplay.resolve_shots([(110, 110), (10, 10)])
+        self.gameplay.telemetry.close()
+        (chunk,) = read_chunks(path)
+        self.assertEqual(list(chunk["hit"]), [1, 0])
+        self.assertEqual(list(chunk["x"]), [110, 10])
+        self.assertEqual(list(chunk["duck_x"]), [142, 142])
+        self.assertEqual(list(chunk["since_spawn"]), [250, 250])
+        self.assertEqual(list(chunk["shots_left"]), [3, 2])
+        self.assertEqual(list(chunk["time_left"]), [-1, -1])
+
+    def test_shots_hit_the_duck_where_it_was_drawn(self):
+        """
+        Between two steps the duck is drawn behind its rect; a shot on the drawn
+        sprite should hit and a shot on the not yet drawn part should miss.
+        """
+        duck = self.gameplay.current_duck
+        duck.previous_position = (80, 100)
+        duck.rect = pygame.Rect(100, 100, 85, 90)
+        with patch("pygame.mouse.get_pos", return_value=(0, 0)):
+            self.gameplay.draw(0.5)
+        self.assertEqual(self.gameplay.find_targets([(92, 110), (180, 110)]), [duck, None])
+
+    def test_miss_without_a_duck_on_screen_is_recorded_as_such(self):
+        """
+        A miss while the current duck waits to respawn should not be attributed to it.
+        """
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "shots.dhs")
+        self.gameplay.telemetry = ShotRecorder(path)
+        self.gameplay.current_duck.alive = False
+        self.gameplay.record_shot((10, 10), None)
+        self.gameplay.telemetry.close()
+        (chunk,) = read_chunks(path)
+        self.assertEqual(list(chunk["duck_type"]), [NO_DUCK])
+        self.assertEqual((chunk["duck_x"][0], chunk["duck_y"][0]), (-1, -1))
+        self.assertEqual(chunk["since_spawn"][0], 0)
+
     def test_update_standard_game_over(self):
         """
         Test that in standard mode, when lives reach 0, handle_game_over() is called.
@@ -219,12 +334,94 @@ class TestGameplay(unittest.TestCase):
         Test that in time mode, when time runs out, handle_game_over() is called.
         """
         self.gameplay.mode = "time"
-        self.gameplay.start_time = pygame.time.get_ticks() - 61000  # 61 seconds have passed
+        self.gameplay.start_time = self.gameplay.get_ticks() - 61000  # 61 seconds have passed
         self.gameplay.total_time = 60
         self.gameplay.game_over_flag = False
         with patch.object(self.gameplay, "handle_game_over") as mock_handle_game_over:
             self.gameplay.update()
             mock_handle_game_over.assert_called_once()
 
+    def test_dirty_rect_rendering_pushes_changed_regions(self):
+        """
+        With dirty rects enabled, a frame after the first should push only the
+        regions that changed instead of flipping the whole display.
+        """
+        self.gameplay.set_dirty_rects(True)
+        self.gameplay.current_duck.image = pygame.Surface((85, 90))
+        with patch("pygame.display.flip") as flip, patch("pygame.display.update") as update:
+            self.gameplay.render()
+            flip.assert_called_once()
+            self.gameplay.current_duck.rect.x += 10
+            self.gameplay.render()
+            update.assert_called_once()
+            self.assertIn(pygame.Rect(100, 100, 95, 90), update.call_args[0][0])
+        self.assertGreater(self.gameplay.renderer.pixels_saved_per_frame(), 0)
+
+    def test_scenes_are_traced_by_the_given_profiler(self):
+        """
+        A game created after the title menu should record its scenes with the
+        profiler that traced that menu.
+        """
+        profiler = FrameProfiler(trace=True)
+        with profiler.scene("menu"):
+            pass
+        game = Gameplay(mode="standard", profiler=profiler)
+        self.assertIs(game.profiler, profiler)
+        pygame.event.post(pygame.event.Event(pygame.QUIT))
+        with patch("pygame.display.flip"):
+            game.run()
+        scenes = [event["name"] for event in profiler.trace_events if event["cat"] == "scene"]
+        self.assertEqual(scenes, ["menu", "gameplay"])
+
+    def test_closing_the_window_ends_the_game(self):
+        """
+        Closing the window should end the game with both backends; the gpu
+        window only sends WINDOWCLOSE.
+        """
+        for event_type in (pygame.QUIT, pygame.WINDOWCLOSE):
+            self.gameplay.running = True
+            pygame.event.post(pygame.event.Event(event_type))
+            with patch("pygame.display.flip"):
+                self.gameplay.process_events()
+            self.assertFalse(self.gameplay.running)
+
+    def test_miss_is_not_measured_against_a_later_sound(self):
+        """
+        A miss queues no sound, so the next unrelated sound should not be taken
+        as its latency; a hit should still be measured.
+        """
+        monitor = LatencyMonitor(verbose=False)
+        self.gameplay.latency_monitor = monitor
+        self.gameplay.music_manager.latency_monitor = monitor
+        self.gameplay.current_duck.rect = pygame.Rect(100, 100, 85, 90)
+        pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(10, 10), button=1))
+        self.gameplay.process_events()
+        self.gameplay.music_manager.play_sound(self.gameplay.music_manager.game_over_sound)
+        self.assertEqual(monitor.samples, [])
+        pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(110, 110), button=1))
+        self.gameplay.process_events()
+        self.assertEqual(len(monitor.samples), 1)
+
+    def test_texture_rendering_uploads_each_image_once(self):
+        """
+        With the gpu backend, frames should be drawn from textures uploaded once,
+        and dirty rects should stay off.
+        """
+        with patch("builtins.print"):
+            display.create_screen((800, 600), "Test", "gpu")
+        self.gameplay.textures = display.get_texture_renderer()
+        self.gameplay.set_dirty_rects(True)
+        self.assertFalse(self.gameplay.dirty_rects)
+        self.gameplay.current_duck.image = pygame.Surface((85, 90))
+        text = pygame.Surface((100, 30))
+        with patch("pygame.display.flip") as flip, \
+                patch.object(self.gameplay.ui_manager, "render_text", return_value=text):
+            self.gameplay.render()
+            uploads = self.gameplay.textures.uploads
+            self.gameplay.current_duck.rect.x += 10
+            self.gameplay.render()
+            flip.assert_not_called()
+        self.assertEqual(self.gameplay.textures.uploads, uploads)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,73 @@
+import unittest
+import pygame
+from src.hit_index import HitIndex
+
+class HitIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = HitIndex(cell_size=50)
+
+    def test_miss_returns_none(self):
+        """
+        A point that is not covered by any target should return None.
+        """
+        self.index.insert("duck", pygame.Rect(100, 100, 85, 90))
+        self.assertIsNone(self.index.query((10, 10)))
+        self.assertIsNone(self.index.query((185, 190)))
+
+    def test_target_spanning_cells(self):
+        """
+        A target should be found from every cell its rect overlaps.
+        """
+        self.index.insert("duck", pygame.Rect(40, 40, 85, 90))
+        for point in [(40, 40), (124, 40), (40, 129), (124, 129), (80, 80)]:
+            self.assertEqual(self.index.query(point), "duck")
+
+    def test_topmost_target_wins(self):
+        """
+        When targets overlap, the one inserted last (drawn on top) should be returned.
+        """
+        self.index.rebuild([("bottom", pygame.Rect(0, 0, 100, 100), None),
+                            ("top", pygame.Rect(50, 50, 100, 100), None)])
+        self.assertEqual(self.index.query((75, 75)), "top")
+        self.assertEqual(self.index.query((25, 25)), "bottom")
+
+    def test_negative_coordinates(self):
+        """
+        Targets partly above or left of the screen should still be indexed correctly.
+        """
+        self.index.insert("duck", pygame.Rect(-60, -30, 85, 90))
+        self.assertEqual(self.index.query((0, 0)), "duck")
+        self.assertIsNone(self.index.query((30, 70)))
+
+    def test_rebuild_replaces_targets(self):
+        """
+        rebuild() should drop the targets of the previous step.
+        """
+        self.index.insert("old", pygame.Rect(0, 0, 10, 10))
+        self.index.rebuild([("new", pygame.Rect(200, 200, 10, 10), None)])
+        self.assertEqual(len(self.index), 1)
+        self.assertIsNone(self.index.query((5, 5)))
+        self.assertEqual(self.index.query_many([(205, 205), (5, 5)]), ["new", None])
+
+    def test_mask_rejects_transparent_pixels(self):
+        """
+        With a mask, only opaque pixels count as hits and a lower target can be hit
+        through the transparent part of the one above it.
+        """
+        mask = pygame.mask.Mask((100, 100))
+        mask.draw(pygame.mask.Mask((50, 100), fill=True), (0, 0))  # Left half is opaque
+        self.index.insert("bottom", pygame.Rect(0, 0, 200, 100))
+        self.index.insert("top", pygame.Rect(0, 0, 100, 100), mask)
+        self.assertEqual(self.index.query((10, 10)), "top")
+        self.assertEqual(self.index.query((75, 10)), "bottom")
+
+    def test_mask_smaller_than_rect(self):
+        """
+        Points outside a mask that is smaller than its rect should not hit.
+        """
+        self.index.insert("duck", pygame.Rect(0, 0, 85, 90), pygame.mask.Mask((80, 90), fill=True))
+        self.assertEqual(self.index.query((79, 10)), "duck")
+        self.assertIsNone(self.index.query((82, 10)))
+
+if __name__ == "__main__":
+    unittest.main()
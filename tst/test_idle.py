@@ -0,0 +1,57 @@
+import unittest
+import pygame
+from unittest.mock import patch
+from src.button import Button
+from src.game_over import GameOver
+from src.idle import wait_for_events, hover_state
+
+class IdleTest(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.screen = pygame.display.set_mode((800, 600))
+        pygame.event.clear()
+
+    def tearDown(self):
+        pygame.quit()
+
+    def test_wait_returns_all_pending_events(self):
+        """
+        wait_for_events should return the event it woke up for and every other pending one.
+        """
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a, unicode="a"))
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_b, unicode="b"))
+        events = wait_for_events(100)
+        self.assertEqual([event.unicode for event in events], ["a", "b"])
+
+    def test_wait_times_out_without_events(self):
+        """
+        Without input, wait_for_events should return an empty list after the timeout.
+        """
+        self.assertEqual(wait_for_events(10), [])
+
+    def test_hover_state(self):
+        """
+        hover_state should report which buttons are under the mouse.
+        """
+        font = pygame.font.Font(None, 30)
+        buttons = [Button("A", 0, 0, 100, 50, font, pygame.Color("red"), pygame.Color("blue")),
+                   Button("B", 0, 100, 100, 50, font, pygame.Color("red"), pygame.Color("blue"))]
+        self.assertEqual(hover_state(buttons, (10, 110)), (False, True))
+        self.assertEqual(hover_state(buttons, (500, 500)), (False, False))
+
+    def test_name_prompt_redraws_only_on_input(self):
+        """
+        The name prompt should draw once and then only after input. Keys that arrive
+        together are handled in one wake-up.
+        """
+        for key, unicode in [(pygame.K_a, "a"), (pygame.K_b, "b"), (pygame.K_RETURN, "\r")]:
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, unicode=unicode))
+        game_over = GameOver(self.screen, pygame.time.Clock())
+        with patch("pygame.display.flip") as flip:
+            name = game_over.prompt_for_name()
+        self.assertEqual(name, "ab")
+        # Only the first frame: the keys arrive together and Return ends the prompt
+        self.assertEqual(flip.call_count, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,194 @@
+import asyncio
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from src.leaderboard import LeaderboardClient, LeaderboardServer
+from src.scores import ScoreStore
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Condition not reached in time")
+        time.sleep(0.01)
+
+class ServerThread:
+    def __init__(self, path):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.server, self.port = self.call(self.start(path))
+
+    async def start(self, path):
+        server = LeaderboardServer(ScoreStore(path))
+        return server, await server.start("127.0.0.1", 0)
+
+    def call(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(5)
+
+    def top(self, mode):
+        return self.call(self.server.run_store(self.server.store.top, mode))
+
+    def stop(self):
+        if not self.thread.is_alive():
+            return
+        self.call(self.server.stop())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5)
+
+class LeaderboardTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.outbox_path = os.path.join(self.directory.name, "outbox.db")
+        print_patcher = patch("builtins.print")
+        print_patcher.start()
+        self.addCleanup(print_patcher.stop)
+
+    def start_server(self):
+        server = ServerThread(os.path.join(self.directory.name, "scores.db"))
+        self.addCleanup(server.stop)
+        return server
+
+    def start_client(self, port):
+        client = LeaderboardClient("127.0.0.1", port, self.outbox_path)
+        client.start()
+        self.addCleanup(client.close)
+        return client
+
+    def test_submissions_are_batched_over_one_connection(self):
+        """
+        Scores submitted together should reach the server over one connection,
+        and the first page of the ranking should then be served from the cache.
+        """
+        server = self.start_server()
+        client = self.start_client(server.port)
+        wait_until(lambda: client.first_page("standard") is not None)
+        for index, score in enumerate([300, 500, 100]):
+            client.submit("standard", f"player{index}", score)
+        wait_until(lambda: client.sent == 3 and client.first_page("standard")[2] == 3)
+        _, rows, count = client.first_page("standard")
+        self.assertEqual(rows, [(0, "player1", 500), (1, "player0", 300), (2, "player2", 100)])
+        self.assertEqual(server.top("standard"), [(name, score) for _, name, score in rows])
+        self.assertEqual(server.server.connections, 1)
+        self.assertEqual(len(client.outbox), 0)
+
+    def test_outbox_survives_unreachable_server(self):
+        """
+        Without a server, submitting should not block and the score should wait in
+        the outbox, to be sent by the next client once the server is up.
+        """
+        server = self.start_server()
+        port = server.port
+        server.stop()
+        client = LeaderboardClient("127.0.0.1", port, self.outbox_path)
+        client.start()
+        start = time.perf_counter()
+        client.submit("time", "offline", 750)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        wait_until(lambda: client.failures > 0)
+        client.close()
+        self.assertIsNone(client.first_page("time"))
+
+        server = self.start_server()
+        client = self.start_client(server.port)
+        wait_until(lambda: client.sent == 1)
+        self.assertEqual(server.top("time"), [("offline", 750)])
+
+    def test_slow_write_does_not_stall_other_connections(self):
+        """
+        While a batch is being saved, the server should keep answering other
+        connections, since the store runs on its worker thread.
+        """
+        server = self.start_server()
+        saving = threading.Event()
+        release = threading.Event()
+        add_many = server.server.store.add_many
+
+        def slow_add_many(submissions):
+            saving.set()
+            release.wait(5)
+            return add_many(submissions)
+
+        server.server.store.add_many = slow_add_many
+        writer = socket.create_connection(("127.0.0.1", server.port), timeout=5)
+        self.addCleanup(writer.close)
+        reader = socket.create_connection(("127.0.0.1", server.port), timeout=5)
+        self.addCleanup(reader.close)
+        submission = {"op": "submit", "scores": [
+            {"id": "a1", "mode": "time", "name": "ivy", "score": 200}]}
+        writer.sendall(json.dumps(submission).encode() + b"\n")
+        self.assertTrue(saving.wait(5))
+        start = time.perf_counter()
+        reader.sendall(json.dumps({"op": "unknown"}).encode() + b"\n")
+        response = json.loads(reader.makefile().readline())
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertFalse(response["ok"])
+        release.set()
+        self.assertEqual(json.loads(writer.makefile().readline()), {"ok": True, "ranks": [1]})
+
+    def test_late_answer_is_not_taken_by_the_next_request(self):
+        """
+        After a request timed out, the request waiting behind it should get its
+        own answer on a new connection, not the late answer of the first one,
+        and closing the old connection should not forget the new one.
+        """
+        listener = socket.create_server(("127.0.0.1", 0))
+        self.addCleanup(listener.close)
+
+        def serve():
+            while True:
+                try:
+                    connection, _ = listener.accept()
+                except OSError:
+                    return
+                threading.Thread(target=answer, args=(connection,), daemon=True).start()
+
+        def answer(connection):
+            with connection, connection.makefile("rwb") as stream:
+                for line in stream:
+                    request = json.loads(line)
+                    if request["op"] == "slow":
+                        time.sleep(0.3)
+                    response = {"ok": True, "op": request["op"], "scores": [], "rows": [],
+                                "count": 0}
+                    stream.write(json.dumps(response).encode() + b"\n")
+                    stream.flush()
+
+        threading.Thread(target=serve, daemon=True).start()
+        client = self.start_client(listener.getsockname()[1])
+        answers = {}
+        with patch("src.leaderboard.REQUEST_TIMEOUT", 0.1):
+            for op in ("slow", "fast"):
+                client.fetch({"op": op}, lambda response, op=op: answers.__setitem__(op, response))
+            wait_until(lambda: len(answers) == 2)
+        self.assertIsNone(answers["slow"])
+        self.assertEqual(answers["fast"]["op"], "fast")
+        # The connection of the second request is kept for the next one
+        self.assertIsNotNone(client.writer)
+
+    def test_pages_and_position_of_the_ranking(self):
+        """
+        The client should fetch any page of the ranking and the position of the
+        score it submitted last without blocking the caller.
+        """
+        server = self.start_server()
+        client = self.start_client(server.port)
+        for index in range(30):
+            client.submit("time", f"player{index}", index * 10)
+        wait_until(lambda: client.sent == 30)
+        answers = []
+        client.fetch({"op": "rows", "mode": "time", "start": 10, "count": 3}, answers.append)
+        client.fetch({"op": "position", "mode": "time", "id": client.last_submitted["time"]},
+                     answers.append)
+        wait_until(lambda: len(answers) == 2)
+        self.assertEqual(answers[0]["rows"], [[10, "player19", 190], [11, "player18", 180],
+                                              [12, "player17", 170]])
+        self.assertEqual(answers[0]["count"], 30)
+        self.assertEqual(answers[1]["position"], 0)
+
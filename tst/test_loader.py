@@ -0,0 +1,47 @@
+import threading
+import unittest
+from src.loader import AssetLoader
+
+class AssetLoaderTest(unittest.TestCase):
+    def test_results_are_decoded_off_the_main_thread(self):
+        """
+        Every job should run on a worker thread and its result be returned by name,
+        with the progress reported on the main thread up to completion.
+        """
+        loader = AssetLoader(workers=2)
+        for name in ["a", "b", "c"]:
+            loader.submit(name, lambda name=name: (name.upper(), threading.current_thread()))
+        progress = []
+        results = loader.wait(lambda done, total: progress.append((done, total,
+                                                                   threading.current_thread())))
+        self.assertEqual({name: value for name, (value, _) in results.items()},
+                         {"a": "A", "b": "B", "c": "C"})
+        self.assertTrue(all(thread is not threading.main_thread()
+                            for _, thread in results.values()))
+        self.assertEqual(progress[-1][:2], (3, 3))
+        self.assertTrue(all(thread is threading.main_thread() for _, _, thread in progress))
+
+    def test_duplicate_names_are_decoded_once(self):
+        """
+        Submitting the same asset twice should run its job once.
+        """
+        calls = []
+        loader = AssetLoader()
+        loader.submit("a", calls.append, 1)
+        loader.submit("a", calls.append, 2)
+        loader.wait()
+        self.assertEqual(calls, [1])
+
+    def test_errors_are_raised_on_the_main_thread(self):
+        """
+        A failing job should raise its error from wait().
+        """
+        def fail():
+            raise FileNotFoundError("missing.png")
+        loader = AssetLoader()
+        loader.submit("missing.png", fail)
+        with self.assertRaises(FileNotFoundError):
+            loader.wait()
+
+if __name__ == "__main__":
+    unittest.main()
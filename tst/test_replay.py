@@ -0,0 +1,101 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+import pygame
+from src.assets import get_registry
+from src.audio import get_audio_bank
+from src.gameplay import Gameplay
+from src.replay import Replay
+
+class DummyGameOver:
+    def __init__(self, screen, clock):
+        pass
+
+    def display(self, score):
+        return ""
+
+class ReplayFormatTest(unittest.TestCase):
+    def test_round_trip(self):
+        """
+        A replay should come back unchanged from its binary form.
+        """
+        replay = Replay(2 ** 63 + 5, "time", 2, 60)
+        replay.add_shot(0, (10, 20))
+        replay.add_shot(0, (799, 599), 0.2)
+        replay.add_shot(3600, (-1, 0), 0.0)
+        replay.finish(1040, 3601)
+        loaded = Replay.from_bytes(replay.to_bytes())
+        self.assertEqual((loaded.seed, loaded.mode, loaded.background_index, loaded.step_rate),
+                         (replay.seed, "time", 2, 60))
+        self.assertEqual((loaded.final_score, loaded.steps), (1040, 3601))
+        self.assertEqual(loaded.shots_by_step(), {0: [((10, 20), 1.0), ((799, 599), 0.2)],
+                                                  3600: [((-1, 0), 0.0)]})
+
+    def test_rejects_other_files(self):
+        """
+        Loading something that is not a replay should raise ValueError.
+        """
+        with self.assertRaises(ValueError):
+            Replay.from_bytes(b"X" * 64)
+
+class ReplayPlaybackTest(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        get_registry().clear()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        for patcher in [patch("src.gameplay.REPLAY_DIR", self.directory.name),
+                        patch("src.gameplay.GameOver", new=DummyGameOver),
+                        patch("pygame.time.delay"),
+                        patch.object(get_audio_bank(), "cache_dir", None)]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.game = Gameplay(mode="standard")
+
+    def tearDown(self):
+        pygame.quit()
+
+    def play_recorded_game(self):
+        """
+        Play a standard game by posting clicks: one hit followed by three misses, so
+        every round costs a life. The seed is fixed, as red ducks cost points and
+        some games would end without any.
+        """
+        self.game.reset_game(1)
+        shots_fired = 0
+        while self.game.running:
+            # Draw at changing alphas, so the shots are resolved between steps
+            self.game.draw(self.game.step_count % 4 / 4)
+            duck = self.game.current_duck
+            if self.game.step_count % 20 == 0 and duck.alive and not duck.is_shot:
+                drawn = pygame.Rect(duck.draw_position(self.game.shot_alpha), duck.rect.size)
+                position = drawn.center if shots_fired % 4 == 0 else (5, 590)
+                pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN,
+                                                     pos=position, button=1))
+                shots_fired += 1
+            self.game.process_events()
+            self.game.step()
+
+    def test_replay_reproduces_game(self):
+        """
+        Fast-forwarding a recorded game should reach the same score at the same step.
+        """
+        self.play_recorded_game()
+        recorded_score, recorded_steps = self.game.score, self.game.step_count
+        files = os.listdir(self.directory.name)
+        self.assertEqual(len(files), 1)
+        replay = Replay.load(os.path.join(self.directory.name, files[0]))
+        self.assertGreater(recorded_score, 0)
+        self.assertEqual(replay.final_score, recorded_score)
+        self.assertGreater(len(replay), 0)
+
+        score = self.game.play_replay(replay)
+        self.assertEqual(score, recorded_score)
+        self.assertEqual(self.game.step_count, recorded_steps)
+        self.assertEqual(len(os.listdir(self.directory.name)), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,246 @@
+import unittest
+import pygame
+import time
+from unittest.mock import MagicMock, patch
+from src.leaderboard import RETRY_DELAY
+from src.results_view import LeaderboardSource, ResultsList, get_leaderboard_source
+
+class MemorySource:
+    """
+    A score source over (name, score) lists, best first.
+    """
+    def __init__(self, results):
+        self.results = results
+        self.last = None
+
+    def count(self, mode):
+        return len(self.results.get(mode, []))
+
+    def rows(self, mode, start, count):
+        results = self.results.get(mode, [])[start:start + count]
+        return [(start + index, name, score) for index, (name, score) in enumerate(results)]
+
+    def last_position(self, mode):
+        return self.last
+
+class CountingSource(MemorySource):
+    """
+    A memory source that records the rows every fetch asked for.
+    """
+    def __init__(self, total):
+        super().__init__({"standard": [(f"p{index}", total - index) for index in range(total)]})
+        self.requests = []
+
+    def rows(self, mode, start, count):
+        self.requests.append((start, count))
+        return super().rows(mode, start, count)
+
+class FakeClient:
+    """
+    A leaderboard client that answers requests only when the test says so.
+    """
+    def __init__(self):
+        self.last_submitted = {}
+        self.pending = []
+        self.delays = []
+        self.cache = {}
+
+    def fetch(self, message, callback):
+        self.pending.append((message, callback))
+
+    def call_later(self, delay, callback):
+        self.delays.append(delay)
+
+    def first_page(self, mode):
+        return self.cache.get(mode)
+
+    def answer(self, op, response):
+        for message, callback in list(self.pending):
+            if message["op"] == op:
+                self.pending.remove((message, callback))
+                callback(response(message))
+
+class ResultsListTest(unittest.TestCase):
+    def setUp(self):
+        self.font = MagicMock()
+        self.font.render.side_effect = lambda text, antialias, color: pygame.Surface((10, 10))
+        self.source = CountingSource(100000)
+        # 10 rows of 30 pixels are visible at once
+        self.results = ResultsList(pygame.Rect(0, 0, 400, 300), self.font, self.source,
+                                   overscan=10)
+
+    def scroll_rows(self, rows):
+        self.results.scroll_to(self.results.scroll + rows * self.results.row_height)
+        return self.results.visible_rows()
+
+    def test_only_the_window_around_the_visible_rows_is_fetched(self):
+        """
+        The list should fetch the visible rows plus the overscan, and scrolling
+        within that window should not fetch again.
+        """
+        rows = self.results.visible_rows()
+        self.assertEqual([row[0] for row in rows], list(range(10)))
+        self.assertEqual(self.source.requests, [(0, 20)])
+        for _ in range(10):
+            self.scroll_rows(1)
+        self.assertEqual(self.results.fetches, 1)
+        rows = self.scroll_rows(1)
+        self.assertEqual([row[0] for row in rows], list(range(11, 21)))
+        self.assertEqual(self.source.requests[-1], (1, 30))
+        self.assertEqual(self.results.fetches, 2)
+
+    def test_scrolling_stays_within_bounds(self):
+        """
+        The list should not scroll above the first row or below the last.
+        """
+        self.assertFalse(self.results.handle_event(
+            pygame.event.Event(pygame.KEYDOWN, key=pygame.K_UP)))
+        self.assertTrue(self.results.handle_event(
+            pygame.event.Event(pygame.KEYDOWN, key=pygame.K_END)))
+        rows = self.results.visible_rows()
+        self.assertEqual(rows[-1][0], 99999)
+        self.assertEqual(len(rows), 10)
+        self.assertFalse(self.results.handle_event(
+            pygame.event.Event(pygame.MOUSEWHEEL, x=0, y=-1)))
+        self.assertTrue(self.results.handle_event(
+            pygame.event.Event(pygame.MOUSEWHEEL, x=0, y=1)))
+        self.assertEqual(self.results.visible_rows()[-1][0], 99996)
+
+    def test_jump_highlights_the_last_saved_score(self):
+        """
+        Jumping should centre the score saved last, and do nothing without one.
+        The centred row is not aligned, so 11 rows are partly visible.
+        """
+        self.assertFalse(self.results.jump_to_last_saved())
+        self.source.last = 54321
+        self.assertTrue(self.results.jump_to_last_saved())
+        self.assertEqual(self.results.highlighted, 54321)
+        self.assertIn(54321, [row[0] for row in self.results.visible_rows()])
+        self.assertEqual(self.source.requests, [(54306, 31)])
+
+    def test_draw_renders_only_visible_rows(self):
+        """
+        Drawing should render the text of the visible rows only.
+        """
+        pygame.init()
+        screen = pygame.Surface((400, 300))
+        self.results.scroll_to(70000 * self.results.row_height)
+        self.results.draw(screen)
+        rendered = {call.args[0] for call in self.font.render.call_args_list}
+        self.assertIn("70001.", rendered)
+        self.assertLessEqual(len(rendered), 3 * 10)
+        empty = ResultsList(pygame.Rect(0, 0, 400, 300), self.font, MemorySource({}))
+        empty.draw(screen)
+        self.assertIn("No results yet", {call.args[0] for call in self.font.render.call_args_list})
+
+class LeaderboardSourceTest(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeClient()
+        self.updates = []
+        self.fallback = MemorySource({"standard": [("local", 10)]})
+        self.source = LeaderboardSource(self.client, self.fallback,
+                                        lambda: self.updates.append(True), page_rows=4)
+        self.ranking = [(position, f"p{position}", 1000 - position) for position in range(10)]
+
+    def answer_rows(self):
+        self.client.answer("rows", lambda message: {
+            "rows": self.ranking[message["start"]:message["start"] + message["count"]],
+            "count": len(self.ranking)})
+
+    def test_local_scores_are_shown_until_the_server_answers(self):
+        """
+        The fallback should serve a mode until its first page arrives, then the
+        server's ranking with its full length.
+        """
+        self.assertEqual([message["mode"] for message, _ in self.client.pending],
+                         ["standard", "time"])
+        self.assertEqual(self.source.rows("standard", 0, 5), [(0, "local", 10)])
+        self.answer_rows()
+        self.assertEqual(len(self.updates), 2)
+        self.assertEqual(self.source.count("standard"), 10)
+        self.assertEqual(self.source.rows("standard", 0, 3), self.ranking[:3])
+
+    def test_missing_pages_are_fetched_once(self):
+        """
+        Rows should stop before a page that was not fetched yet, which is
+        requested only once however often the list asks.
+        """
+        self.answer_rows()
+        self.assertEqual(self.source.rows("standard", 2, 5), self.ranking[2:4])
+        self.assertEqual(self.source.rows("standard", 2, 5), self.ranking[2:4])
+        self.assertEqual([message["start"] for message, _ in self.client.pending], [4])
+        self.answer_rows()
+        self.assertEqual(self.source.rows("standard", 2, 5), self.ranking[2:7])
+
+    def test_failed_requests_are_sent_again_after_a_delay(self):
+        """
+        A page that could not be fetched should be requested again once its
+        retry delay passed, and the delay should double with every failure.
+        """
+        self.client.answer("rows", lambda message: None)
+        self.assertEqual(self.client.delays, [RETRY_DELAY, RETRY_DELAY])
+        self.assertEqual(self.source.count("standard"), 1)
+        self.assertEqual(self.client.pending, [])
+        later = time.monotonic() + RETRY_DELAY
+        with patch("time.monotonic", return_value=later):
+            self.assertEqual(self.source.count("standard"), 1)
+        self.assertEqual([message["mode"] for message, _ in self.client.pending], ["standard"])
+        self.client.answer("rows", lambda message: None)
+        self.assertEqual(self.client.delays[-1], 2 * RETRY_DELAY)
+        with patch("time.monotonic", return_value=later + 2 * RETRY_DELAY):
+            self.source.count("standard")
+        self.answer_rows()
+        self.assertEqual(self.source.count("standard"), 10)
+        self.assertEqual(self.source.rows("standard", 0, 3), self.ranking[:3])
+
+    def test_warm_first_page_is_shown_right_away(self):
+        """
+        A source should start from the first page the client keeps warm, without
+        a request or a detour through the local scores.
+        """
+        client = FakeClient()
+        client.cache["standard"] = (time.monotonic(), self.ranking[:4], len(self.ranking))
+        source = LeaderboardSource(client, self.fallback, lambda: None, page_rows=4)
+        self.assertEqual([message["mode"] for message, _ in client.pending], ["time"])
+        self.assertEqual(source.count("standard"), 10)
+        self.assertEqual(source.rows("standard", 0, 3), self.ranking[:3])
+
+    def test_stale_pages_are_shown_while_fetched_again(self):
+        """
+        Pages older than the TTL should still be served, and fetched again once.
+        """
+        self.answer_rows()
+        later = time.monotonic() + self.source.ttl + 1
+        with patch("time.monotonic", return_value=later):
+            self.assertEqual(self.source.rows("standard", 0, 3), self.ranking[:3])
+            self.assertEqual(self.source.rows("standard", 0, 3), self.ranking[:3])
+        pending = [(message["mode"], message["start"]) for message, _ in self.client.pending]
+        self.assertEqual(pending, [("standard", 0)])
+
+    def test_source_is_kept_across_visits(self):
+        """
+        The results screen should get the same source, with its pages, every time.
+        """
+        first = get_leaderboard_source(self.client, self.fallback, lambda: None)
+        self.assertIs(get_leaderboard_source(self.client, self.fallback, lambda: None), first)
+        self.assertIsNot(get_leaderboard_source(FakeClient(), self.fallback, lambda: None), first)
+
+    def test_jump_waits_for_the_position(self):
+        """
+        My Rank should jump once the server sent the position of the last submission.
+        """
+        self.answer_rows()
+        self.client.last_submitted["standard"] = "abc"
+        font = MagicMock()
+        font.render.side_effect = lambda text, antialias, color: pygame.Surface((10, 10))
+        results = ResultsList(pygame.Rect(0, 0, 400, 60), font, self.source)
+        self.assertFalse(results.jump_to_last_saved())
+        (message, _), = self.client.pending
+        self.assertEqual(message, {"op": "position", "mode": "standard", "id": "abc"})
+        self.client.answer("position", lambda message: {"position": 8})
+        results.refresh()
+        self.assertEqual(results.highlighted, 8)
+        self.assertEqual(results.visible_range(), (7, 10))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from src.scores import ScoreStore
+
+class ScoreStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.store = ScoreStore(os.path.join(self.directory.name, "scores.db"))
+        self.addCleanup(self.store.close)
+
+    def test_top_and_rank(self):
+        """
+        Scores should be listed best first, oldest first on ties, per mode, and
+        the rank of a score should count only the better scores of its mode.
+        """
+        self.assertEqual(self.store.add("standard", "ann", 300), 1)
+        self.assertEqual(self.store.add("standard", "bob", 500), 1)
+        self.assertEqual(self.store.add("standard", "cid", 300), 2)
+        self.store.add("time", "dan", 900)
+        self.assertEqual(self.store.top("standard"), [("bob", 500), ("ann", 300), ("cid", 300)])
+        self.assertEqual(self.store.top("standard", limit=1), [("bob", 500)])
+        self.assertEqual(self.store.rank("standard", 400), 2)
+        self.assertEqual(self.store.rank("standard", 100), 4)
+        self.assertEqual(self.store.rank("time", 100), 2)
+        self.assertEqual((self.store.count("standard"), self.store.count("time")), (3, 1))
+
+    def test_scores_survive_reopening(self):
+        """
+        A saved score should be visible to another connection, like a second kiosk.
+        """
+        self.store.add("time", "eve", 250)
+        other = ScoreStore(self.store.path)
+        self.addCleanup(other.close)
+        self.assertEqual(other.top("time"), [("eve", 250)])
+
+    def test_failed_insert_is_rolled_back(self):
+        """
+        An error in the middle of saving should leave no trace of the score.
+        """
+        with patch.object(self.store, "rank", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.store.add("standard", "fay", 700)
+        self.assertEqual(self.store.top("standard"), [])
+        self.assertEqual(self.store.rank("standard", 0), 1)
+
+    def test_legacy_files_are_imported_once(self):
+        """
+        The old results files should be imported once, skipping broken lines.
+        """
+        path = os.path.join(self.directory.name, "standard_results.txt")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("gus,150\nbroken line\nhal,450\n")
+        files = {"standard": path, "time": os.path.join(self.directory.name, "missing.txt")}
+        with patch("builtins.print"):
+            self.store.import_legacy(files)
+            self.store.import_legacy(files)
+        self.assertEqual(self.store.top("standard"), [("hal", 450), ("gus", 150)])
+        self.assertEqual(self.store.count("time"), 0)
+
+    def test_resent_batch_is_saved_once(self):
+        """
+        A batch sent again with the same submission ids should not add scores twice.
+        """
+        batch = [("a1", "time", "ivy", 200), ("a2", "time", "jon", 400)]
+        self.assertEqual(self.store.add_many(batch), [2, 1])
+        self.assertEqual(self.store.add_many(batch), [2, 1])
+        self.assertEqual(self.store.count("time"), 2)
+        self.assertEqual(self.store.submission_position("time", "a1"), 1)
+        self.assertIsNone(self.store.submission_position("time", "missing"))
+
+    def test_rows_match_the_ranking_at_any_start(self):
+        """
+        A page of rows should start at the given position, ties included, and the
+        position of a saved score should be its index in the ranking.
+        """
+        for index, score in enumerate([5, 9, 5, 7, 5, 1, 9]):
+            self.store.add("standard", f"p{index}", score)
+        self.store.add("time", "other", 6)
+        ranking = [(position, name, score) for position, (name, score)
+                   in enumerate(self.store.top("standard", limit=100))]
+        for start in range(len(ranking) + 1):
+            self.assertEqual(self.store.rows("standard", start, 3), ranking[start:start + 3])
+        self.assertEqual(self.store.rows("standard", 0, 0), [])
+        self.assertEqual(self.store.position("standard", self.store.last_saved["standard"]), 1)
+        self.store.add("standard", "late", 5)
+        self.assertEqual(self.store.last_position("standard"), 6)
+        self.assertIsNone(self.store.last_position("missing"))
+
@@ -0,0 +1,37 @@
+import os
+import unittest
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+from src.setup import Setup
+
+class SetupTest(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        pygame.mixer.quit()
+
+    def tearDown(self):
+        pygame.mixer.quit()
+        pygame.quit()
+
+    def test_game_is_loaded_when_play_is_chosen(self):
+        """
+        The title screen should only need the window and the first background; the
+        mixer, the other backgrounds and the ducks should wait for load_game().
+        """
+        setup = Setup()
+        self.assertEqual(setup.get_background().get_size(), (800, 600))
+        self.assertEqual(len(setup.background_cache), 1)
+        self.assertIsNone(pygame.mixer.get_init())
+        self.assertFalse(hasattr(setup, "ducks"))
+
+        setup.load_game()
+        ducks = setup.get_ducks()
+        self.assertEqual(len(setup.background_cache), len(setup.backgrounds))
+        self.assertIsNotNone(pygame.mixer.get_init())
+        self.assertTrue(ducks)
+
+        setup.load_game()
+        self.assertIs(setup.get_ducks(), ducks)
+
+if __name__ == "__main__":
+    unittest.main()
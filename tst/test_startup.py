@@ -0,0 +1,48 @@
+import threading
+import unittest
+from unittest.mock import patch
+from src.startup import StartupTimeline
+
+class StartupTimelineTest(unittest.TestCase):
+    def setUp(self):
+        self.timeline = StartupTimeline(start=0.0)
+
+    def test_events_are_reported_in_order(self):
+        """
+        The report should list events by start time with their durations and threads.
+        """
+        self.timeline.record("decode b.png", 0.010, 0.030)
+        self.timeline.record("create display", 0.001, 0.004)
+        worker = threading.Thread(target=self.timeline.record, name="asset-loader_0",
+                                  args=("decode a.png", 0.005, 0.006))
+        worker.start()
+        worker.join()
+        report = self.timeline.report()
+        self.assertLess(report.index("create display"), report.index("decode a.png"))
+        self.assertLess(report.index("decode a.png"), report.index("decode b.png"))
+        self.assertIn("3.0 ms  create display", report)
+        self.assertIn("decode a.png  [asset-loader_0]", report)
+        self.assertNotIn("MainThread", report)
+
+    def test_span_records_duration(self):
+        """
+        A span should record when its body started and ended.
+        """
+        with patch("time.perf_counter", side_effect=[1.0, 1.25]):
+            with self.timeline.span("load font"):
+                pass
+        self.assertEqual(self.timeline.events[0][:3], (1.0, 1.25, "load font"))
+
+    def test_finish_prints_once_when_requested(self):
+        """
+        finish() should print the report once, and only if it was requested.
+        """
+        self.timeline.report_requested = True
+        with patch("builtins.print") as mock_print:
+            self.timeline.finish("title screen presented")
+            self.timeline.finish("title screen presented")
+        mock_print.assert_called_once()
+        self.assertEqual(len(self.timeline.events), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.telemetry import (COLUMNS, NO_DUCK, REACTION_BIN_MS, ShotAnalysis, ShotRecorder,
+                           main, read_chunks)
+
+def shot(x, y, hit, duck_type=0, since_spawn=0):
+    """
+    Return a telemetry row for a standard-mode shot.
+    """
+    return (1.0e9, x, y, hit, duck_type, 400, 200, 3.0, -3.0, since_spawn, 0, 3, 3, -1)
+
+class ShotRecorderTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, "telemetry", "shots.dhs")
+
+    def test_shots_round_trip_through_the_file(self):
+        """
+        Shots flushed in several chunks should read back column by column, in order.
+        """
+        recorder = ShotRecorder(self.path, capacity=8, flush_rows=100, flush_interval=60)
+        for index in range(5):
+            recorder.record(shot(index, 2 * index, index % 2))
+        recorder.flush()
+        for index in range(5, 7):
+            recorder.record(shot(index, 2 * index, index % 2, duck_type=2))
+        recorder.close()
+        chunks = list(read_chunks(self.path))
+        self.assertEqual([len(chunk["x"]) for chunk in chunks], [5, 2])
+        x = np.concatenate([chunk["x"] for chunk in chunks])
+        self.assertEqual(list(x), list(range(7)))
+        self.assertEqual(list(chunks[1]["duck_type"]), [2, 2])
+        self.assertEqual(chunks[1]["speed_y"][0], -3.0)
+        self.assertEqual(set(chunks[0]), {name for name, _ in COLUMNS})
+        self.assertEqual(recorder.written, 7)
+
+    def test_full_ring_drops_shots_instead_of_waiting(self):
+        """
+        When the writer has not caught up, recording should drop the shot.
+        """
+        recorder = ShotRecorder(self.path, capacity=4, flush_rows=100, flush_interval=60)
+        self.addCleanup(recorder.close)
+        results = [recorder.record(shot(index, 0, 0)) for index in range(6)]
+        self.assertEqual(results, [True] * 4 + [False] * 2)
+        self.assertEqual((len(recorder), recorder.dropped), (4, 2))
+        recorder.flush()
+        self.assertTrue(recorder.record(shot(9, 0, 0)))
+
+    def test_chunk_cut_short_is_ignored(self):
+        """
+        A chunk cut short by a crash should end the file without an error.
+        """
+        recorder = ShotRecorder(self.path, flush_rows=100, flush_interval=60)
+        recorder.record(shot(1, 1, 1))
+        recorder.flush()
+        recorder.record(shot(2, 2, 1))
+        recorder.close()
+        with open(self.path, "rb+") as file:
+            file.truncate(os.path.getsize(self.path) - 4)
+        self.assertEqual(len(list(read_chunks(self.path))), 1)
+
+    def test_rejects_other_files(self):
+        """
+        Reading something that is not a shot file should raise ValueError.
+        """
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "wb") as file:
+            file.write(b"X" * 64)
+        with self.assertRaises(ValueError):
+            list(read_chunks(self.path))
+
+class ShotAnalysisTest(unittest.TestCase):
+    def test_accuracy_and_reaction_times(self):
+        """
+        Shots should be counted per heatmap cell and duck type, and the reaction
+        times of the hits should be binned.
+        """
+        rows = [shot(5, 5, 1, 0, 120), shot(6, 6, 0, 0, 500), shot(790, 590, 1, 1, 320),
+                shot(900, -5, 0, 2, 0)]
+        chunk = {name: np.array([row[index] for row in rows], dtype)
+                 for index, (name, dtype) in enumerate(COLUMNS)}
+        analysis = ShotAnalysis(cell=100)
+        analysis.add(chunk)
+        self.assertEqual(analysis.total(), (4, 2))
+        accuracy = analysis.accuracy_map()
+        self.assertEqual(accuracy.shape, (6, 8))
+        self.assertEqual((accuracy[0, 0], accuracy[5, 7], accuracy[0, 7]), (0.5, 1.0, 0.0))
+        self.assertTrue(np.isnan(accuracy[3, 3]))
+        self.assertEqual(list(analysis.type_shots), [2, 1, 1])
+        self.assertEqual(list(analysis.type_hits), [1, 1, 0])
+        self.assertEqual(analysis.reaction_percentile(50), 2.5 * REACTION_BIN_MS)
+        self.assertEqual(analysis.reaction_percentile(90), 6.5 * REACTION_BIN_MS)
+
+    def test_shots_without_a_duck_are_not_given_a_type(self):
+        """
+        Misses while no duck was on screen should count as shots, but not towards
+        any duck type.
+        """
+        rows = [shot(5, 5, 1, 1, 120), shot(6, 6, 0, NO_DUCK)]
+        chunk = {name: np.array([row[index] for row in rows], dtype)
+                 for index, (name, dtype) in enumerate(COLUMNS)}
+        analysis = ShotAnalysis(cell=100)
+        analysis.add(chunk)
+        self.assertEqual(analysis.total(), (2, 1))
+        self.assertEqual(list(analysis.type_shots), [0, 1, 0])
+        self.assertEqual(analysis.no_duck_shots, 1)
+        self.assertIn("no duck", "\n".join(analysis.report()))
+
+    def test_analyze_command(self):
+        """
+        The analyze command should read a directory of shot files and save a heatmap.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            for name in ("a.dhs", "b.dhs"):
+                recorder = ShotRecorder(os.path.join(directory, name))
+                recorder.record(shot(10, 10, 1, since_spawn=400))
+                recorder.record(shot(10, 10, 0))
+                recorder.close()
+            heatmap = os.path.join(directory, "heatmap.png")
+            self.assertEqual(main(["analyze", directory, "--heatmap", heatmap]), 0)
+            self.assertTrue(os.path.exists(heatmap))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import pygame
+from unittest.mock import MagicMock
+from src.text_cache import TextCache
+
+class TextCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.font = MagicMock()
+        self.font.render.side_effect = lambda text, antialias, color: pygame.Surface((10, 10))
+        self.cache = TextCache(max_entries=2)
+
+    def test_repeated_text_is_rendered_once(self):
+        """
+        Rendering the same text twice should rasterize it once and count a hit.
+        """
+        first = self.cache.render(self.font, "Score: 0", "white")
+        second = self.cache.render(self.font, "Score: 0", pygame.Color("white"))
+        self.assertIs(first, second)
+        self.font.render.assert_called_once_with("Score: 0", True, "white")
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertEqual(self.cache.hit_rate(), 0.5)
+
+    def test_key_includes_colour_antialias_and_font(self):
+        """
+        Different colours, antialias settings and fonts should be cached separately.
+        """
+        other_font = MagicMock()
+        other_font.render.return_value = pygame.Surface((10, 10))
+        cache = TextCache()
+        surfaces = {id(cache.render(self.font, "A", "white")),
+                    id(cache.render(self.font, "A", "red")),
+                    id(cache.render(self.font, "A", "white", antialias=False)),
+                    id(cache.render(other_font, "A", "white"))}
+        self.assertEqual(len(surfaces), 4)
+        self.assertEqual(cache.misses, 4)
+
+    def test_least_recently_used_is_evicted(self):
+        """
+        When the cache is full, the least recently used text should be dropped.
+        """
+        self.cache.render(self.font, "A", "white")
+        self.cache.render(self.font, "B", "white")
+        self.cache.render(self.font, "A", "white")
+        self.cache.render(self.font, "C", "white")
+        self.assertEqual(len(self.cache), 2)
+        self.cache.render(self.font, "A", "white")
+        self.assertEqual(self.font.render.call_count, 3)
+        self.cache.render(self.font, "B", "white")
+        self.assertEqual(self.font.render.call_count, 4)
+
+if __name__ == "__main__":
+    unittest.main()